@@ -1,6 +1,11 @@
+import contextlib
 import csv
+import functools
+import os
 import re
+import sys
 from textwrap import dedent
+from threading import Lock
 from warnings import warn
 
 import numpy
@@ -188,6 +193,51 @@ class JumpCondition(object):
                                                       ",".join(vars))
      
             
+_quiet_lock = Lock()
+_quiet_count = 0
+_quiet_stdout = None
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Send the standard output to :data:`os.devnull`. The output is
+    restored when the last of nested or concurrent uses exits, so that
+    solvers running in several threads do not restore each other's
+    redirection.
+    """
+
+    global _quiet_count, _quiet_stdout
+    with _quiet_lock:
+        if _quiet_count == 0:
+            _quiet_stdout = sys.stdout
+            sys.stdout = open(os.devnull, 'w')
+        _quiet_count += 1
+    try:
+        yield
+    finally:
+        with _quiet_lock:
+            _quiet_count -= 1
+            if _quiet_count == 0:
+                sys.stdout.close()
+                sys.stdout = _quiet_stdout
+                _quiet_stdout = None
+
+
+def print_when_verbose(method):
+    """Decorator for solver methods, which suppresses their standard output
+    unless the solver was created with ``verbose=True``.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self, 'verbose', False):
+            return method(self, *args, **kwargs)
+        with _quiet():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class ExactSolver(object):
     """A virtual base class for ExactPack solvers.
 
@@ -290,12 +340,18 @@ class ExactSolution(numpy.recarray):
     #: about jumps (that is, there may or may not be jumps in the
     #: analytic solution).
     jumps = None
+
+    #: A dictionary of information about how the solution was computed,
+    #: for example the number of terms kept in a series solution, or
+    #: ``None`` if the solver does not report any.
+    metadata = None
     
-    def __new__(cls, data, names, jumps=None):
+    def __new__(cls, data, names, jumps=None, metadata=None):
 
         # Currently, this does a copy even if data is already an array.
         obj = numpy.core.records.fromarrays(data, names=names).view(cls)
         obj.jumps = jumps
+        obj.metadata = metadata
         
         return obj
 
@@ -305,6 +361,7 @@ class ExactSolution(numpy.recarray):
             return
 
         self.jumps = getattr(obj, 'jumps', None)
+        self.metadata = getattr(obj, 'metadata', None)
 
     def plot(self, name, **kwargs):
         """Plot one solution variable using matplotlib.
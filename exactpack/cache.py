@@ -0,0 +1,60 @@
+r'''Persistent tables in the user cache directory.
+
+Some solvers keep quantities that are expensive to compute, and that depend
+only on the parameters of the problem, in tables that are saved to versioned
+``.npz`` files, so that later solvers, in this and later processes, read
+them back instead. This module holds what these tables share: the cache
+directory, the atomic saving of the files, and the Lagrange interpolation
+weights of the tables that interpolate between their nodes.
+
+The cache directory is ``$EXACTPACK_CACHE_DIR`` if set, and otherwise
+``exactpack`` in ``$XDG_CACHE_HOME`` or ``~/.cache``. If it cannot be written,
+the tables are kept in memory only.
+'''
+
+import os
+import tempfile
+
+import numpy as np
+
+
+def cache_dir():
+    '''Return the directory used for persistent ExactPack tables.'''
+
+    path = os.environ.get('EXACTPACK_CACHE_DIR')
+    if not path:
+        base = os.environ.get('XDG_CACHE_HOME') or \
+            os.path.join(os.path.expanduser('~'), '.cache')
+        path = os.path.join(base, 'exactpack')
+    return path
+
+
+def save(path, **arrays):
+    '''Write the arrays to the ``.npz`` file path, through a temporary file
+    that replaces it at once, so that concurrent readers never see a partial
+    file. Errors are ignored, and the table is then kept in memory only.
+    '''
+
+    try:
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.npz')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def lagrange_weights(t, n):
+    '''Weights of the degree n - 1 Lagrange interpolants at the fractional
+    positions t on the nodes 0, 1, ..., n - 1, along a last axis of length
+    n.'''
+
+    t = np.asarray(t, dtype=float)
+    k = np.arange(n)
+    w = np.ones(t.shape + (n,))
+    for m in range(n):
+        other = k != m
+        w[..., other] *= (t[..., np.newaxis] - m) / (k[other] - m)
+    return w
@@ -28,9 +28,12 @@ from scipy.optimize import brentq
 from scipy.integrate import solve_ivp
 
 
-def eexp(nnn, gamm):
-    global g
-    global n
+def eexp(nnn, gamm, bracket=None):
+    """Return the similarity exponent lambda for geometry nnn (2 or 3) and
+    specific heat ratio gamm. If given, the root for alpha = 1 / lambda is
+    first sought in the interval ``bracket``, and only if it is not there in
+    the full range of alpha.
+    """
     # Here we read in (or set) the space index (n) and specific heat
     # ratio (g) from the namelist file.
     n = nnn
@@ -68,7 +71,16 @@ def eexp(nnn, gamm):
         raise ValueError(err_str)
     # The "exact" value of alpha is found through the "zeroin_a" routine.
     # We are attempting to find the value of alpha that zeros the
-    # "Cdiff" function defined below.
+    # "Cdiff" function defined below. A narrow starting bracket, e.g.
+    # interpolated in a table, needs far fewer iterations.
+    if bracket is not None:
+        try:
+            alpha = brentq(Cdiff, bracket[0], bracket[1], xtol=tol,
+                           args=(n, g))
+            return 1.0 / alpha
+        except ValueError:
+            # The root is not in the bracket.
+            pass
     alpha = brentq(Cdiff, amin, amax, xtol=tol, args=(n, g))
 
     return 1.0 / alpha
@@ -99,13 +111,14 @@ def Cdiff(alpha, en, gamma):
         point. The smallness of this difference is a good
         measure of the correctness of alpha.
     """
-    global a
     abserr = 1.0e-9
     relerr = 1.0e-8
     neqn = 1
     y = np.zeros(neqn)
 
     a = alpha
+    n = en
+    g = gamma
     # It was determined by Lazarus that the V-coordinate of the critical
     # point through which the solution curve must pass is algebraically
     # distinct for different ranges of the specific heat ratio. The
@@ -142,17 +155,25 @@ def Cdiff(alpha, en, gamma):
     tout = V0
 
     soln = solve_ivp(fe, (t, tout), y, rtol=relerr, atol=abserr,
-                     method='DOP853')
+                     method='DOP853', events=sonic, args=(a, n, g))
     y = soln.y[:, -1]
 
+    # For alpha below its exact value, the solution curve meets the singular
+    # locus, where dC/dV is infinite, just before reaching V0, and cannot be
+    # continued through it. The integration stops there (rather than
+    # creeping along the locus with vanishing steps), and the difference is
+    # evaluated at that point, which tends to V0 as alpha approaches its
+    # exact value.
+    #
     # The difference function between the analytically and numerically
     # obtained values of the coordinate C0 is returned by the function.
     return C0 - y[0]
 
 
-def fe(t, y):
-    """fe is the RHS of Chisnell Eq. (3.1), and is used in the numerical
-    integration of Eq. (3.1) through the call to "ode."
+def fe(t, y, a, n, g):
+    """fe is the RHS of Chisnell Eq. (3.1) for alpha = a, geometry n and
+    specific heat ratio g, and is used in the numerical integration of Eq.
+    (3.1) through the call to "ode."
     """
     # Establishment of the various factors appearing in Eq. (3.1)
     delta = (t - a)**2 - y[0]
@@ -164,3 +185,17 @@ def fe(t, y):
 
     # Computation of the RHS of Eq. (3.1)
     return numer/denom
+
+
+def sonic(t, y, a, n, g):
+    """sonic is the denominator of the RHS of Chisnell Eq. (3.1), which
+    vanishes on the singular locus of the phase space. It is used as a
+    terminal event in the integration of Eq. (3.1) in "Cdiff."
+    """
+    delta = (t - a)**2 - y[0]
+    Q = n * t * (t - a) + (2.0 / g) * (1.0 - a) * (a - t) - t * (t - 1.0)
+    return delta * (n * t - 2.0 * (1.0 - a) * (1.0 / g)) * (a - t) \
+        + ((a - t)**2.0) * Q
+
+
+sonic.terminal = True
@@ -0,0 +1,117 @@
+r"""A table of the Guderley eigenvalues.
+
+The similarity exponent :math:`\lambda` and the position :math:`B` of the
+reflected shock, in the similarity variable, depend only on the geometry and
+:math:`\gamma`. Computing them with
+:func:`exactpack.solvers.guderley.eexp.eexp` and
+:func:`exactpack.solvers.guderley.ramsey.get_shock_position` is the most
+expensive part of evaluating a Guderley solution.
+
+:data:`TABLE` holds both, for cylindrical and spherical geometry, at the
+values of :math:`\gamma` of Tables 6.4 and 6.5 of [Lazarus1981]_ for which
+the solver converges, with :math:`\gamma = 5/3` in place of 1.66667. They
+were computed with those two routines, so that :func:`lookup` returns the
+same values as computing them. For other values of :math:`\gamma`,
+:func:`brackets` interpolates the table to give narrow starting brackets for
+the root-finding.
+"""
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+#: The Guderley eigenvalues, as rows of :math:`\gamma`, :math:`\lambda` and
+#: :math:`B`, for cylindrical (2) and spherical (3) geometry.
+TABLE = {
+    2: np.array([
+        (1.4, 1.197141430111967, 2.8156049979849023),
+        (1.5, 1.209559132517207, 2.236156616832448),
+        (1.6666666666666667, 1.2260537882477454, 1.6948095149125157),
+        (1.7, 1.2288931032825916, 1.621025135867877),
+        (1.8, 1.23670551805011, 1.4409563658876146),
+        (1.9, 1.2436278358576438, 1.305213509737934),
+        (1.92, 1.2449208187449294, 1.2820715425780702),
+        (2.0, 1.249824475961588, 1.1996453567400356),
+        (2.0863, 1.2546830116327554, 1.1260504147440444),
+        (2.0883, 1.254790790995876, 1.124383351607734),
+        (2.125, 1.2567323669989485, 1.0969690950856903),
+        (2.2, 1.26049898043646, 1.0467605773935633),
+        (2.3676, 1.2680643171711257, 0.956526709411045),
+        (2.3678, 1.2680727188955512, 0.9564337786713176),
+        (2.4, 1.2694076381532824, 0.9418518354992769),
+        (2.6, 1.27698161013499, 0.8657699384699801),
+        (2.8, 1.2835139726791653, 0.8081541745165893),
+        (2.8392, 1.2846912321992559, 0.7984645616353607),
+        (2.83929, 1.2846938994566943, 0.7984550891337049),
+        (3.0, 1.2892136583142404, 0.7631239990395948),
+        (3.4, 1.2986950954981673, 0.6977092209998615),
+        (4.0, 1.309526732999324, 0.6348725006239954),
+        (5.0, 1.3220499826908372, 0.5750378981917087),
+        (6.0, 1.3305627762127263, 0.5407954223672815),
+        (7.0, 1.3367301841273607, 0.5187546456495877),
+        (8.0, 1.3414054787818512, 0.5034373403629898),
+        (10.0, 1.3480251344079965, 0.4836182087281244),
+        (15.0, 1.3569909817090513, 0.459916058368469),
+        (20.0, 1.3615356226642932, 0.44917990431212224),
+    ]),
+    3: np.array([
+        (1.4, 1.3943607844248025, 2.6885048326361916),
+        (1.5, 1.4195913542215344, 2.08775439612529),
+        (1.6666666666666667, 1.4526927217213421, 1.5479200049146078),
+        (1.7, 1.4583285786126463, 1.476193059228567),
+        (1.8, 1.4737227445487433, 1.303216668762237),
+        (1.9, 1.4872097129309514, 1.1752521254862074),
+        (1.92, 1.489711519748594, 1.1535961683309246),
+        (2.0, 1.4991468276557003, 1.0772852009136893),
+        (2.0863, 1.5084087320677058, 1.0097865399386787),
+        (2.0883, 1.5086131756438501, 1.008372981769681),
+        (2.125, 1.5122883162399114, 0.9834778836411635),
+        (2.2, 1.5193750476588697, 0.9382818817799268),
+        (2.3676, 1.5334293075057748, 0.8581948325565922),
+        (2.3678, 1.5334447771731574, 0.8581129280073895),
+        (2.4, 1.5358986671705828, 0.8452051901279053),
+        (2.6, 1.5496663750073156, 0.7795747335698546),
+        (2.8, 1.5613198935412804, 0.7310366462075693),
+        (2.8392, 1.563397495210024, 0.7229945406797036),
+        (2.83929, 1.563402194449795, 0.7229765250798921),
+        (3.0, 1.5713126236762758, 0.693978231817721),
+        (3.4, 1.5875567771402963, 0.6418385605963509),
+        (4.0, 1.6055087162299326, 0.5953156736944238),
+        (5.0, 1.625424330932116, 0.5530126740101745),
+        (6.0, 1.6384333266237392, 0.531813806560223),
+        (7.0, 1.6475871075023203, 0.5195743410084632),
+    ]),
+}
+
+
+def lookup(n, gamma):
+    """Return the tabulated :math:`(\lambda, B)` for geometry n and
+    specific heat ratio gamma, or None if they are not in the table.
+    """
+    table = TABLE.get(n)
+    if table is None:
+        return None
+    i = np.searchsorted(table[:, 0], gamma)
+    if i < len(table) and table[i, 0] == gamma:
+        return table[i, 1], table[i, 2]
+    return None
+
+
+def brackets(n, gamma):
+    """Return brackets for :math:`\alpha = 1 / \lambda` and for B,
+    interpolated in the table, or ``(None, None)`` outside of the table.
+
+    Both are interpolated with cubic splines in :math:`\log(\gamma - 1)`,
+    and the half-width of each bracket is the difference between the cubic
+    and linear interpolants, which is larger than the error of the cubic.
+    """
+    table = TABLE.get(n)
+    if table is None or not table[0, 0] < gamma < table[-1, 0]:
+        return None, None
+    x = np.log(table[:, 0] - 1.0)
+    xi = np.log(gamma - 1.0)
+    result = []
+    for y in (1.0 / table[:, 1], np.log(table[:, 2])):
+        cubic = CubicSpline(x, y)(xi)
+        width = abs(cubic - np.interp(xi, x, y)) + 1.0e-9
+        result.append((cubic - width, cubic + width))
+    (amin, amax), (logBmin, logBmax) = result
+    return (amin, amax), (np.exp(logBmin), np.exp(logBmax))
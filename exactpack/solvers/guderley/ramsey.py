@@ -27,12 +27,22 @@ by J. Bolstad of LLNL.
 Code translated from Fortran to Python by J. Thrussell, 2022.09.23.
 """
 import numpy as np
+from collections import namedtuple
+from functools import lru_cache
 from math import sqrt
 from scipy.optimize import brentq
 from scipy.integrate import solve_ivp
 
 from .eexp import eexp
 from .interp_laz import interp_laz
+from . import eigenvalue_table
+
+
+#: The parameters of the similarity ODEs, which were held in a common block
+#: in the Fortran code: the specific heat ratio, the similarity exponent,
+#: nu = n - 1, the exponent sigma of the variable w = k*x^(-sigma), and the
+#: value V1 of V just behind the reflected shock.
+Context = namedtuple('Context', ['gamma', 'lambda_', 'nu', 'sigma', 'V1'])
 
 
 def guderley_1d(t, r, ngeom, gamma, rho0):
@@ -53,12 +63,6 @@ def guderley_1d(t, r, ngeom, gamma, rho0):
             *array*: An array of sound speed values.
             *array*: An array of Specific Internal Energy values.
     """
-    nstep = len(r)
-    den = np.zeros(nstep)
-    vel = np.zeros(nstep)
-    pres = np.zeros(nstep)
-    snd = np.zeros(nstep)
-    sie = np.zeros(nstep)
     factorC = 0.750024322
     # The input time is a Caramana/Whalen time, defined by:
     #
@@ -70,39 +74,49 @@ def guderley_1d(t, r, ngeom, gamma, rho0):
     # "exp" function. See documentation appearing in "exp" for an
     # explanation of how this value is calculated.
     #
-    lambda_ = eexp(ngeom, gamma)
     # As is the case with lambda, the reflected shock space-time position
     # "B" is not known a priori (though it is known that B lies in
     # the range (0 < B < 1)). Lazarus was the first to determine the
     # value of B to 6 significant figures (appearing in Tables 6.4 and
     # 6.5). This precision can be improved upon using the "zeroin"
     # routine, as will be explained below.
-    B = get_shock_position(ngeom, gamma, lambda_)
+    lambda_, B = eigenvalues(ngeom, gamma)
     #
     # If a position in both space and time are specified, this data can be
     # converted into an appropriate value of the similarity variable x
     # defined above. This value of x is where we desire to know the values
     # of the similarity variables.
-    for i in range(nstep):
-        rpos = r[i]
-        targetx = tee / (rpos**lambda_)
-        # The ultimate output of the program is generated through the "state"
-        # subroutine, which computes the solution of the similarity variable
-        # equations at the target value of x and then transforms this
-        # solution back to physical variable space.
-        deni, veli, presi, sndi, siei = state(rpos, rho0, ngeom, gamma,
-                                              lambda_, B, targetx)
-        den[i] = deni
-        vel[i] = veli
-        pres[i] = presi
-        snd[i] = sndi
-        sie[i] = siei
-
-    return den, vel, pres, snd, sie
+    r = np.asarray(r, dtype=float)
+    targetx = tee / (r**lambda_)
+    # The ultimate output of the program is generated through the "state"
+    # subroutine, which computes the solution of the similarity variable
+    # equations at all the target values of x and then transforms this
+    # solution back to physical variable space.
+    return state(r, rho0, ngeom, gamma, lambda_, B, targetx)
+
+
+@lru_cache(maxsize=None)
+def eigenvalues(ngeom, gamma):
+    """Return the similarity exponent lambda and the reflected shock position
+    B for the given geometry and specific heat ratio.
+
+    The values are taken from :data:`.eigenvalue_table.TABLE` if gamma is in
+    it. Otherwise they are computed with "eexp" and "get_shock_position",
+    starting from brackets interpolated in the table. The results are
+    cached for the lifetime of the process.
+    """
+    values = eigenvalue_table.lookup(ngeom, gamma)
+    if values is not None:
+        return values
+    alpha_bracket, B_bracket = eigenvalue_table.brackets(ngeom, gamma)
+    lambda_ = eexp(ngeom, gamma, alpha_bracket)
+    B = get_shock_position(ngeom, gamma, lambda_, B_bracket)
+    return lambda_, B
 
 
-def get_shock_position(ngeom, gamma, lambda_):
+def get_shock_position(ngeom, gamma, lambda_, bracket=None):
     """Get the shock position B as th root root of the GUderley function.
+    If given, the root is first sought in the interval ``bracket``.
     """
     Bmaxg = interp_laz(ngeom, gamma, lambda_)
     Bming = 0.34  # use this value for gamma=3.0 and rho0=1.0
@@ -125,6 +139,13 @@ def get_shock_position(ngeom, gamma, lambda_):
     # geometry type than is given by Lazarus can be computed by using
     # the "zeroin" routine, which here finds the B-zero of a function
     # called "Guderley," which is defined below.
+    if bracket is not None:
+        try:
+            return brentq(Guderley, bracket[0], bracket[1], xtol=tol,
+                          args=(ngeom, gamma, lambda_))
+        except ValueError:
+            # The root is not in the bracket.
+            pass
     B = brentq(Guderley, Bmin, Bmax, xtol=tol, args=(ngeom, gamma, lambda_))
 
     return B
@@ -163,12 +184,6 @@ def Guderley(B, n, gamma_d, lambda_d):
             integrating in increasing w (decreasing x)).  The smaller the
             absolute value of this difference, the better the choice of B.
     """
-    global gamma
-    global lambda_
-    global sigma
-    global intno
-    global nu
-    global V1
     # The following parameters are adjustable, but it is not recommended
     # that they be adjusted unless error messages are returned by
     # the function.
@@ -207,7 +222,9 @@ def Guderley(B, n, gamma_d, lambda_d):
     # x = B. B is the x coordinate of the reflected shock. Only if the
     # integration returns the error message below should the parameters
     # abserr and relerr be adjusted.
-    soln = solve_ivp(f, (-1.0, B), y, rtol=relerr, atol=abserr)
+    ctx = Context(gamma, lambda_, nu, None, None)
+    soln = solve_ivp(f, (-1.0, B), y, rtol=relerr, atol=abserr,
+                     args=(ctx, intno))
     x = soln.t[-1]
     y = soln.y[:, -1]
     e = energy(x, y, gamma, lambda_, nu, energy0)
@@ -232,7 +249,8 @@ def Guderley(B, n, gamma_d, lambda_d):
     energymin[1] = 0.0
 
     if final:
-        soln = solve_ivp(f, (B, 1.0e6), y, rtol=relerr, atol=abserr)
+        soln = solve_ivp(f, (B, 1.0e6), y, rtol=relerr, atol=abserr,
+                         args=(ctx, intno))
         x = soln.t[-1]
         y = soln.y[:, -1]
         e = energy(x, y, gamma, lambda_, nu, energy0)
@@ -255,6 +273,7 @@ def Guderley(B, n, gamma_d, lambda_d):
     y[0] = V0
     y[1] = -1.0 / w
     intno = 2
+    ctx = Context(gamma, lambda_, nu, sigma, V1)
     # We integrate only 2 differential equations for V and C.
     # Trying to integrate the R equation requires knowing k, which
     # we are trying to determine.  Thus no energy check is possible
@@ -262,8 +281,6 @@ def Guderley(B, n, gamma_d, lambda_d):
     dw = w
     wlast = w
     j = 0
-    # This causes the solve_ivp function stop once a root is found.
-    Vdiff.terminal = True
 
     while True:
         j = j + 1
@@ -272,7 +289,7 @@ def Guderley(B, n, gamma_d, lambda_d):
         wout = wlast + dw * jmod
 
         soln = solve_ivp(f, (w, wout), y, rtol=relerr, atol=abserr,
-                         events=Vdiff)
+                         events=Vdiff, args=(ctx, intno))
         y = soln.y[:, -1]
         if soln.status == 1:
             # Root found.  Let D be the number of correct digits in
@@ -320,7 +337,7 @@ def energy(x, y, gamma, lambda_, nu, energy0):
         return 0.0
 
 
-def f(xorw, y):
+def f(xorw, y, ctx, intno):
     """This subroutine evaluates the differential equations given by Lazarus
     Eqs. (2.8), (2.9) and the R-equation.
 
@@ -334,10 +351,13 @@ def f(xorw, y):
     Args:
         xorw (float): The x or w values.
         y (array): Length-3 array of floats.
+        ctx (Context): The parameters of the equations.
+        intno (int): 1 to integrate in x, 2 to integrate in w.
 
     Returns:
         array: The length-3 array of energy values.
     """
+    gamma, lambda_, nu, sigma, _ = ctx
     V = y[0]
     C = y[1]
     Vp1 = V + 1.0
@@ -366,13 +386,14 @@ def f(xorw, y):
     return yp
 
 
-def g(t, y):
+def g(t, y, ctx):
     """This subroutine evaluates the differential equations given by Lazarus
     Eqs. (2.8), (2.9) and the R-equation.
 
     This subroutine (as opposed to the subroutine f) is for use with the "sim"
     subroutine. The diagnostic statements have been left in here.
     """
+    gamma, lambda_, nu = ctx.gamma, ctx.lambda_, ctx.nu
     V = y[0]
     C = y[1]
     Vp1 = V + 1.0
@@ -397,7 +418,7 @@ def g(t, y):
     return yp
 
 
-def Vdiff(w, y):
+def Vdiff(w, y, ctx, intno):
     """This function computes the difference between V1 (value of V behind the
     reflected shock obtained by integrating in increasing x) and y(1) (that is
     obtained from integrating in increasing w (decreasing x)). The smaller the
@@ -407,36 +428,56 @@ def Vdiff(w, y):
     Args:
         w (float): Transformed independent similarity variable
         y (array): y(i) = V, C, or R for i = 1, 2, or 3
-        yp (array): RHS of Eqs. (2.8), (2.9), and the R-equation
+        ctx (Context): The parameters of the equations, including V1.
+        intno (int): Unused; the signature is that of "f".
 
     returns:
          float: Vdiff difference between V1 (from x) and corresponding  value
             from integrating in w.
     """
-    return y[0] - V1
+    return y[0] - ctx.V1
+
+
+# This causes the solve_ivp function stop once a root is found.
+Vdiff.terminal = True
+
+
+def _sampled(soln, npts):
+    """Return the solution of solve_ivp at its npts values of t_eval, with nan
+    beyond the point where the integration failed, if it did.
+    """
+    y = np.full((3, npts), np.nan)
+    y[:, :soln.t.size] = np.reshape(soln.y, (3, soln.t.size))
+    return y
 
 
 def state(r, rho0, n, gamma_d, lambda_d, B, targetxd):
     """This subroutine, given the various parameters computed in other
     parts of the driver program guderley_1D, integrates the governing ODEs up to
-    a pre-specified point (targetx, which is computed in the guderley_1D driver
+    pre-specified points (targetx, which is computed in the guderley_1D driver
     program. It then transforms the similarity variable data at the targetx
-    point to physical data at a particular space-time point.
+    points to physical data at the corresponding space-time points.
+
+    r and targetx may be arrays. The governing ODEs are integrated only once
+    on each side of the reflected shock, and the solution is sampled at all
+    the values of targetx on that side.
 
     Lazarus Eqs. (2.5) are used to transform the similarity variables back to
     physical variable space in this subroutine. The results will be in terms of
     the "Lazarus Time," as opposed to "Caramana and Whalen" Time.
     """
-    global gamma
-    global lambda_
-    global nu
     abserr = 6.0e-12
     relerr = 5.0e-11
 
     nu = n - 1
     gamma = gamma_d
     lambda_ = lambda_d
-    targetx = targetxd
+    ctx = Context(gamma, lambda_, nu, None, None)
+    scalar = np.ndim(targetxd) == 0 and np.ndim(r) == 0
+    targetx, r = np.broadcast_arrays(np.atleast_1d(np.asarray(targetxd,
+                                                              dtype=float)),
+                                     np.atleast_1d(np.asarray(r,
+                                                              dtype=float)))
     # Factors gamma + 1 and gamma - 1.
     gp1 = gamma + 1.0
     gm1 = gamma - 1.0
@@ -448,6 +489,8 @@ def state(r, rho0, n, gamma_d, lambda_d, B, targetxd):
     y[1] = sqrt(2.0 * gamma * gm1) / gp1
     y[2] = gp1 / gm1
     t = -1.0
+    # The similarity variables V, C and R at each targetx.
+    Y = np.full((3, len(targetx)), np.nan)
 
     # x < -1 represents the unshocked state (interior to hte converging
     # shock wave), where the physical variables have constant values
@@ -459,59 +502,25 @@ def state(r, rho0, n, gamma_d, lambda_d, B, targetxd):
     #
     # When a combination of space and time variables are specified
     # such that x < -1, the constant state data is returned as output.
-    if targetx < -1.0:
-        den = rho0
-        vel = 0.0
-        pres = 0.0
-        snd = 0.0
-        sie = 0.0
+    unshocked = targetx < -1.0
     # If -1 < x < 0, then we are behind the converging shock wave, and
-    # reflection has yet to occur. The integration of the governing
-    # ODEs is initiated at the position of the converging shock
-    # (x = -1) and carried through to whatever negative value of x
-    # that results from the specification of the space and time
-    # variables.
-    elif -1.0 <= targetx < 0.0:
-        soln = solve_ivp(g, (t, targetx), y, rtol=relerr, atol=abserr)
-        y = soln.y[:, -1]
-        # Definition of the PHYSICAL pressure variable, as a function of the
-        # dimensionless similarity variables.
-        p = (((y[1] * r**(1.0 - lambda_))
-             / (targetx * (-1.0) * lambda_))**2) \
-            / (gamma * (1.0 / rho0) * (1.0 / y[2]))
-        # Writing of solution data.
-        den = y[2] * rho0
-        vel = (y[0] * r**(1.0 - lambda_)) / (targetx * (-1.0) * lambda_)
-        pres = p
-        snd = (y[1] * r**(1.0 - lambda_)) / (targetx * (-1.0) * lambda_)
-        sie = p / (gm1 * rho0 * y[2])
-    # If 0 < x < B (the space-time position of the reflected shock
-    # wave), then we are upstream of the reflected shock wave. The
-    # integration  of the governing ODEs is again started at position
-    # of the  convergent shock wave and integrated through x = 0 into
-    # a portion of the phase space representing the flow ahead of the
-    # reflected shock wave. The integration terminates before the
-    # position x = B is reached.
-    elif 0.0 <= targetx < B:
-        soln = solve_ivp(g, (t, targetx), y, rtol=relerr, atol=abserr)
-        y = soln.y[:, -1]
-        # Physical pressure variable.
-        p = (((y[1] * r**(1.0 - lambda_))
-             / (targetx * (-1.0) * lambda_))**2) \
-            / (gamma * (1.0/rho0) * (1.0 / y[2]))
-        # Writing of solution data.
-        den = y[2] * rho0
-        vel = (y[0] * r**(1.0 - lambda_)) / (targetx * (-1.0) * lambda_)
-        pres = p
-        snd = (y[1] * r**(1.0 - lambda_)) / (targetx * (-1.0) * lambda_)
-        sie = p / (gm1 * rho0 * y[2])
+    # reflection has yet to occur. If 0 < x < B (the space-time position of
+    # the reflected shock wave), then we are upstream of the reflected
+    # shock wave. The integration of the governing ODEs is initiated at the
+    # position of the converging shock (x = -1) and carried through x = 0
+    # into a portion of the phase space representing the flow ahead of the
+    # reflected shock wave, to x = B, and the solution is sampled at the
+    # sorted values of targetx on the way.
+    ahead = (-1.0 <= targetx) & (targetx < B)
+    behind = targetx >= B
+    xs, inverse = np.unique(targetx[ahead], return_inverse=True)
+    soln = solve_ivp(g, (t, B), y, rtol=relerr, atol=abserr,
+                     t_eval=np.append(xs, B), args=(ctx,))
+    ys = _sampled(soln, len(xs) + 1)
+    Y[:, ahead] = ys[:, :-1][:, inverse]
     # If B < x < infinity, then we are behind the reflected shock wave.
-    # The numerical integration starts at the position of the
-    # convergent shock wave as before and is carred through x = 0
-    # until x = B.
-    elif targetx >= B:
-        soln = solve_ivp(g, (t, B), y, rtol=relerr, atol=abserr)
-        y = soln.y[:, -1]
+    if np.any(behind):
+        y = ys[:, -1]
         # At x = B, the general-strength Rankine-Hugoniot conditions are
         # applied, and we move to the other side of the reflected shock
         # wave (just downstream).
@@ -524,18 +533,33 @@ def state(r, rho0, n, gamma_d, lambda_d, B, targetxd):
         y[0] = V1
         # Numerical integration of the governing ODEs continues from x = B
         # (with the similarity variables taking their shocked values)
-        # until the targetx point is reached.
-        soln = solve_ivp(g, (B, targetx), y, rtol=relerr, atol=abserr)
-        y = soln.y[:, -1]
-        # Physical pressure variable.
-        p = (((y[1] * r**(1.0 - lambda_))
-             / (targetx * (-1.0) * lambda_))**2) \
-            / (gamma * (1.0 / rho0) * (1.0 / y[2]))
-        # Writing of solution data.
-        den = y[2] * rho0
-        vel = (y[0] * r**(1.0 - lambda_)) / (targetx * (-1.0) * lambda_)
-        pres = p
-        snd = (y[1] * r**(1.0 - lambda_)) / (targetx * (-1.0) * lambda_)
-        sie = p / (gm1 * rho0 * y[2])
-
+        # until the largest targetx point is reached.
+        xs, inverse = np.unique(targetx[behind], return_inverse=True)
+        soln = solve_ivp(g, (B, xs[-1]), y, rtol=relerr, atol=abserr,
+                         t_eval=xs, args=(ctx,))
+        Y[:, behind] = _sampled(soln, len(xs))[:, inverse]
+
+    den = np.full(len(targetx), float(rho0))
+    vel = np.zeros(len(targetx))
+    pres = np.zeros(len(targetx))
+    snd = np.zeros(len(targetx))
+    sie = np.zeros(len(targetx))
+    shocked = ~unshocked
+    V, C, R = Y[:, shocked]
+    x = targetx[shocked]
+    rs = r[shocked]
+    # Definition of the PHYSICAL pressure variable, as a function of the
+    # dimensionless similarity variables.
+    p = (((C * rs**(1.0 - lambda_))
+         / (x * (-1.0) * lambda_))**2) \
+        / (gamma * (1.0 / rho0) * (1.0 / R))
+    # Writing of solution data.
+    den[shocked] = R * rho0
+    vel[shocked] = (V * rs**(1.0 - lambda_)) / (x * (-1.0) * lambda_)
+    pres[shocked] = p
+    snd[shocked] = (C * rs**(1.0 - lambda_)) / (x * (-1.0) * lambda_)
+    sie[shocked] = p / (gm1 * rho0 * R)
+
+    if scalar:
+        return den[0], vel[0], pres[0], snd[0], sie[0]
     return den, vel, pres, snd, sie
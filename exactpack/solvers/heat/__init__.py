@@ -141,6 +141,21 @@ which can be solved for :math:`D_n` using the orthogonality condition
   D_n = \int_\Omega dx \, \Big[T_0({\bf x}) - \bar T({\bf x}) \Big] X_m({\bf x})  \ .
   :label: DnSolve
 
+The time dependence of the solution is then only in the factors
+:math:`e^{-\kappa \lambda_n t}` of the coefficients. To compare with a
+simulation at many output times on the same mesh, the ``bind`` method of
+:class:`Rod1D` (and the planar sandwiches), :class:`Hutchens1` and
+:class:`Rectangle` returns a
+:class:`exactpack.solvers.heat.rod1d.MeshSolution`, which evaluates
+:math:`\bar T({\bf x})` and the modes :math:`X_n({\bf x})` at the mesh
+once:
+
+.. code-block:: python
+
+  mesh = Rod1D(Nsum=200).bind(x)
+  soln = mesh(0.1)                     # an ExactSolution at t = 0.1
+  T = mesh.temperature([0.1, 0.2, 0.3])  # one row per time
+
 """
 
 from .rod1d import Rod1D
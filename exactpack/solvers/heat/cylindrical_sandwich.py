@@ -88,20 +88,188 @@ The homogeneous heat equation becomes
 
 The initial condition is of the form of a constant plus linear term.
 
-**NOTE** This solver is currently only accurate to :math:`10^{-3}`. This is
-because the Bessel functions become highly oscillatory for large mode numbers,
-and the quadrature method used to calculated the coefficients becomes unreliable.
-For higher accuracy, one must use an asymptotic form of the high mode Bessel
-functions should be used. This will be implemented in a future release.
+The eigenvalues :math:`\alpha_{nm}` of the order :math:`k = 2n` are the
+roots of :math:`J_k'(\alpha a) Y_k'(\alpha b) - J_k'(\alpha b) Y_k'(\alpha a)`,
+which are all bracketed together by the sign changes on a grid finer than their
+spacing (see :func:`annulus_roots`). The integrals :math:`\int_a^b r R_{nm}(r)
+\, dr` in the coefficients :math:`T_{nm}` are evaluated in closed form, with
+the recurrences of the indefinite integrals :math:`\int z Z_k(z) \, dz` of the
+cylinder functions, instead of by quadrature of the highly oscillatory Bessel
+functions of the high modes.
+
+The eigenvalues :math:`\alpha_{nm}`, the weights :math:`\beta_{nm}` of the
+Bessel functions of the second kind, and the coefficients :math:`T_{nm}` do
+not depend on the time or on the points, and finding them dominates the cost
+of the solver. They are computed once for each set of the parameters
+:math:`a`, :math:`b`, :math:`T_1`, ``Nsum`` and ``Msum``, and kept by the
+solver for later calls. If ``table`` is true, they are also kept in a
+persistent table (see :mod:`exactpack.cache`) for later solvers with the
+same parameters.
 
 """
 
+import os
+from warnings import warn
+
 import numpy as np
 from scipy import special as sp
-from scipy.optimize import newton
 from scipy.integrate import quad
 
 from ...base import ExactSolver, ExactSolution
+from ...cache import cache_dir, save
+from .rod1d import BLOCK_BYTES, tail_bound, tolerance
+
+#: Version of the files of the persistent table of modes. It must be
+#: incremented whenever the computation of the modes changes, so that stale
+#: files are ignored.
+VERSION = 2
+
+
+def _derivatives(k, z):
+    r"""Returns :math:`J_k'(z)` and :math:`Y_k'(z)` for integer orders k."""
+    with np.errstate(all='ignore'):
+        J = sp.jv(k, z)
+        Y = sp.yn(k, z)
+        return sp.jv(k - 1, z) - k / z * J, sp.yn(k - 1, z) - k / z * Y
+
+
+def _phase(x, k, a, b, derivative=False):
+    r"""Returns :math:`G(x) = \sin(\phi_k(xb) - \phi_k(xa))`, and its
+    derivative if derivative is true, where :math:`\phi_k` is the phase of
+    :math:`J_k' + i Y_k'`. Points where the Bessel functions overflow, which
+    are well below the first root, give zero."""
+    dJa, dYa = _derivatives(k, x * a)
+    dJb, dYb = _derivatives(k, x * b)
+    with np.errstate(all='ignore'):
+        delta = np.arctan2(dYb, dJb) - np.arctan2(dYa, dJa)
+        G = np.nan_to_num(np.sin(delta))
+        if not derivative:
+            return G
+        # the Wronskian gives phi_k'(z) = 2 (1 - k^2/z^2) / (pi z (J_k'^2 + Y_k'^2))
+        za, zb = x * a, x * b
+        rate = 2 / np.pi * (
+            b * (1 - k**2 / zb**2) / (zb * (dJb**2 + dYb**2)) -
+            a * (1 - k**2 / za**2) / (za * (dJa**2 + dYa**2)))
+        return G, np.nan_to_num(np.cos(delta) * rate)
+
+
+def annulus_roots(k, a, b, count):
+    r"""Return the first count positive roots :math:`\alpha` of
+
+    .. math::
+      J_k'(\alpha a) Y_k'(\alpha b) - J_k'(\alpha b) Y_k'(\alpha a) = 0
+
+    for each of the integer orders k.
+
+    With :math:`J_k' + i Y_k' = M_k e^{i\phi_k}`, this is
+    :math:`G(\alpha) = \sin(\phi_k(\alpha b) - \phi_k(\alpha a)) = 0`,
+    and :math:`G` is bounded and smooth where the cross product of the Bessel
+    functions overflows. The roots of :math:`G` are spaced by more than
+    :math:`\pi / (a + b)`, and by :math:`\pi / (b - a)` asymptotically, so
+    the sign changes of :math:`G` on a grid with half that step bracket each
+    one of them, for all the orders at once. The grid extends past the last root expected from the
+    asymptotic spacing, and is extended further until it brackets count roots
+    for each order. All the roots are then polished together with Newton's
+    method, safeguarded by the brackets, with the derivative of the phase
+    from the Wronskian of the Bessel functions.
+
+    Args:
+        k (array): The orders.
+        count (int): The number of roots for each order.
+
+    Returns:
+        array: The roots of each order, in increasing order along the rows.
+    """
+    k = np.asarray(k)
+    eps = np.finfo(float).eps
+    step = np.pi / (a + b) / 2
+    xmax = (count + 2) * np.pi / (b - a) + k.max() / a
+    while True:
+        x = np.arange(0.5 * step, xmax, step)
+        G = _phase(x, k[:, np.newaxis], a, b)
+        change = G[:, :-1] * G[:, 1:] < 0
+        if np.all(np.sum(change, axis=1) >= count):
+            break
+        xmax *= 1.5
+
+    # the first count brackets of each order
+    rows, cols = np.nonzero(change)
+    rank = np.cumsum(change, axis=1)[rows, cols] - 1
+    first = rank < count
+    rows, cols, rank = rows[first], cols[first], rank[first]
+    lo, hi = x[cols], x[cols + 1]
+    glo, ghi = G[rows, cols], G[rows, cols + 1]
+    order = k[rows]
+
+    root = hi - ghi * (hi - lo) / (ghi - glo)
+    active = np.arange(root.size)
+    for _ in range(100):
+        x = root[active]
+        g, dg = _phase(x, order[active], a, b, derivative=True)
+        left = g * glo[active] > 0
+        lo[active] = np.where(left, x, lo[active])
+        glo[active] = np.where(left, g, glo[active])
+        hi[active] = np.where(left, hi[active], x)
+        with np.errstate(all='ignore'):
+            new = np.where(g == 0, x, x - g / dg)
+        done = (np.abs(new - x) <= 4 * eps * x) | \
+            (hi[active] - lo[active] <= 4 * eps * x)
+        outside = ~(done | ((lo[active] < new) & (new < hi[active])))
+        root[active] = np.where(outside, 0.5 * (lo[active] + hi[active]), new)
+        active = active[~done]
+        if not active.size:
+            break
+
+    roots = np.zeros((k.size, count))
+    roots[rows, rank] = root
+    return roots
+
+
+def annulus_moments(k, alphax, betax, a, b):
+    r"""Return the integrals :math:`\int_a^b r R(r) \, dr` of the radial
+    modes :math:`R(r) = J_k(\alpha r) + \beta Y_k(\alpha r)` with the even
+    orders k of the rows of alphax and betax.
+
+    The integrals are :math:`[P_k(\alpha b) - P_k(\alpha a)] / \alpha^2`,
+    with the indefinite integrals :math:`P_k(z) = \int z Z_k(z) \, dz` and
+    :math:`Q_j(z) = \int Z_j(z) \, dz` of the cylinder function
+    :math:`Z_k = J_k + \beta Y_k`. These follow from
+    :math:`Z_{j-1} - Z_{j+1} = 2 Z_j'` and :math:`(z Z_1)' = z Z_0` as
+
+    .. math::
+      Q_1 = -Z_0 \ , \quad Q_{j+2} = Q_j - 2 Z_{j+1} \ , \qquad
+      P_0 = z Z_1 \ , \quad P_{j+1} = P_{j-1} - 2 z Z_j + 2 Q_j
+      \ .
+
+    The Bessel functions of the first kind are found by the downward
+    recurrence from the two highest orders, and those of the second kind
+    directly.
+
+    Args:
+        k (array): The orders of the rows.
+        alphax, betax (array): The eigenvalues and weights of the modes.
+        a, b (float): The radii.
+
+    Returns:
+        array: The integrals, with the shape of alphax.
+    """
+    k = np.asarray(k)
+    kmax = k.max()
+    orders = np.arange(kmax + 1)[:, np.newaxis, np.newaxis]
+    P = []
+    for z in (alphax * a, alphax * b):
+        J = np.empty((kmax + 2,) + z.shape)
+        J[kmax + 1], J[kmax] = sp.jv(kmax + 1, z), sp.jv(kmax, z)
+        for j in range(kmax, 0, -1):
+            J[j - 1] = 2 * j / z * J[j] - J[j + 1]
+        Z = J[:-1] + betax * sp.yn(orders, z)
+        zero = np.zeros((1,) + z.shape)
+        # Q[i] is Q_{2i+1}, and Pk[i] is P_{2i}
+        Q = -Z[0] - 2 * np.concatenate([zero, np.cumsum(Z[2:-1:2], axis=0)])
+        steps = 2 * (Q - z * Z[1::2])
+        Pk = z * Z[1] + np.concatenate([zero, np.cumsum(steps, axis=0)])
+        P.append(np.take_along_axis(Pk, (k // 2)[np.newaxis, :, np.newaxis], axis=0)[0])
+    return (P[1] - P[0]) / alphax**2
 
 
 class CylindricalSandwich(ExactSolver):
@@ -117,7 +285,10 @@ class CylindricalSandwich(ExactSolver):
         'T0': r"Temperature boundary condition along :math:`\theta=0` for :math:`a \le r \le b`",
         'Nsum': "Number of terms to include in the n-sum.",
         'Msum': "Number of terms to include in the m-sum.",
-        'NonHomogeneousOnly': "If True, then compute only the static nonhomogeneous solution. "
+        'NonHomogeneousOnly': "If True, then compute only the static nonhomogeneous solution. ",
+        'rtol': "Relative tolerance of the truncated series, or None",
+        'atol': "Absolute tolerance of the truncated series, or None",
+        'table': "Whether to keep the modes in a persistent table in the user cache directory",
         }
 
     kappa = 1.0
@@ -128,6 +299,9 @@ class CylindricalSandwich(ExactSolver):
     Nsum = 20
     Msum = 100
     NonHomogeneousOnly = False
+    rtol = None
+    atol = None
+    table = False
 
     # boundary condition function
     @staticmethod
@@ -141,17 +315,11 @@ class CylindricalSandwich(ExactSolver):
 
     # mode numbers alpha[n,m]
     def alpha(self, N, M, a, b):
-        alphax = np.zeros(shape=(N, M))
-        betax = np.zeros(shape=(N, M))
-        for n in range(N):
-            k = 2 * (n + 1)
-            x0 = 0.1
-            for m in range(M):
-                alphanm = newton(CylindricalSandwich.bc_solve, x0, args=(k, a, b))
-                x0 = alphanm + 4
-                alphax[n, m] = alphanm
-                betax[n, m] = -(sp.jn(k + 1, alphanm * a) - sp.jn(k - 1, alphanm * a)) /\
-                    (sp.yn(k + 1, alphanm * a) - sp.yn(k - 1, alphanm * a))
+        k = 2 * (np.arange(N) + 1)
+        alphax = annulus_roots(k, a, b, M)
+        k = k[:, np.newaxis]
+        betax = -(sp.jn(k + 1, alphax * a) - sp.jn(k - 1, alphax * a)) / \
+            (sp.yn(k + 1, alphax * a) - sp.yn(k - 1, alphax * a))
         return alphax, betax
 
     # R = R[n,m]
@@ -181,45 +349,137 @@ class CylindricalSandwich(ExactSolver):
 
         super(CylindricalSandwich, self).__init__(**kwargs)
 
+    def coefficients(self, alphax, betax):
+        r"""Returns the coefficients :math:`T_{nm}` of the modes with the
+        eigenvalues alphax and the weights betax."""
+        N, M = alphax.shape
+        k = 2 * (np.arange(N) + 1)
+        m = np.arange(M)
+        Rnmb = sp.jn(k[:, np.newaxis], alphax * self.b) + betax * sp.yn(k[:, np.newaxis], alphax * self.b)
+        Rnma = sp.jn(k[:, np.newaxis], alphax * self.a) + betax * sp.yn(k[:, np.newaxis], alphax * self.a)
+        Anm = (1./2.) * (self.b**2 - m**2/alphax**2) * Rnmb - \
+            (1./2.) * (self.a**2 - m**2/alphax**2) * Rnma
+        return (4 * self.T1 / np.pi) * ((-1)**(k // 2) / k)[:, np.newaxis] * (1 / Anm) * \
+            annulus_moments(k, alphax, betax, self.a, self.b)
+
+    def modes(self):
+        r"""Returns the eigenvalues :math:`\alpha_{nm}`, the weights
+        :math:`\beta_{nm}`, the coefficients :math:`T_{nm}`, and the bounds
+        :math:`|T_{nm}| \max |R_{nm}|` of the modes, from the cache of the
+        solver, from the persistent table, or by computing them."""
+        key = (self.a, self.b, self.T1, self.Nsum, self.Msum)
+        if getattr(self, '_modes_key', None) != key:
+            path = os.path.join(cache_dir(), 'cylindrical_sandwich_v{}_{!r}_{!r}_{!r}_{}_{}.npz'
+                                .format(VERSION, *key))
+            modes = self._load(path) if self.table else None
+            if modes is None:
+                alphax, betax = CylindricalSandwich.alpha(self, self.Nsum, self.Msum, self.a, self.b)
+                modes = alphax, betax, self.coefficients(alphax, betax)
+                if self.table:
+                    save(path, alphax=modes[0], betax=modes[1], Tx=modes[2])
+            alphax, betax, Tx = modes
+            self._modes = modes + (np.abs(Tx) * self.Rmax(alphax, betax),)
+            self._modes_key = key
+        return self._modes
+
+    def _load(self, path):
+        try:
+            with np.load(path) as data:
+                modes = data['alphax'], data['betax'], data['Tx']
+        except (OSError, KeyError, ValueError):
+            return None
+        if modes[0].shape != (self.Nsum, self.Msum):
+            return None
+        return modes
+
+    def Rmax(self, alphax, betax):
+        r"""Returns bounds of :math:`|R_{nm}(r)|` for :math:`a \le r \le b`.
+
+        Where :math:`\alpha r < k`, :math:`R_{nm}` has no interior maximum
+        of :math:`|R_{nm}|`, since the coefficient :math:`k^2/r^2 - \alpha^2`
+        of the radial equation is positive. Where :math:`\alpha r \ge k`,
+        :math:`|R_{nm}| \le (1 + \beta^2)^{1/2} (J_k^2 + Y_k^2)^{1/2}`, which
+        decreases with :math:`r`. So the bound is the larger of
+        :math:`|R_{nm}|` at the ends, and of this envelope at the first radius
+        with :math:`\alpha r \ge k`."""
+        k = 2 * (np.arange(alphax.shape[0]) + 1)[:, np.newaxis]
+        Rmax = np.zeros(alphax.shape)
+        for r in (self.a, self.b):
+            Rmax = np.maximum(Rmax, np.abs(sp.jv(k, alphax * r) + betax * sp.yn(k, alphax * r)))
+        z = np.maximum(k, alphax * self.a)
+        envelope = np.sqrt((1 + betax**2) * (sp.jv(k, z)**2 + sp.yn(k, z)**2))
+        return np.where(z < alphax * self.b, np.maximum(Rmax, envelope), Rmax)
+
+    def truncation(self, alphax, bounds, t):
+        r"""Returns the numbers of leading n and m modes needed at time t, and
+        the bound of the neglected terms.
+
+        The terms are bounded by :math:`|T_{nm}| \max |R_{nm}|
+        e^{-\kappa \alpha_{nm} t}`, with the bounds of :math:`|R_{nm}|` of
+        :meth:`Rmax`, and the fewest modes :math:`N \times M` are kept such
+        that the bound of the other ones, and of those beyond ``Msum`` and
+        ``Nsum`` (see :func:`exactpack.solvers.heat.rod1d.tail_bound`), is
+        within the tolerance. Beyond ``Msum``, the terms of each n are bounded
+        by the largest of the computed ones. Beyond ``Nsum``, the sums over m
+        are bounded by :math:`C/k`, the decay of the coefficients of
+        :math:`\sin(k\theta)`, with the largest :math:`C` of the computed
+        ones at :math:`t = 0`, and the rates by the lowest ones
+        :math:`\kappa k / b`, since the Rayleigh quotient of the radial
+        equation gives :math:`\alpha_{nm} \ge k / b`.
+        """
+        rates = self.kappa * alphax
+        weights = bounds * np.exp(-rates * t)
+        tail = sum(tail_bound(bounds[n].max(), rates[n], t) for n in range(alphax.shape[0]))
+        k = 2 * (np.arange(alphax.shape[0]) + 1)
+        C = np.max(k * bounds.sum(axis=1))
+        tail += tail_bound(C / k[-1], self.kappa * k / self.b, t)
+        remainder = weights.sum() + tail - np.cumsum(np.cumsum(weights, axis=0), axis=1)
+
+        tol = tolerance(self.rtol, self.atol, max(abs(self.T0), abs(self.T0 + self.T1)))
+        N, M = alphax.shape
+        if tol is not None:
+            met = np.argwhere(remainder <= tol) + 1
+            if met.size:
+                N, M = met[np.lexsort((met[:, 0], np.prod(met, axis=1)))[0]]
+            else:
+                warn("The series does not meet the tolerance {:g} with {} modes, the "
+                     "neglected terms are bounded by {:g}".format(tol, N * M, tail))
+        return N, M, remainder[N - 1, M - 1]
+
     def _run(self, rtheta_list, t):
         # unpack rtheta_list
-        r = rtheta_list[0]
-        theta = rtheta_list[1]
+        r = np.asarray(rtheta_list[0], dtype=float)
+        theta = np.asarray(rtheta_list[1], dtype=float)
         #
 
-        alphax = np.zeros((self.Nsum, self.Msum))
-
-        # dT = r * R[n,m]
-        def dTinRun(x, k, m, alphanm, betanm):
-            Tnm = sp.jn(k, x * alphanm) + betanm * sp.yn(k, x * alphanm)
-            return x * Tnm
-
         # specific nonhomogeneous contribution \bar T(x,y)
         tempnonhom = self.T0 + 2 * self.T1 * theta / np.pi
         # general homogeneous contribution \tilde T(x, y, t)
         temperature = 0
+        N, M, tail = 0, 0, 0.0
         if self.NonHomogeneousOnly == False:
-            alphax, betax = CylindricalSandwich.alpha(self, self.Nsum, self.Msum, self.a, self.b)
-            for n in range(self.Nsum):  # fragile: n <= 20
-                k = 2 * (n + 1)
-                for m in range(self.Msum):
-                    alphanm = alphax[n, m]  # eigen values based on Bessel Functions
-                    betanm = betax[n, m]  # J vs Y weighting
-                    Rnm = CylindricalSandwich.R(self, r, k, m, alphanm, betanm)
-                    #
-                    Rnmb = sp.jn(k, alphanm * self.b) + betanm * sp.yn(k, alphanm * self.b)
-                    Rnma = sp.jn(k, alphanm * self.a) + betanm * sp.yn(k, alphanm * self.a)
-                    Anm = (1./2.) * (self.b**2 - m**2/alphanm**2) * Rnmb - \
-                      (1./2.) * (self.a**2 - m**2/alphanm**2) * Rnma
-                    # Anm = CylindricalSandwich.Anm_analytic(self, self.a, self.b, k, m, alphanm, betanm)
-                    Tnm = (4 * self.T1 / np.pi) * ((-1)**(k/2) / float(k)) * (1 / Anm) * \
-                        quad(dTinRun, self.a, self.b, args=(k, m, alphanm, betanm))[0]
-                    tmp = Tnm * Rnm * np.sin(k * theta) * np.exp(-self.kappa * alphanm * t)  # combine Tnm and tmp
-                    temperature += tmp  # this line is throwing a waring during the unit test
+            alphax, betax, Tx, bounds = self.modes()
+            N, M, tail = self.truncation(alphax, bounds, t)
+            alphax, betax = alphax[:N, :M], betax[:N, :M]
+            weights = Tx[:N, :M] * np.exp(-self.kappa * alphax * t)
+            k = 2 * (np.arange(N) + 1)
+            # the radial sums over m for each n, at the distinct radii, in
+            # blocks within the memory budget
+            ur, ir = np.unique(r.ravel(), return_inverse=True)
+            radial = np.zeros((N, ur.size))
+            block = max(1, BLOCK_BYTES // (8 * N * M))
+            for start in range(0, ur.size, block):
+                arg = alphax[:, :, np.newaxis] * ur[start:start + block]
+                Rnm = sp.jn(k[:, np.newaxis, np.newaxis], arg) + \
+                    betax[:, :, np.newaxis] * sp.yn(k[:, np.newaxis, np.newaxis], arg)
+                radial[:, start:start + block] = np.einsum('nm,nmp->np', weights, Rnm)
+            temperature = np.einsum('np,pn->p', radial[:, ir],
+                                    np.sin(np.outer(theta.ravel(), k))).reshape(r.shape)
 
         # add homogeneous and nonhomogeneous
         temperature = temperature + tempnonhom
 
         return ExactSolution([r, theta, temperature],
                     names=['position_r', 'angle_theta',
-                           'temperature'], jumps=[])
+                           'temperature'], jumps=[],
+                    metadata={'modes': (N, M), 'tail_bound': tail})
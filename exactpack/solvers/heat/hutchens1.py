@@ -47,11 +47,28 @@ In practice, we must truncate the series at some maximum value
 For the iron sphere of problem 1 in Ref. [Hutchens2009]_ , the
 choice :math:`N=100` is made.
 
+At early times, the series converges slowly. In terms of
+:math:`w(r,t) = r\,(T(r,t) - T_b)`, the problem is that of a rod,
+:math:`\partial_t w = \alpha\, \partial_r^2 w` with :math:`w(0,t) = w(b,t) = 0`
+and :math:`w(r,0) = (T_0 - T_b)\, r`, which is then solved with the method of
+images of :func:`exactpack.solvers.heat.rod1d.image_sum`, and the
+temperature at the center is :math:`T_b + \partial_r w(0,t)`. The parameter
+``method`` selects the ``'fourier'`` or ``'images'`` form, or, by default
+(``'auto'``), whichever needs fewer terms at the given time.
+
+If the tolerance ``rtol`` or ``atol`` is given, the series is truncated as
+in :class:`exactpack.solvers.heat.rod1d.Rod1D`, with the terms bounded by
+:math:`2 |T_b - T_0|\, e^{-\alpha (n \pi / b)^2 t}`, and relative to the
+larger of :math:`|T_b|` and :math:`|T_0|`.
+
 """
 
 import numpy as np
+from scipy.special import erfc
 
 from ...base import ExactSolver, ExactSolution, Jump, JumpCondition
+from .rod1d import IMAGE_REACH, MeshSolution, image_sum, images_cheaper, significant, \
+    tail_bound, tolerance, truncation
 
 
 class Hutchens1(ExactSolver):
@@ -72,7 +89,11 @@ class Hutchens1(ExactSolver):
         'Tb': "Temperature of the radial boundary at :math:`r=b` [eV]",
         'T0': "Initial uniform temperature of the sphere` [eV]",
         'Nsum': "Number of terms to include in the sum.",
-        'b': "Radius of the sphere [cm]"
+        'b': "Radius of the sphere [cm]",
+        'method': "'fourier' or 'images' series, or 'auto' to use the images \
+            at early times",
+        'rtol': "Relative tolerance of the truncated Fourier series, or None",
+        'atol': "Absolute tolerance of the truncated Fourier series, or None",
         }
 
     # iron
@@ -84,27 +105,100 @@ class Hutchens1(ExactSolver):
     Tb = 5.0
     T0 = 1.0
     Nsum = 100
+    method = 'auto'
+    rtol = None
+    atol = None
 
     def __init__(self, **kwargs):
 
         super(Hutchens1, self).__init__(**kwargs)
 
-    def _run(self, r, t):
-
-        # thermal diffusivity
+    def use_images(self, t):
+        r"""Returns whether the solution at time t is evaluated with the
+        method of images."""
+        if self.method in ('images', 'fourier'):
+            return self.method == 'images'
+        elif self.method != 'auto':
+            raise ValueError("Unknown method: {}".format(self.method))
         alpha = self.k / (self.rho * self.cp)
+        return images_cheaper(alpha, t, self.b, np.pi * np.arange(1, self.Nsum) / self.b)
 
-        temperature = np.zeros(shape=r.shape)
-        for n in range(1, self.Nsum):
-            nb = np.pi * n / self.b
-            x = (-1)**n / float(n)
-            x = x * np.where(r != 0, (2 * self.b / (np.pi * r)) * np.sin(nb * r), 0)  # bad at r=0
-            x = x * np.exp(-alpha * nb**2 * t)
-            temperature += x
-        temperature = np.where(r != 0, temperature, -1)  # value at r=0
-        temperature = (self.Tb - self.T0) * temperature
-        temperature = self.Tb + temperature
-
+    def image_solution(self, r, t):
+        r"""Returns the solution at the radii r and time t by the method of
+        images, and its metadata."""
+        alpha = self.k / (self.rho * self.cp)
+        # w = r (T - Tb) on a rod with Dirichlet ends
+        s = np.sqrt(4 * alpha * t)
+        args = (s, self.b, 0.0, (self.T0 - self.Tb) * self.b, True, True)
+        w = image_sum(r, *args)
+        center = image_sum(np.zeros(1), *args, derivative=True)[0]
+        temperature = self.Tb + np.where(r != 0, w / np.where(r != 0, r, 1), center)
+        metadata = {'method': 'images',
+                    'terms': 2 * (3 + 2 * int(IMAGE_REACH * s / (2 * self.b))),
+                    'tail_bound': 2 * abs(self.T0 - self.Tb) * erfc(IMAGE_REACH)}
+        return temperature, metadata
+
+    def fourier_coefficients(self, t):
+        r"""Returns the coefficients :math:`(T_b - T_0)\, e^{-\alpha (n\pi/b)^2 t}`
+        of the leading modes :math:`n = 1, 2, \ldots` that are kept at time t,
+        and the metadata of the truncation."""
+        alpha = self.k / (self.rho * self.cp)
+        # the terms of the series are bounded by 2 |Tb - T0| exp(-alpha nb^2 t)
+        rates = alpha * (np.pi * np.arange(1, self.Nsum) / self.b)**2
+        bound = 2 * abs(self.Tb - self.T0)
+        N, tail = truncation(bound * np.exp(-rates * t), tail_bound(bound, rates, t),
+                             tolerance(self.rtol, self.atol, max(abs(self.Tb), abs(self.T0))))
+        metadata = {'method': 'fourier', 'terms': N, 'tail_bound': tail}
+        return (self.Tb - self.T0) * np.exp(-rates[:N] * t), metadata
+
+    def bind(self, r):
+        r"""Returns the :class:`exactpack.solvers.heat.rod1d.MeshSolution` of
+        the solver at the radii r, for evaluation at many times."""
+        return MeshSolution(self, r)
+
+    def _bind(self, r):
+        r = np.asarray(r, dtype=float)
+        return {'r': r, 'modes': np.zeros((r.size, 0))}
+
+    def _evaluate(self, state, times):
+        r = state['r'].ravel()
+        temperature = np.empty((len(times), r.size))
+        metadata = [None] * len(times)
+        fourier = []
+        for i, t in enumerate(times):
+            if self.use_images(t):
+                temperature[i], metadata[i] = self.image_solution(r, t)
+            else:
+                coefficients, metadata[i] = self.fourier_coefficients(t)
+                fourier.append((i, coefficients))
+
+        if fourier:
+            N = max(significant(c) for i, c in fourier)
+            if state['modes'].shape[1] < N:
+                n = np.arange(1, N + 1)
+                nb = np.pi * n / self.b
+                # sin(nb r) / r tends to nb at r=0
+                modes = np.sin(np.outer(r, nb)) / np.where(r != 0, r, 1)[:, np.newaxis]
+                modes[r == 0] = nb
+                state['modes'] = modes * (2 * self.b / np.pi) * (-1)**n / n
+            C = np.zeros((len(fourier), N))
+            for j, (i, c) in enumerate(fourier):
+                C[j, :min(N, len(c))] = c[:N]
+            rows = [i for i, c in fourier]
+            temperature[rows] = self.Tb + np.dot(C, state['modes'][:, :N].T)
+            for i, t in enumerate(times):
+                if t == 0 and i in rows:
+                    # the series does not converge at r=0 for t=0
+                    temperature[i, r == 0] = self.T0
+
+        return temperature.reshape((len(times),) + state['r'].shape), metadata
+
+    def _solution(self, r, temperature, metadata):
         return ExactSolution([r, temperature],
-                             names=['radius', 'temperature']
+                             names=['radius', 'temperature'],
+                             metadata=metadata
                             )
+
+    def _run(self, r, t):
+
+        return self.bind(r)(t)
@@ -7,8 +7,8 @@ The steady state heat conduction equation for the temperature profile
 :math:`T(r,z,t)` takes the following form in cylindrical coordinates,
 
 .. math::
-  \frac{1}{r^2} \frac{\partial}{\partial r}
-  \left( r^2 \frac{\partial T}{\partial r} \right)
+  \frac{1}{r} \frac{\partial}{\partial r}
+  \left( r \frac{\partial T}{\partial r} \right)
   +
   \frac{\partial^2 T}{\partial z^2}
   +
@@ -33,35 +33,50 @@ A Fourier analysis and the separation of variables technique yields the
 exact solution,
 
 .. math::
-  T(r,t) &=
-  T_b + \Big(T_L - T_0 \Big) \frac{z}{L} + \frac{1}{2}\frac{g_0}{k} z \Big(L - z \Big) +
-  \\
-  & \frac{2}{\pi}\, T_L \sum_{n=0}^\infty \frac{(-1)^{2n+1}}{2n+1}\,
-  \frac{I_0(\lambda_n r)}{I_0(\lambda_n b)}\,\sin(\lambda_n z)
-  -
-  \frac{4 g_0 L^2}{\pi^3 k}\, \sum_{n=0}^\infty \frac{1}{(2n+1)^3}
-  \frac{I_0(\lambda_n r)}{I_0(\lambda_n b)}\,\sin(\lambda_n z)
+  T(r,z) &=
+  T_0 + \Big(T_L - T_0 \Big) \frac{z}{L} + \frac{1}{2}\frac{g_0}{k} z \Big(L - z \Big)
+  + \sum_{m=1}^\infty c_m \,
+  \frac{I_0(\lambda_m r)}{I_0(\lambda_m b)}\,\sin(\lambda_m z)
+  \ ,
+  \\[3pt]
+  c_m &= \frac{2}{m \pi} \Big[ T_b \big(1 - (-1)^m\big) - T_0 + (-1)^m T_L \Big]
+  - \frac{2 g_0 L^2}{k\, m^3 \pi^3} \big(1 - (-1)^m\big)
   \ ,
 
 where :math:`I_0(z)` is a modified Bessel function of the first kind,
 and
 
 .. math::
-  \lambda_n = \frac{(2n+1)\pi}{L}
+  \lambda_m = \frac{m\pi}{L}
   \ .
 
-In practice, we must truncate the series at some maximum value
-:math:`n_{\rm max}=N`. Care must be taken when choosing the value of
-:math:`N`, especially since the series solution is alternating in sign.
-For the iron sphere of problem 1 in Ref. [Hutchens2009]_ , the
-choice :math:`N=100` is made.
+The coefficients :math:`c_m` are the Fourier sine coefficients of
+:math:`T_b` minus the first three terms on :math:`r = b`. The even modes
+vanish when :math:`T_0 = T_L`.
+
+In practice, we must truncate the series, which is done after the
+:math:`2N` modes :math:`m \le 2N`, with :math:`N` the parameter `Nsum`.
+Inside the cylinder the modes decay as :math:`e^{\lambda_m (r - b)}`, so
+the series converges quickly; on :math:`r = b` it converges to
+:math:`T_b` only as :math:`1/N`.
+
+Each mode is the product of a function of :math:`r` and of
+:math:`\sin(\lambda_m z)`, so the modes are evaluated on the distinct values
+of :math:`r` and of :math:`z` of the points, and summed with a matrix product,
+which is then gathered back to the points. This is much cheaper on the
+tensor-product meshes of :math:`r` and :math:`z`. The ratios of the Bessel
+functions are evaluated as :math:`I_0(\lambda_m r) / I_0(\lambda_m b) =
+e^{\lambda_m (r - b)} \, i_0(\lambda_m r) / i_0(\lambda_m b)`, with the
+exponentially scaled :math:`i_0(x) = e^{-x} I_0(x)`, so that they do not
+overflow for large :math:`N`.
 
 """
 
 import numpy as np
-from scipy.special import i0 as i0
+from scipy.special import i0e
 
 from ...base import ExactSolver, ExactSolution
+from .rod1d import BLOCK_BYTES
 
 
 class Hutchens2(ExactSolver):
@@ -81,7 +96,7 @@ class Hutchens2(ExactSolver):
         'Tb': "Temperature of the radial boundary at :math:`r=b` [eV]",
         'T0': "Temperature of the cylinder at :math:`z=0` [eV]",
         'TL': "Temperature of the cylinder at :math:`z=L` [eV]",
-        'Nsum': "Number of terms to include in the sum.",
+        'Nsum': "Half the number of modes to include in the sum.",
         'b': "Radius of the cylinder [cm]",
         'L': "Height of cylinder [cm]"
         }
@@ -103,20 +118,40 @@ class Hutchens2(ExactSolver):
 
     def _run(self, rzlist, t):
 
-        r = rzlist[0]
-        z = rzlist[1]
+        r, z = np.broadcast_arrays(np.asarray(rzlist[0], dtype=float),
+                                   np.asarray(rzlist[1], dtype=float))
 
         temperature = self.T0 + (self.TL - self.T0) * z / self.L + \
             (self.g0 / (2 * self.k)) * z * (self.L - z)
-        sum = 0
-        for n in range(0, self.Nsum):
-            nodd = float(2 * n + 1)
-            lam = nodd * np.pi / self.L
-            iratio = (2. / np.pi) * i0(lam * r) / i0(lam * self.b)
-            sum += (2 * self.Tb - self.T0) * iratio * np.sin(lam * z) / nodd
-            sum += self.TL * iratio * (-1)**nodd * np.sin(lam * z) / nodd
-            sum += -(2 * self.g0 * self.L**2 / (np.pi**2 * self.k)) * np.sin(lam * z) / nodd**2
-            temperature += sum
+
+        m = np.arange(1, 2 * self.Nsum + 1)
+        sign = (-1.)**m
+        lam = m * np.pi / self.L
+        cm = 2. / (m * np.pi) * (self.Tb * (1 - sign) - self.T0 +
+                                 self.TL * sign) - \
+            2 * self.g0 * self.L**2 * (1 - sign) / (self.k * (m * np.pi)**3)
+
+        ur, ir = np.unique(r.ravel(), return_inverse=True)
+        uz, iz = np.unique(z.ravel(), return_inverse=True)
+        # I0(lam r) / I0(lam b), without overflow
+        with np.errstate(under='ignore'):
+            iratio = np.exp(np.outer(np.abs(ur) - self.b, lam)) * \
+                i0e(np.outer(ur, lam)) / i0e(lam * self.b)
+        radial = cm * iratio
+        axial = np.sin(np.outer(uz, lam))
+
+        if ur.size * uz.size <= 2 * r.size:
+            # the tensor grid of the unique values is not much larger than
+            # the points
+            series = np.dot(radial, axial.T)[ir, iz]
+        else:
+            series = np.zeros(r.size)
+            block = max(1, BLOCK_BYTES // (8 * max(lam.size, 1)))
+            for start in range(0, r.size, block):
+                stop = start + block
+                series[start:stop] = np.einsum('pn,pn->p', radial[ir[start:stop]],
+                                               axial[iz[start:stop]])
+        temperature = temperature + series.reshape(r.shape)
 
         return ExactSolution([r, z, temperature],
                 names=['position_r', 'position_z', 'temperature'],
@@ -68,6 +68,9 @@ class PlanarSandwich(Rod1D):
         'TB': "The boundary condition at the bottom",
         'TL': Rod1D.parameters['TL'],
         'TR': Rod1D.parameters['TR'],
+        'method': Rod1D.parameters['method'],
+        'rtol': Rod1D.parameters['rtol'],
+        'atol': Rod1D.parameters['atol'],
         }
 
     alpha1 = 1
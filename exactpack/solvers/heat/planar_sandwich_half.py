@@ -20,6 +20,9 @@ class PlanarSandwichHalf(Rod1D):
         'FT': "The flux at the top",
         'TL': Rod1D.parameters['TL'],
         'TR': Rod1D.parameters['TR'],
+        'method': Rod1D.parameters['method'],
+        'rtol': Rod1D.parameters['rtol'],
+        'atol': Rod1D.parameters['atol'],
         }
 
     alpha1 = 1
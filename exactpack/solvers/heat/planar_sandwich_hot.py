@@ -20,6 +20,9 @@ class PlanarSandwichHot(Rod1D):
         'F': "The flux at the top and bottom",
         'TL': Rod1D.parameters['TL'],
         'TR': Rod1D.parameters['TR'],
+        'method': Rod1D.parameters['method'],
+        'rtol': Rod1D.parameters['rtol'],
+        'atol': Rod1D.parameters['atol'],
         }
 
     alpha1 = 0
@@ -5,14 +5,39 @@ heat flux conditions. The initial temperature of the rectangle is taken to vanis
 
 """
 
+from warnings import warn
+
 import numpy as np
 
 from ...base import ExactSolver, ExactSolution
+from .rod1d import BLOCK_BYTES, MeshSolution, tail_bound, tolerance, truncation
 
 
 class Rectangle(ExactSolver):
 
     r"""Computes the solution to a rectangular heat flow problem.
+
+    Both series are separable. The factors :math:`\sin k_n x` and
+    :math:`\sin k_m y` of the time dependent series, and
+    :math:`\sin k_n x` and :math:`\sinh k_n y / \sinh k_n b` of the steady
+    series, are evaluated on the distinct values of x and y, and contracted
+    with the matrix of the coefficients by matrix products. If the points
+    are (close to) a tensor product mesh, the solution is evaluated on the
+    mesh of the distinct values, :math:`X W Y^T`, and gathered at the points.
+    The ratio of the hyperbolic sines is evaluated as
+    :math:`e^{k_n (y - b)} (1 - e^{-2 k_n y}) / (1 - e^{-2 k_n b})`, which
+    does not overflow for large ``Nsum``.
+
+    If the tolerance ``rtol`` or ``atol`` is given, relative to
+    :math:`|T_{\rm top}|`, the series are truncated to the fewest leading
+    modes that meet it, as in :class:`exactpack.solvers.heat.rod1d.Rod1D`.
+    The terms of the time dependent double series are bounded by
+    :math:`8 |T_{\rm top}| e^{-\kappa (k_n^2 + k_m^2) t} / \pi^2 (2n+1) m`,
+    and those of the steady series by
+    :math:`4 |T_{\rm top}| e^{-k_n (b - y)} / n \pi`, at the largest
+    :math:`y` of the points. The tolerance is shared equally between the
+    two series. The numbers of modes and the bound of the neglected terms
+    are reported in the ``metadata`` of the solution.
     """
 
     parameters = {
@@ -21,7 +46,9 @@ class Rectangle(ExactSolver):
         'a': "Length of the rectangle in the x-direction",
         'b': "Length of the rectangle in the y-direction",
         'Ttop': "Temperature BC on the top of the rectangle at y=b",
-        'NonHomogeneousOnly': "If True, then compute only the static nonhomogeneous solution. "
+        'NonHomogeneousOnly': "If True, then compute only the static nonhomogeneous solution. ",
+        'rtol': "Relative tolerance of the truncated series, or None",
+        'atol': "Absolute tolerance of the truncated series, or None",
         }
 # NonHomogeneousOnly = False is the default, i.e. plot the dynamic solution on top of the static.
     kappa = 1.0
@@ -30,41 +57,150 @@ class Rectangle(ExactSolver):
     b = 2.0
     Ttop = 1.0
     NonHomogeneousOnly = False
+    rtol = None
+    atol = None
 
     def __init__(self, **kwargs):
 
         super(Rectangle, self).__init__(**kwargs)
 
-    def _run(self, xylist, t):
+    def truncation(self, y, t):
+        r"""Returns the numbers of modes of the steady and of the time
+        dependent series needed at the points y and time t, and the bound of
+        the neglected terms."""
+        tol = tolerance(self.rtol, self.atol, self.Ttop)
+        if tol is not None:
+            tol = 0.5 * tol
+        bound = abs(self.Ttop)
+
+        # steady series over n = 1, ..., Nsum - 1, with only the odd n
+        n = np.arange(1, self.Nsum)
+        kn = n * np.pi / self.a
+        depth = self.b - np.max(y, initial=0.0)
+        weights = np.where(n % 2, 4 * bound / (n * np.pi), 0) * np.exp(-kn * depth)
+        N, steady_tail = truncation(weights, tail_bound(4 * bound / (n[-1] * np.pi), kn, depth), tol)
+        steady_modes = N + 1
+        if self.NonHomogeneousOnly != False:
+            return steady_modes, 0, steady_tail
+
+        # time dependent series over n = 0, ..., K - 1 and m = 1, ..., K - 1,
+        # whose bounds are the products u_n v_m
+        n = np.arange(self.Nsum)
+        rates = self.kappa * ((2 * n + 1) * np.pi / self.a)**2
+        u = np.exp(-rates * t) / (2 * n + 1)
+        u_total = u.sum() + tail_bound(1.0 / (2 * n[-1] + 1), rates, t)
+        m = np.arange(1, self.Nsum)
+        rates = self.kappa * (m * np.pi / self.b)**2
+        v = np.exp(-rates * t) / m
+        v_total = v.sum() + tail_bound(1.0 / m[-1], rates, t)
+        # remainder of the first K modes, for K = 1, ..., Nsum
+        C = 8 * bound / np.pi**2
+        remainder = C * (u_total * v_total - np.cumsum(u) * np.append(0, np.cumsum(v)))
+        K = self.Nsum
+        if tol is not None:
+            met = np.flatnonzero(remainder <= tol)
+            if met.size:
+                K = met[0] + 1
+            else:
+                warn("The series does not meet the tolerance {:g} with {} modes, the "
+                     "neglected terms are bounded by {:g}".format(tol, K, remainder[-1]))
+        return steady_modes, K, steady_tail + remainder[K - 1]
+
+    def coefficients(self, K, t):
+        r"""Returns the matrix of the coefficients
+        :math:`A_{nm} e^{-\kappa (k_n^2 + k_m^2) t}` of the time dependent
+        series, for :math:`n = 0, \ldots, K - 1` and :math:`m = 1, \ldots, K - 1`."""
+        n = np.arange(K)[:, np.newaxis]
+        m = np.arange(1, K)
+        alpha2 = ((2 * n + 1) * np.pi / self.a)**2 + (m * np.pi / self.b)**2
+        Anm = 4 * self.Ttop * 2 * (-1)**m * (m / (2 * n + 1)) / alpha2 / self.b**2
+        return Anm * np.exp(-self.kappa * alpha2 * t)
+
+    def bind(self, xylist):
+        r"""Returns the :class:`exactpack.solvers.heat.rod1d.MeshSolution` of
+        the solver at the points xylist, for evaluation at many times."""
+        return MeshSolution(self, xylist)
+
+    def _bind(self, xylist):
+        x = np.asarray(xylist[0], dtype=float)
+        y = np.asarray(xylist[1], dtype=float)
+        ux, ix = np.unique(x.ravel(), return_inverse=True)
+        uy, iy = np.unique(y.ravel(), return_inverse=True)
+        state = {'shape': x.shape, 'ux': ux, 'ix': ix, 'uy': uy, 'iy': iy,
+                 # evaluate on the tensor grid of the unique values if it is
+                 # not much larger than the points
+                 'grid': ux.size * uy.size <= 2 * x.size,
+                 'sinx': np.zeros((ux.size, 0)), 'siny': np.zeros((uy.size, 0))}
+
+        # the truncation of the steady series does not depend on the time
+        steady_modes = self.truncation(uy, 0.0)[0]
+        n = np.arange(1, steady_modes)
+        kn = n * np.pi / self.a
+        Ttopn = 2 * self.Ttop * (1 - (-1)**n) / (n * np.pi)
+        # sinh(kn y) / sinh(kn b), without overflow
+        with np.errstate(under='ignore'):
+            ratio = np.exp(np.outer(np.abs(uy) - self.b, kn)) * \
+                np.expm1(-2 * np.outer(np.abs(uy), kn)) / np.expm1(-2 * kn * self.b)
+            ratio *= np.sign(uy)[:, np.newaxis]
+        state['steady'] = self._contract(state, np.sin(np.outer(ux, kn)) * Ttopn,
+                                         np.eye(n.size)[np.newaxis], ratio)[0]
+        state['steady_modes'] = steady_modes
+        return state
+
+    def _contract(self, state, X, W, Y):
+        r"""Returns :math:`\sum_{nm} X_n(x) W_{nm} Y_m(y)` at the points,
+        for each of the matrices W, from the factors X and Y at the unique
+        values of x and y."""
+        ix, iy = state['ix'], state['iy']
+        result = np.zeros((len(W), ix.size))
+        if not (X.shape[1] and Y.shape[1]):
+            return result
+        # blocks of the matrices W, so that the (points x matrices x modes)
+        # products stay within the memory budget
+        size = state['ux'].size * state['uy'].size if state['grid'] else ix.size
+        block = max(1, BLOCK_BYTES // (8 * size * max(X.shape[1], Y.shape[1])))
+        for start in range(0, len(W), block):
+            stop = min(start + block, len(W))
+            XW = np.dot(X, np.transpose(W[start:stop], (1, 0, 2)).reshape(X.shape[1], -1))
+            XW = XW.reshape(X.shape[0], stop - start, Y.shape[1])
+            if state['grid']:
+                result[start:stop] = np.dot(XW, Y.T)[ix, :, iy].T
+            else:
+                result[start:stop] = np.einsum('pjm,pm->jp', XW[ix], Y[iy])
+        return result
+
+    def _evaluate(self, state, times):
+        temperature = np.zeros((len(times), state['ix'].size))
+        metadata = []
+        for t in times:
+            steady_modes, modes, tail = self.truncation(state['uy'], t)
+            metadata.append({'modes': modes, 'steady_modes': state['steady_modes'],
+                             'tail_bound': tail})
 
-        x = xylist[0]
-        y = xylist[1]
-
-        # specific nonhomogeneous contribution \bar T(x,y)
-        tempnonhom = 0
-        temperature = 0
-        for n in range(1, self.Nsum):
-            kn = n * np.pi / self.a
-            Ttopn = 2 * self.Ttop * (1 - (-1)**n) / (n * np.pi)
-            tmp = Ttopn * np.sin(kn * x) * np.sinh(kn * y) / np.sinh(kn * self.b)
-            tempnonhom += tmp
-        # general homogeneous contribution \tilde T(x, y, t)
         if self.NonHomogeneousOnly == False:
-            for n in range(0, self.Nsum):
-                kn = (2 * n + 1) * np.pi / self.a
-                for m in range(1, self.Nsum):
-                    km = m * np.pi / self.b
-                    alpha2 = kn**2 + km**2
-                    Anm = 4 * self.Ttop * 2 * (-1)**m * (m / (2 * n + 1)) / alpha2 / self.b**2
-                    tmp = Anm * np.sin(kn * x) * np.sin(km * y) * np.exp(-self.kappa * alpha2 * t)
-                    temperature += tmp
-
-        # add homogeneous and nonhomogeneous
-        temperature = temperature + tempnonhom
-
-        return ExactSolution([x, y, temperature],
+            K = max(data['modes'] for data in metadata)
+            if state['sinx'].shape[1] < K:
+                state['sinx'] = np.sin(np.outer(state['ux'], (2 * np.arange(K) + 1) * np.pi / self.a))
+                state['siny'] = np.sin(np.outer(state['uy'], np.arange(1, K) * np.pi / self.b))
+            W = np.zeros((len(times), K, max(K - 1, 0)))
+            for j, t in enumerate(times):
+                Kj = metadata[j]['modes']
+                W[j, :Kj, :Kj - 1] = self.coefficients(Kj, t)
+            temperature = self._contract(state, state['sinx'][:, :K], W,
+                                         state['siny'][:, :K - 1])
+
+        temperature += state['steady']
+        return temperature.reshape((len(times),) + state['shape']), metadata
+
+    def _solution(self, xylist, temperature, metadata):
+        return ExactSolution([xylist[0], xylist[1], temperature],
                     names=['position_x',
                     'position_y',
                     'temperature'],
-                    jumps=[]
+                    jumps=[],
+                    metadata=metadata
                     )
+
+    def _run(self, xylist, t):
+
+        return self.bind(xylist)(t)
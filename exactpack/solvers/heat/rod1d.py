@@ -295,13 +295,417 @@ The coefficients :math:`B_n` can be calculated from
   \Big[ -1 + \cos k_n L + k_n L \, \sin k_n L \Big]
   \ .
 
+Short times: At early times, :math:`\kappa t \ll L^2`, the Fourier series
+converge slowly, and their truncation shows Gibbs oscillations near the
+ends of the rod. For the boundary conditions BC1 to BC4, the solution is
+then evaluated with the method of images instead. The homogeneous
+initial profile :math:`f(x)` on :math:`(0,L)` is extended to the real line
+by reflections about :math:`x=0` and :math:`x=L`, odd at a Dirichlet end and
+even at a Neumann end, and the extension :math:`F(x)` is evolved with the
+heat kernel of the infinite line,
+
+.. math::
+  T(x,t) = \int_{-\infty}^\infty dy \, F(y)\,
+  \frac{e^{-(x-y)^2/4\kappa t}}{\sqrt{4\pi\kappa t}}
+  \ .
+
+Since :math:`F` is piecewise linear, each piece contributes in closed form
+in terms of :math:`{\rm erfc}` and a Gaussian, and only the images within a
+few diffusion lengths :math:`\sqrt{4\kappa t}` of the rod contribute. The
+parameter ``method`` selects the ``'fourier'`` or ``'images'`` form, or, by
+default (``'auto'``), whichever needs fewer terms at the given time.
+
+Truncation: By default, the Fourier series are summed over the first
+``Nsum`` modes. If a relative tolerance ``rtol``, or an absolute tolerance
+``atol``, is given, only the leading modes are kept such that the bound
+:math:`\sum_n (|A_n| + |B_n|)\, e^{-\kappa k_n^2 t}` of the neglected ones,
+including a geometric bound of the modes beyond ``Nsum`` (see
+:func:`tail_bound`), is within :math:`{\rm atol} + {\rm rtol}\, T_s`,
+where :math:`T_s` is the largest of the initial and boundary temperatures.
+The number of terms and the bound of the neglected ones are reported in
+the ``metadata`` of the solution.
+
+Many times: To evaluate the solution at the same positions at many times,
+:meth:`Rod1D.bind` returns a :class:`MeshSolution`, which computes the
+steady solution and the cosines and sines of the modes at the positions
+once. The solution at a vector of times is then a single product of the
+matrix of the decayed coefficients at each time with the matrix of the
+modes.
+
 """
 
+from warnings import warn
+
 import numpy as np
-from scipy.optimize import fsolve
+from scipy.special import erfc
 
 from ...base import ExactSolver, ExactSolution, Jump, JumpCondition
 
+#: Memory budget, in bytes, of the (points x modes) blocks of :func:`mode_sum`.
+BLOCK_BYTES = 2**22
+
+#: Images farther than this many diffusion lengths :math:`\sqrt{4\kappa t}`
+#: from a point are neglected by :func:`image_sum`, and Fourier modes with
+#: :math:`\kappa k_n^2 t` above :data:`DECAY_LIMIT` are counted as negligible
+#: when choosing between the two forms.
+IMAGE_REACH = 7.0
+DECAY_LIMIT = IMAGE_REACH**2
+#: The cost of a piece of the image series relative to a Fourier mode.
+IMAGE_COST = 3
+
+
+def mode_sum(x, kn, An, Bn):
+    r"""Return the Fourier sum :math:`\sum_n A_n \cos k_n x + B_n \sin k_n x`
+    at the points x.
+
+    The sum is evaluated as a product of (points x modes) blocks of the
+    cosines and sines with the coefficient vectors, so that the work is done
+    by BLAS, with blocks of at most :data:`BLOCK_BYTES`. Coefficients that
+    have underflowed to subnormal numbers, for example because of the decay
+    factor :math:`e^{-\kappa k_n^2 t}`, are set to zero, as they slow down the
+    arithmetic without changing the sum, and trailing modes whose
+    coefficients are both zero are dropped. If the wave numbers are equally
+    spaced, :math:`k_n = k_0 + n\,\Delta k`, the modes are grouped into
+    :math:`J` blocks of :math:`M` and each phase is split as
+    :math:`k_n x = jM\Delta k\, x + (k_0 + m \Delta k)\, x`, so that only
+    :math:`J + M` rather than :math:`JM` cosines and sines are needed at each
+    point.
+
+    Args:
+        x (array): The positions.
+        kn (array): The wave numbers :math:`k_n`.
+        An (array): The coefficients of the cosines.
+        Bn (array): The coefficients of the sines.
+
+    Returns:
+        array: The sum at the positions x, with the shape of x.
+    """
+    x = np.asarray(x, dtype=float)
+    kn = np.asarray(kn, dtype=float)
+    tiny = np.finfo(float).tiny
+    An = np.where(np.abs(An) < tiny, 0.0, An)
+    Bn = np.where(np.abs(Bn) < tiny, 0.0, Bn)
+    result = np.zeros(x.size)
+    nonzero = np.flatnonzero((An != 0) | (Bn != 0))
+    if not nonzero.size:
+        return result.reshape(x.shape)
+    N = nonzero[-1] + 1
+    kn, An, Bn = kn[:N], An[:N], Bn[:N]
+    points = x.ravel()
+
+    dk = (kn[-1] - kn[0]) / max(N - 1, 1)
+    n = np.arange(N)
+    uniform = np.abs(kn - (kn[0] + n * dk)) <= 1.e-12 * np.abs(kn).max()
+    if N > 1 and np.all(uniform):
+        # equally spaced modes: n = j * M + m
+        M = int(np.ceil(np.sqrt(N)))
+        J = -(-N // M)
+        Ca = np.zeros(J * M)
+        Cb = np.zeros(J * M)
+        Ca[:N], Cb[:N] = An, Bn
+        Ca, Cb = Ca.reshape(J, M).T, Cb.reshape(J, M).T
+        # [cos B, sin B] @ coefficients gives U (first J columns) and V
+        coefficients = np.block([[Ca, Cb], [Cb, -Ca]])
+        kinner = kn[0] + np.arange(M) * dk
+        kouter = np.arange(J) * M * dk
+        P = max(1, BLOCK_BYTES // (8 * (2 * M + 4 * J)))
+        for start in range(0, points.size, P):
+            xp = points[start:start + P, np.newaxis]
+            inner = xp * kinner
+            outer = xp * kouter
+            UV = np.dot(np.hstack([np.cos(inner), np.sin(inner)]), coefficients)
+            result[start:start + P] = np.sum(np.cos(outer) * UV[:, :J] +
+                                             np.sin(outer) * UV[:, J:], axis=1)
+    else:
+        M = min(N, 1024)
+        P = max(1, BLOCK_BYTES // (16 * M))
+        for start in range(0, points.size, P):
+            xp = points[start:start + P, np.newaxis]
+            for m in range(0, N, M):
+                phase = xp * kn[m:m + M]
+                if np.any(An[m:m + M]):
+                    result[start:start + P] += np.dot(np.cos(phase), An[m:m + M])
+                if np.any(Bn[m:m + M]):
+                    result[start:start + P] += np.dot(np.sin(phase), Bn[m:m + M])
+    return result.reshape(x.shape)
+
+
+
+def image_sum(x, s, L, f0, f1, odd0, oddL, derivative=False):
+    r"""Return the solution of the heat equation on :math:`(0, L)` with
+    homogeneous boundary conditions and the linear initial profile
+    :math:`f(x) = f_0 + (f_1 - f_0)\, x / L`, by the method of images.
+
+    The initial profile is extended by reflections about :math:`x=0` and
+    :math:`x=L`, odd for a Dirichlet end and even for a Neumann end, to a
+    function on the real line, which is linear on :math:`(-L, 0)` and
+    :math:`(0, L)` and periodic, or antiperiodic, with period :math:`2L`.
+    Each linear piece :math:`p + q y` on :math:`(c, d)` is evolved with the
+    heat kernel in closed form,
+
+    .. math::
+      \frac{p + q x}{2} \Big[{\rm erfc}\frac{x - d}{s}
+      - {\rm erfc}\frac{x - c}{s}\Big]
+      + \frac{q s}{2\sqrt\pi}\Big[e^{-(x - c)^2/s^2}
+      - e^{-(x - d)^2/s^2}\Big]
+      \ ,
+
+    where :math:`s = \sqrt{4 \kappa t}`, and pieces beyond
+    :data:`IMAGE_REACH` diffusion lengths of the points are dropped.
+
+    Args:
+        x (array): The positions.
+        s (float): The diffusion length :math:`\sqrt{4 \kappa t}`.
+        L (float): The length of the rod.
+        f0, f1 (float): The initial profile at :math:`x=0` and :math:`x=L`.
+        odd0, oddL (bool): Whether the ends at :math:`x=0` and :math:`x=L`
+            are Dirichlet, rather than Neumann, ends.
+        derivative (bool): Return the derivative with respect to :math:`x`
+            instead of the solution.
+
+    Returns:
+        array: The solution, or its derivative, at the positions x.
+    """
+    x = np.asarray(x, dtype=float)
+    s = max(s, np.finfo(float).tiny)
+    q = (f1 - f0) / float(L)
+    sign0 = -1.0 if odd0 else 1.0
+    signL = -1.0 if oddL else 1.0
+    # (c, d, p, q) for the pieces on (-L, 0) and (0, L)
+    pieces = [(-L, 0.0, sign0 * f0, -sign0 * q), (0.0, L, f0, q)]
+
+    result = np.zeros(x.shape)
+    if not x.size:
+        return result
+    reach = IMAGE_REACH * s
+    m_lo = int(np.floor((x.min() - L - reach) / (2 * L)))
+    m_hi = int(np.ceil((x.max() + L + reach) / (2 * L)))
+    with np.errstate(over='ignore', invalid='ignore'):
+        for m in range(m_lo, m_hi + 1):
+            xm = x - 2 * L * m
+            weight = (sign0 * signL)**abs(m)
+            for c, d, p, q in pieces:
+                zc, zd = (xm - c) / s, (xm - d) / s
+                # the integral of the heat kernel over (c, d)
+                kernel = 0.5 * (erfc(zd) - erfc(zc))
+                gc, gd = np.exp(-zc * zc), np.exp(-zd * zd)
+                if derivative:
+                    term = ((p + q * c) * gc - (p + q * d) * gd) / (np.sqrt(np.pi) * s) + \
+                        q * kernel
+                else:
+                    term = (p + q * xm) * kernel + q * s * (gc - gd) / (2 * np.sqrt(np.pi))
+                result += weight * term
+    return result
+
+
+def images_cheaper(kappa, t, L, kn):
+    r"""Return whether :func:`image_sum` is cheaper than the Fourier series
+    with the wave numbers kn, at time t on a rod of length L, comparing the
+    cost of the pieces of the image series with the number of Fourier modes
+    that have not decayed."""
+    s = np.sqrt(4 * kappa * t)
+    images = 2 * (3 + 2 * int(IMAGE_REACH * s / (2 * L)))
+    return IMAGE_COST * images < np.count_nonzero(kappa * np.asarray(kn)**2 * t < DECAY_LIMIT)
+
+
+def tail_bound(C, rates, t):
+    r"""Return a bound of the modes beyond the last one of a series whose
+    terms are bounded by :math:`C e^{-\lambda_n t}`, for decay rates
+    :math:`\lambda_n` whose increments do not decrease with :math:`n`, from
+    the last two rates,
+
+    .. math::
+      \sum_{j \ge 1} C e^{-(\lambda_N + j \Delta\lambda) t}
+      = C e^{-\lambda_N t} \frac{e^{-\Delta\lambda t}}{1 - e^{-\Delta\lambda t}}
+      \ , \quad \Delta\lambda = \lambda_N - \lambda_{N-1}
+      \ .
+
+    The bound is infinite if the terms do not decay.
+    """
+    if C == 0:
+        return 0.0
+    if len(rates) < 2 or not (rates[-1] - rates[-2]) * t > 0:
+        return np.inf
+    step = (rates[-1] - rates[-2]) * t
+    return C * np.exp(-rates[-1] * t - step) / -np.expm1(-step)
+
+
+def tolerance(rtol, atol, scale):
+    r"""Return the absolute tolerance :math:`{\rm atol} + {\rm rtol}\, s` of
+    a truncated series with the magnitude scale s, where either tolerance
+    may be None, or None if both are."""
+    if rtol is None and atol is None:
+        return None
+    for name, value in (('rtol', rtol), ('atol', atol)):
+        if value is not None and not value > 0:
+            raise ValueError('{} must be greater than 0'.format(name))
+    return (atol or 0.0) + (rtol or 0.0) * abs(scale)
+
+
+def truncation(weights, tail, tol):
+    r"""Return the smallest number of leading modes, with the bounds weights
+    of their terms, such that the bounds of the other modes and the bound
+    tail of the modes beyond them add up to at most tol, together with that
+    sum. All the modes are kept if tol is None, or cannot be met, in which
+    case a warning is issued.
+    """
+    remainder = np.append(tail + np.cumsum(weights[::-1])[::-1], tail)
+    count = len(weights)
+    if tol is not None:
+        met = np.flatnonzero(remainder <= tol)
+        if met.size:
+            count = met[0]
+        else:
+            warn("The series does not meet the tolerance {:g} with {} modes, the "
+                 "neglected terms are bounded by {:g}".format(tol, count, tail))
+    return count, remainder[count]
+
+
+def robin_roots(a1, b1, a2, b2, count):
+    r"""Return the first count positive roots :math:`\mu_n` of the eigenvalue
+    condition of the general boundary conditions.
+
+    In terms of :math:`s = x/L`, the modes :math:`X(s)` satisfy
+    :math:`X'' = -\mu^2 X`, :math:`a_1 X(0) + b_1 X'(0) = 0` and
+    :math:`a_2 X(1) + b_2 X'(1) = 0`, where :math:`a_i = \alpha_i` and
+    :math:`b_i = \beta_i / L`. The modes are :math:`X(s) = \sin(\mu s +
+    \phi_1)`, and the roots are the solutions of
+
+    .. math::
+      F(\mu) = \mu + \phi_1(\mu) - \phi_2(\mu) = j \pi
+      \ , \quad
+      \phi_i(\mu) = {\rm atan2}(-b_i \mu, a_i)
+      \ .
+
+    Since :math:`|\phi_i'| < |a_i / b_i| / \mu^2`, :math:`F` is strictly
+    increasing for :math:`\mu > \mu_m = (\sum_i |a_i / b_i|)^{1/2}`, with
+    exactly one root for each :math:`j` and :math:`|F - \mu| < 2\pi`.
+    These roots are found together with Newton's method, safeguarded by the
+    brackets. Below :math:`\mu_m`, the roots are found by bisection on the
+    Pr\"ufer angle :math:`\theta(1; \mu)` of :math:`X = \rho \sin\theta`,
+    :math:`X' = \rho \cos\theta`. It starts at :math:`\theta_a \in [0, \pi)`
+    with :math:`\tan \theta_a = -b_1/a_1`, is known in closed form and is
+    strictly increasing in :math:`\mu`, and the roots are the solutions of
+    :math:`\theta(1; \mu) = \theta_b + j\pi` with
+    :math:`\theta_b \in (0, \pi]` and :math:`\tan \theta_b = -b_2/a_2`.
+    So no root is missed or duplicated. Roots with :math:`\mu^2 \le 0` are
+    not included.
+
+    Args:
+        a1, b1, a2, b2 (float): The boundary condition coefficients.
+        count (int): The number of roots.
+
+    Returns:
+        array: The roots, in increasing order.
+    """
+    eps = np.finfo(float).eps
+    mu_m = np.sqrt(sum(abs(a / b) for a, b in ((a1, b1), (a2, b2)) if a != 0 and b != 0))
+
+    # roots below mu_m, from the Pruefer angle
+    ta = np.arctan2(-b1, a1) % np.pi
+    tb = np.arctan2(-b2, a2) % np.pi
+    if tb == 0.0:
+        tb = np.pi
+    sa, ca = np.sin(ta), np.cos(ta)
+
+    def theta(mu):
+        phase = mu + ta + np.arctan((mu - 1) * sa * ca / (ca * ca + mu * sa * sa))
+        sp, cp = np.sin(phase), np.cos(phase)
+        return phase + np.arctan((1 - mu) * sp * cp / (mu * cp * cp + sp * sp))
+
+    # the limit mu -> 0, in which tan(theta) increases by one across the rod
+    if ta < np.pi / 2:
+        theta0 = np.arctan(np.tan(ta) + 1)
+    elif ta > np.pi / 2:
+        theta0 = np.pi + np.arctan(np.tan(ta) + 1)
+    else:
+        theta0 = ta
+    target = tb + np.pi * (np.floor((theta0 - tb) / np.pi) + 1)
+    if mu_m > 0:
+        target = np.arange(target, theta(mu_m), np.pi)[:count]
+    else:
+        target = np.zeros(0)
+    # theta - mu - ta lies between -pi and pi
+    lo = np.clip(target - ta - np.pi, 0.0, mu_m)
+    hi = np.clip(target - ta + np.pi, 0.0, mu_m)
+    while np.any(hi - lo > 4 * eps * hi):
+        mid = 0.5 * (lo + hi)
+        upper = theta(mid) > target
+        lo, hi = np.where(upper, lo, mid), np.where(upper, mid, hi)
+    low = 0.5 * (lo + hi)
+
+    # roots above mu_m, from F
+    def F(mu):
+        return mu + np.arctan2(-b1 * mu, a1) - np.arctan2(-b2 * mu, a2)
+
+    def dF(mu):
+        return 1 - a1 * b1 / (a1**2 + (b1 * mu)**2) + a2 * b2 / (a2**2 + (b2 * mu)**2)
+
+    # F is continuous for mu > 0, but not at mu = 0
+    j = np.arange(count - low.size) + np.floor(F(max(mu_m, np.finfo(float).tiny)) / np.pi) + 1
+    target = j * np.pi
+    lo = np.maximum(target - 2 * np.pi, mu_m)
+    hi = target + 2 * np.pi
+    mu = np.clip(2 * target - F(target), lo, hi)
+    active = np.arange(mu.size)
+    for _ in range(100):
+        if not active.size:
+            break
+        m = mu[active]
+        f = F(m) - target[active]
+        upper = f > 0
+        lo[active] = np.where(upper, lo[active], m)
+        hi[active] = np.where(upper, m, hi[active])
+        # Newton step, or bisection if it leaves the bracket
+        new = m - f / dF(m)
+        outside = ~((lo[active] <= new) & (new <= hi[active]))
+        new[outside] = 0.5 * (lo[active] + hi[active])[outside]
+        mu[active] = new
+        converged = (np.abs(new - m) <= 4 * eps * new) | (f == 0)
+        active = active[~converged]
+    return np.concatenate([low, mu])
+
+
+class MeshSolution(object):
+    r"""The solution of a heat conduction solver at fixed points, for
+    evaluation at many times.
+
+    It is returned by the ``bind`` method of the solvers, for example
+    :meth:`Rod1D.bind`. The parts of the solution that do not depend on time,
+    the steady solution and the spatial factors of the modes at the points,
+    are computed once, and the factors are extended as more modes are
+    needed, so that each time costs one product of the decayed coefficients
+    with the cached factors, and a vector of times one matrix product.
+
+    Args:
+        solver (ExactSolver): The solver.
+        points: The points, as for calling the solver.
+    """
+
+    def __init__(self, solver, points):
+        self.solver = solver
+        self.points = np.asarray(points)
+        self.state = solver._bind(self.points)
+
+    def temperature(self, times):
+        r"""Returns the temperature at the points at each of the times, as an
+        array with one row for each time."""
+        return self.solver._evaluate(self.state, np.atleast_1d(times))[0]
+
+    def __call__(self, t):
+        r"""Returns the solution at the points at time t, as an
+        :class:`exactpack.base.ExactSolution`."""
+        temperature, metadata = self.solver._evaluate(self.state, np.array([t]))
+        return self.solver._solution(self.points, temperature[0], metadata[0])
+
+
+def significant(*coefficients):
+    r"""Return the number of leading modes up to the last one with a
+    coefficient that is not subnormal or zero."""
+    tiny = np.finfo(float).tiny
+    nonzero = np.flatnonzero(np.any(np.abs(coefficients) >= tiny, axis=0))
+    return nonzero[-1] + 1 if nonzero.size else 0
+
 
 class Rod1D(ExactSolver):
 
@@ -330,6 +734,10 @@ class Rod1D(ExactSolver):
         'alpha2': "BC parameter for temperature at x=L",
         'beta2': "BC parameter for flux at x=L",
         'gamma2': "nonhomogeneous BC parameter for x=L",
+        'method': "'fourier' or 'images' series, or 'auto' to use the images \
+            at early times for BC1 to BC4",
+        'rtol': "Relative tolerance of the truncated Fourier series, or None",
+        'atol': "Absolute tolerance of the truncated Fourier series, or None",
         }
 
     kappa = 1.0
@@ -343,6 +751,9 @@ class Rod1D(ExactSolver):
     alpha2 = 1.0
     beta2 = 0.0
     gamma2 = 0.0
+    method = 'auto'
+    rtol = None
+    atol = None
 
     def modes_BC1(self):
         r"""Computes coefficients :math:`A_n` and :math:`B_n` and the modes :math:`k_n`
@@ -411,6 +822,21 @@ class Rod1D(ExactSolver):
             self.An[n] = self.An[n] - 8 * (Tb - Ta) / ((2 * n + 1) * np.pi)**2 + \
                 4 * (Tb - Ta) * (-1)**n / ((2 * n + 1) * np.pi)  # linear
 
+    def steady_BCgen(self):
+        r"""Returns the temperatures :math:`T_1` and :math:`T_2` at :math:`x=0`
+        and :math:`x=L` of the linear steady state solution for the general
+        boundary condition.
+        """
+        a1 = float(self.alpha1)
+        b1 = float(self.beta1) / self.L
+        a2 = float(self.alpha2)
+        b2 = float(self.beta2) / self.L
+        c1 = float(self.gamma1)
+        c2 = float(self.gamma2)
+        T1 = (b2 * c1 - b1 * c2 + a2 * c1) / (a1 * b2 - a2 * b1 + a1 * a2)
+        T2 = (b2 * c1 - b1 * c2 + a1 * c2) / (a1 * b2 - a2 * b1 + a1 * a2)
+        return T1, T2
+
     # otherwise
     def modes_BCgen(self):
         r"""Computes coefficients :math:`A_n` and :math:`B_n` and the modes :math:`k_n`
@@ -422,38 +848,30 @@ class Rod1D(ExactSolver):
         b1 = float(self.beta1) / self.L
         a2 = float(self.alpha2)
         b2 = float(self.beta2) / self.L
+        T1, T2 = self.steady_BCgen()
+        Ta = self.TL - T1
+        Tb = self.TR - T2
         if (a1 != 0.0):
-            func = lambda mu: np.tan(mu) - (a2 * b1 - a1 * b2) * mu / (a1 * a2 + b1 * b2 * mu**2)
-            for n in range(self.Nsum):
-                if n != 0:
-                    muinit = n * np.pi  # initial guess for wave number
-                    mu = fsolve(func, muinit)[0]
-                    self.kn[n] = mu / self.L  # wave number
-                    Nn = (-2 * a1 * b1 * mu + 2 * (b1**2 * mu**2 + a1**2) * mu +
-                            2 * a1 * b1 * mu * np.cos(2 * mu) + (b1**2 * mu**2 - a1**2) *
-                            np.sin(2 * mu)) / (4 * a1**2 * self.kn[n])  # normalization
-                    tmp = self.TL * (1 - np.cos(mu)) / self.kn[n] - (b1 * self.L / a1) * np.sin(mu)  # const
-                    tmp = tmp + ((self.TR - self.TL) / (self.L * a1 * self.kn[n]**2)) * \
-                        (b1 * mu - (a1*mu + b1 * mu) * np.cos(mu) + (a1 - b1**2 * mu**2) * np.sin(mu))
-                    self.Bn[n] = tmp / Nn
-                    self.An[n] = -(b1 * mu / a1) * self.Bn[n]
+            mu = robin_roots(a1, b1, a2, b2, self.Nsum - 1)
+            kn = mu / self.L  # wave numbers
+            Nn = (-2 * a1 * b1 * mu + 2 * (b1**2 * mu**2 + a1**2) * mu +
+                  2 * a1 * b1 * mu * np.cos(2 * mu) + (b1**2 * mu**2 - a1**2) *
+                  np.sin(2 * mu)) / (4 * a1**2 * kn)  # normalization
+            tmp = Ta * ((1 - np.cos(mu)) / kn - (b1 * self.L / a1) * np.sin(mu))  # const
+            tmp = tmp + ((Tb - Ta) / (self.L * a1 * kn**2)) * \
+                (b1 * mu - (a1*mu + b1 * mu) * np.cos(mu) + (a1 - b1 * mu**2) * np.sin(mu))
+            self.kn[1:] = kn
+            self.Bn[1:] = tmp / Nn
+            self.An[1:] = -(b1 * mu / a1) * self.Bn[1:]
         else:
-            a = a2 / b2  # b2 =/= 0, as a1 = 0 and b2 = 0 is case B4 above
-            func = lambda mu: np.tan(mu) - a / mu
-            for n in range(self.Nsum):
-                if (n == 0):
-                    muinit = 0.1
-                    muasym = 0
-                else:
-                    muinit = n * np.pi
-                    muasym = n * np.pi + a / ((1 + a) * n * np.pi)  # mu_n for n >> 1
-                mu = fsolve(func, muinit)[0]
-                self.kn[n] = mu / self.L  # wave number
-                Nn = (2 * mu + np.sin(2 * mu)) / (4 * self.kn[n])
-                tmp = self.TL * np.sin(mu) / self.kn[n]
-                tmp = tmp + ((self.TR - self.TL) / (self.L * self.kn[n]**2)) * \
-                    (-1 + np.cos(mu) + mu * np.sin(mu))
-                self.An[n] = tmp / Nn
+            # b2 =/= 0, as a1 = 0 and b2 = 0 is case B4 above
+            mu = robin_roots(a1, b1, a2, b2, self.Nsum)
+            self.kn[:] = mu / self.L  # wave numbers
+            Nn = (2 * mu + np.sin(2 * mu)) / (4 * self.kn)
+            tmp = Ta * np.sin(mu) / self.kn
+            tmp = tmp + ((Tb - Ta) / (self.L * self.kn**2)) * \
+                (-1 + np.cos(mu) + mu * np.sin(mu))
+            self.An[:] = tmp / Nn
 
     def __init__(self, **kwargs):
         super(Rod1D, self).__init__(**kwargs)
@@ -462,68 +880,158 @@ class Rod1D(ExactSolver):
         self.An = np.zeros(shape=self.Nsum)
         self.Bn = np.zeros(shape=self.Nsum)
 
-        if self.alpha1 != 0 and self.beta1 == 0 and self.alpha2 != 0 and self.beta2 == 0:
+        bc = self.boundary_type()
+        if bc == 1:
             self.modes_BC1()
-        elif self.alpha1 == 0 and self.beta1 != 0 and self.alpha2 == 0 and self.beta2 != 0:
+        elif bc == 2:
             self.modes_BC2()
-        elif self.alpha1 != 0 and self.beta1 == 0 and self.alpha2 == 0 and self.beta2 != 0:
+        elif bc == 3:
             self.modes_BC3()
-        elif self.alpha1 == 0 and self.beta1 != 0 and self.alpha2 != 0 and self.beta2 == 0:
+        elif bc == 4:
             self.modes_BC4()
         else:
             self.modes_BCgen()
 
-    def _run(self, x, t):
-        temperature = np.zeros(shape=x.shape)
-        tempnonhom = np.zeros(shape=x.shape)
-
+    def boundary_type(self):
+        r"""Returns which of the boundary conditions BC1 to BC4 applies, as
+        1 to 4, or 0 for the general boundary condition."""
         if self.alpha1 != 0 and self.beta1 == 0 and self.alpha2 != 0 and self.beta2 == 0:
-            # BC1
-            N = self.Nsum
+            return 1
+        elif self.alpha1 == 0 and self.beta1 != 0 and self.alpha2 == 0 and self.beta2 != 0:
+            return 2
+        elif self.alpha1 != 0 and self.beta1 == 0 and self.alpha2 == 0 and self.beta2 != 0:
+            return 3
+        elif self.alpha1 == 0 and self.beta1 != 0 and self.alpha2 != 0 and self.beta2 == 0:
+            return 4
+        return 0
+
+    def steady(self, x):
+        r"""Returns the time independent solution of the nonhomogeneous boundary
+        conditions at the positions x."""
+        x = np.asarray(x, dtype=float)
+        bc = self.boundary_type()
+        if bc == 1:
             T1 = self.gamma1 / self.alpha1
             T2 = self.gamma2 / self.alpha2
             tempnonhom = T1 + (T2 - T1) * x / self.L
-        elif self.alpha1 == 0 and self.beta1 != 0 and self.alpha2 == 0 and self.beta2 != 0:
-            # BC2
-            N = self.Nsum
+        elif bc == 2:
             F1 = self.gamma1 / self.beta1
             F2 = self.gamma2 / self.beta2
             if F1 != F2:
                 raise ValueError("The flux at either end of rod must be equal")
             tempnonhom = F1 * x
-        elif self.alpha1 != 0 and self.beta1 == 0 and self.alpha2 == 0 and self.beta2 != 0:
-            # BC3
-            N = self.Nsum
+        elif bc == 3:
             T1 = self.gamma1 / self.alpha1
             F2 = self.gamma2 / self.beta2
             tempnonhom = T1 + F2 * x  # = Ta + (Tb - Ta) * x / L
-        elif self.alpha1 == 0 and self.beta1 != 0 and self.alpha2 != 0 and self.beta2 == 0:
-            # BC4
-            N = self.Nsum
+        elif bc == 4:
             F1 = self.gamma1 / self.beta1
             T2 = self.gamma2 / self.alpha2
             tempnonhom = (T2 - self.L * F1) + F1 * x  # = Ta + (Tb - Ta) * x / L
         else:
-            N = self.Nsum
-            a1 = float(self.alpha1)
-            b1 = float(self.beta1) / self.L
-            a2 = float(self.alpha2)
-            b2 = float(self.beta2) / self.L
-            c1 = float(self.gamma1)
-            c2 = float(self.gamma2)
-            T1 = (b2 * c1 - b1 * c2 + self.L * a2 * c1) / (a1 * b2 - a2 * b1 + self.L * a1 * a2)
-            T2 = (b2 * c1 - b1 * c2 + self.L * a1 * c2) / (a1 * b2 - a2 * b1 + self.L * a1 * a2)
+            T1, T2 = self.steady_BCgen()
             tempnonhom = T1 + (T2 - T1) * x / self.L
+        return tempnonhom
+
+    def use_images(self, t):
+        r"""Returns whether the solution at time t is evaluated with the
+        method of images, see :func:`image_sum`."""
+        bc = self.boundary_type()
+        if self.method not in ('auto', 'images', 'fourier'):
+            raise ValueError("Unknown method: {}".format(self.method))
+        elif self.method == 'images':
+            if bc == 0:
+                raise ValueError("The image series needs one of the boundary conditions BC1 to BC4")
+            return True
+        elif self.method == 'fourier' or bc == 0:
+            return False
+        return images_cheaper(self.kappa, t, self.L, self.kn)
+
+    def image_solution(self, x, t):
+        r"""Returns the homogeneous part of the solution at the positions x and
+        time t by the method of images, and its metadata."""
+        bc = self.boundary_type()
+        ends = self.steady([0.0, self.L])
+        f0, f1 = self.TL - ends[0], self.TR - ends[1]
+        s = np.sqrt(4 * self.kappa * t)
+        temperature = image_sum(x, s, self.L, f0, f1, odd0=bc in (1, 3), oddL=bc in (1, 4))
+        # the neglected images are beyond IMAGE_REACH diffusion lengths
+        metadata = {'method': 'images',
+                    'terms': 2 * (3 + 2 * int(IMAGE_REACH * s / (2 * self.L))),
+                    'tail_bound': 2 * max(abs(f0), abs(f1)) * erfc(IMAGE_REACH)}
+        return temperature, metadata
+
+    def fourier_coefficients(self, t):
+        r"""Returns the coefficients :math:`A_n e^{-\kappa k_n^2 t}` and
+        :math:`B_n e^{-\kappa k_n^2 t}` of the leading Fourier modes that are
+        kept at time t, and the metadata of the truncation."""
+        rates = self.kappa * self.kn**2
+        decay = np.exp(-rates * t)
+        bounds = np.abs(self.An) + np.abs(self.Bn)
+        ends = self.steady([0.0, self.L])
+        scale = max(abs(self.TL), abs(self.TR), *np.abs(ends))
+        N, bound = truncation(bounds * decay, tail_bound(bounds.max(), rates, t),
+                              tolerance(self.rtol, self.atol, scale))
+        metadata = {'method': 'fourier', 'terms': N, 'tail_bound': bound}
+        return self.An[:N] * decay[:N], self.Bn[:N] * decay[:N], metadata
+
+    def bind(self, x):
+        r"""Returns the :class:`MeshSolution` of the solver at the positions
+        x, for evaluation at many times."""
+        return MeshSolution(self, x)
+
+    def _bind(self, x):
+        x = np.asarray(x, dtype=float)
+        return {'x': x, 'steady': self.steady(x),
+                'cos': np.ones((x.size, 0)), 'sin': np.zeros((x.size, 0))}
+
+    def _evaluate(self, state, times):
+        x = state['x']
+        temperature = np.empty((len(times), x.size))
+        metadata = [None] * len(times)
+        fourier = []
+        for i, t in enumerate(times):
+            if self.use_images(t):
+                temperature[i], metadata[i] = self.image_solution(x.ravel(), t)
+            else:
+                An, Bn, metadata[i] = self.fourier_coefficients(t)
+                fourier.append((i, An, Bn))
+
+        if fourier:
+            N = max(significant(An, Bn) for i, An, Bn in fourier)
+            if state['cos'].shape[1] < N:
+                phase = np.outer(x.ravel(), self.kn[:N])
+                state['cos'], state['sin'] = np.cos(phase), np.sin(phase)
+            A = np.zeros((len(fourier), N))
+            B = np.zeros((len(fourier), N))
+            for j, (i, An, Bn) in enumerate(fourier):
+                A[j, :min(N, len(An))] = An[:N]
+                B[j, :min(N, len(Bn))] = Bn[:N]
+            rows = [i for i, An, Bn in fourier]
+            temperature[rows] = np.dot(A, state['cos'][:, :N].T) + \
+                np.dot(B, state['sin'][:, :N].T)
+
+        temperature += state['steady'].ravel()
+        return temperature.reshape((len(times),) + x.shape), metadata
+
+    def _solution(self, x, temperature, metadata):
+        return ExactSolution([x, temperature],
+                             names=['position',
+                                    'temperature',
+                                    ],
+                             metadata=metadata)
 
-        # construct time dependent solution
-        for n in range(self.Nsum):
-            temperature += (self.An[n] * np.cos(self.kn[n] * x) + self.Bn[n] * np.sin(self.kn[n] * x)) * \
-              np.exp(-self.kappa * self.kn[n]**2 * t)
+    def _run(self, x, t):
+        tempnonhom = self.steady(x)
+
+        if self.use_images(t):
+            temperature, metadata = self.image_solution(x, t)
+        else:
+            # construct time dependent solution
+            An, Bn, metadata = self.fourier_coefficients(t)
+            temperature = mode_sum(x, self.kn[:len(An)], An, Bn)
 
         # add homogeneous and nonhomogeneous
         temperature = temperature + tempnonhom
 
-        return ExactSolution([x, temperature],
-                             names=['position',
-                                    'temperature',
-                                    ])
+        return self._solution(x, temperature, metadata)
@@ -0,0 +1,363 @@
+r"""Equation-of-state objects for the general EOS Riemann solver.
+
+The general EOS solver, :class:`exactpack.solvers.riemann.riemann.RiemannGenEOS`,
+only needs the specific internal energy as a function of pressure and density,
+:math:`e = e(p, \rho)`, and its two partial derivatives.
+From these the generalized sound speed follows from [Kamm2015]_ eqs. 5 & 6,
+
+.. math::
+   a^2 = \frac{p / \rho^2 - \left( \partial_{\rho} e \right)_p}
+              {\left( \partial_p e \right)_{\rho}} \, .
+
+An EOS object is any object providing the methods :meth:`EOS.sie`,
+:meth:`EOS.sound_speed`, :meth:`EOS.dsdr_cP`, :meth:`EOS.dsdp_cR` and
+:meth:`EOS.max_shock_density`.
+All methods accept scalars or :mod:`numpy` arrays of pressure and density.
+The left and right materials of a Riemann problem are described by independent
+EOS objects, so the physics is selected once, when the problem is set up,
+rather than inside the integration and bisection loops.
+
+Four implementations are provided: :class:`IdealGasEOS`, :class:`JWLEOS`,
+:class:`NASGEOS` and :class:`TabulatedEOS`, which interpolates
+:math:`e(p, \rho)` from a table on a regular, linear or logarithmic, grid.
+"""
+
+import numpy as np
+from numpy import sqrt, exp
+
+
+class EOS(object):
+    r"""Base class for equations of state used by the general EOS solver.
+
+    Child classes must implement :meth:`sie`, :meth:`dsdr_cP` and
+    :meth:`dsdp_cR`, and either set :attr:`gamma` or override
+    :meth:`max_shock_density`.
+    """
+
+    #: The adiabatic index, used to bound the density behind a shock.
+    gamma = None
+
+    def sie(self, p, r):
+        r"""The specific internal energy, :math:`e(p, \rho)`."""
+        raise NotImplementedError
+
+    def dsdr_cP(self, p, r):
+        r"""The derivative of SIE wrt density at constant pressure,
+        :math:`\left( \partial_{\rho} e \right)_p`.
+        """
+        raise NotImplementedError
+
+    def dsdp_cR(self, p, r):
+        r"""The derivative of SIE wrt pressure at constant density,
+        :math:`\left( \partial_p e \right)_{\rho}`.
+        """
+        raise NotImplementedError
+
+    def sound_speed(self, p, r):
+        """See [Kamm2015]_ eqs. 5 & 6. The generalized definition for sound
+        speed contains the derivatives of SIE wrt rho at constant p and wrt p
+        at constant rho.
+        """
+        return sqrt((p / r**2 - self.dsdr_cP(p, r)) / self.dsdp_cR(p, r))
+
+    def max_shock_density(self, r):
+        r"""An upper bound on the density behind a shock running into material
+        of density :math:`\rho`. The default is the strong-shock limit of an
+        ideal gas, :math:`\rho \, (\gamma + 1) / (\gamma - 1)`.
+        """
+        g = self.gamma
+        return (g + 1.) / (g - 1.) * r
+
+    def cache_key(self):
+        """A hashable key identifying the EOS, used to cache wave curves.
+        Two EOS objects of the same class with equal parameters have equal
+        keys. If the parameters are not hashable, e.g. tables, the key is the
+        object itself.
+        """
+        key = (type(self),) + tuple(sorted(vars(self).items()))
+        try:
+            hash(key)
+        except TypeError:
+            key = (type(self), self)
+        return key
+
+
+class IdealGasEOS(EOS):
+    r"""The ideal-gas, polytropic :math:`\gamma`-law EOS,
+    :math:`e = p / \left[ (\gamma - 1) \rho \right]`.
+
+    :param float gamma: The adiabatic index.
+    """
+
+    def __init__(self, gamma=1.4):
+        self.gamma = gamma
+
+    def sie(self, p, r):
+        return p / (self.gamma - 1.) / r
+
+    def dsdr_cP(self, p, r):
+        return - p / (self.gamma - 1.) / r**2
+
+    def dsdp_cR(self, p, r):
+        return 1. / r / (self.gamma - 1.)
+
+    def sound_speed(self, p, r):
+        return sqrt(self.gamma * p / r)
+
+
+class JWLEOS(EOS):
+    r"""The Jones-Wilkins-Lee EOS. The JWL EOS ammends the IGEOS pressure
+    with a term depending on density, gamma and empirically determined
+    constants,
+
+    .. math::
+       e = \frac{p - f(\rho)}{(\gamma - 1) \rho} \, , \qquad
+       f(\rho) = A \left( 1 - \frac{\Gamma_0 \rho}{R_1 \rho_0} \right)
+                 e^{-R_1 \rho_0 / \rho}
+               + B \left( 1 - \frac{\Gamma_0 \rho}{R_2 \rho_0} \right)
+                 e^{-R_2 \rho_0 / \rho} \, ,
+
+    with :math:`\Gamma_0 = \gamma - 1`.
+
+    :param float gamma: The adiabatic index.
+    :param float A: The JWL variable A.
+    :param float B: The JWL variable B.
+    :param float R1: The JWL variable R1.
+    :param float R2: The JWL variable R2.
+    :param float r0: The JWL reference density.
+    :param float e0: The JWL reference energy.
+    """
+
+    def __init__(self, gamma, A, B, R1, R2, r0, e0=0.):
+        self.gamma = gamma
+        self.A = A
+        self.B = B
+        self.R1 = R1
+        self.R2 = R2
+        self.r0 = r0
+        self.e0 = e0
+
+    def f(self, r):
+        """The density-dependent pressure term of the JWL EOS."""
+        G = self.gamma - 1.
+        R1r = self.R1 * self.r0 / r
+        R2r = self.R2 * self.r0 / r
+        return (self.A * (1. - G / R1r) * exp(- R1r) +
+                self.B * (1. - G / R2r) * exp(- R2r))
+
+    def dfdr(self, r):
+        """The derivative of :meth:`f` wrt density."""
+        G = self.gamma - 1.
+        r0 = self.r0
+        R1r = self.R1 * r0 / r
+        R2r = self.R2 * r0 / r
+        val  = self.A * (R1r / r - G / self.R1 / r0 - G / r) * exp(- R1r)
+        val += self.B * (R2r / r - G / self.R2 / r0 - G / r) * exp(- R2r)
+        return val
+
+    def sie(self, p, r):
+        return (p - self.f(r)) / (self.gamma - 1.) / r
+
+    def dsdr_cP(self, p, r):
+        G = self.gamma - 1.
+        return - self.dfdr(r) / G / r - (p - self.f(r)) / G / r**2
+
+    def dsdp_cR(self, p, r):
+        return 1. / r / (self.gamma - 1.)
+
+
+class NASGEOS(EOS):
+    r"""The Noble-Abel stiffened-gas EOS,
+
+    .. math::
+       e = \frac{\left( p + \gamma \, p_{\infty} \right) (1 - b \rho)}
+                {(\gamma - 1) \rho} \, ,
+
+    with the sound speed
+    :math:`a^2 = \gamma \left( p + p_{\infty} \right) / \left[ \rho (1 - b \rho) \right]`.
+    It contains the stiffened-gas EOS, :math:`b = 0`, the Noble-Abel or
+    covolume EOS, :math:`p_{\infty} = 0`, and the ideal-gas EOS as special
+    cases.
+    Its shock and rarefaction curves have closed forms, which are used by
+    :class:`exactpack.solvers.riemann.riemann.RiemannNASGEOS`.
+
+    :param float gamma: The adiabatic index.
+    :param float pinf: The stiffening pressure, :math:`p_{\infty}`.
+    :param float b: The covolume.
+    """
+
+    def __init__(self, gamma=1.4, pinf=0., b=0.):
+        self.gamma = gamma
+        self.pinf = pinf
+        self.b = b
+
+    def sie(self, p, r):
+        g = self.gamma
+        return (p + g * self.pinf) * (1. - self.b * r) / (g - 1.) / r
+
+    def dsdr_cP(self, p, r):
+        return - (p + self.gamma * self.pinf) / (self.gamma - 1.) / r**2
+
+    def dsdp_cR(self, p, r):
+        return (1. - self.b * r) / r / (self.gamma - 1.)
+
+    def sound_speed(self, p, r):
+        return sqrt(self.gamma * (p + self.pinf) / r / (1. - self.b * r))
+
+    def max_shock_density(self, r):
+        g, b = self.gamma, self.b
+        return 1. / (b + (g - 1.) / (g + 1.) * (1. / r - b))
+
+
+class TabulatedEOS(EOS):
+    r"""An EOS interpolated from a table of specific internal energy,
+    :math:`e(\rho_i, p_j)`, on a regular grid.
+
+    The density and pressure axes must each be uniformly spaced, either in
+    the variable itself or, with ``log=True``, in its logarithm, so that
+    locating a point in the table costs a single division rather than a
+    search.
+    Interpolation is either ``'bilinear'`` or ``'bicubic'``; the latter is
+    a bicubic Hermite interpolant with nodal derivatives from second-order
+    finite differences, so the derivatives entering the sound speed are
+    continuous.
+    Points outside the table are extrapolated from the nearest cell.
+
+    :param rho: The 1-D array of table densities.
+    :param p: The 1-D array of table pressures.
+    :param sie: The 2-D array of specific internal energies, with shape
+        ``(len(rho), len(p))``.
+    :param str method: Either ``'bilinear'`` or ``'bicubic'``.
+    :param bool log: Whether the axes are uniform in :math:`\log \rho` and
+        :math:`\log p`.
+    :param float gamma: If given, bounds the density behind a shock with the
+        ideal-gas strong-shock limit; otherwise the largest table density
+        is used.
+    """
+
+    def __init__(self, rho, p, sie, method='bicubic', log=False, gamma=None):
+        rho = np.asarray(rho, dtype=float)
+        p = np.asarray(p, dtype=float)
+        sie = np.asarray(sie, dtype=float)
+
+        if method not in ['bilinear', 'bicubic']:
+            raise ValueError("method must be 'bilinear' or 'bicubic'")
+        if sie.shape != (len(rho), len(p)):
+            raise ValueError('sie must have shape (len(rho), len(p))')
+        if len(rho) < 2 or len(p) < 2:
+            raise ValueError('the table needs at least two points per axis')
+
+        self.method = method
+        self.log = log
+        self.gamma = gamma
+        self.rho, self.p, self.table = rho, p, sie
+
+        X = np.log(rho) if log else rho
+        Y = np.log(p) if log else p
+        self._x0, self._dx = X[0], (X[-1] - X[0]) / (len(X) - 1)
+        self._y0, self._dy = Y[0], (Y[-1] - Y[0]) / (len(Y) - 1)
+        if (not np.allclose(np.diff(X), self._dx, rtol=1.e-8, atol=0.) or
+                not np.allclose(np.diff(Y), self._dy, rtol=1.e-8, atol=0.)):
+            raise ValueError('table axes must be uniformly spaced')
+
+        # Store the interpolant of each cell as a polynomial in the local
+        # coordinates, coef[i, j, k, l] * tx**k * ty**l, so that a lookup
+        # gathers a single block of coefficients.
+        f = sie
+        if method == 'bilinear':
+            coef = np.zeros((len(rho) - 1, len(p) - 1, 2, 2))
+            coef[..., 0, 0] = f[:-1, :-1]
+            coef[..., 1, 0] = f[1:, :-1] - f[:-1, :-1]
+            coef[..., 0, 1] = f[:-1, 1:] - f[:-1, :-1]
+            coef[..., 1, 1] = f[1:, 1:] - f[1:, :-1] - f[:-1, 1:] + f[:-1, :-1]
+        else:
+            fx = np.gradient(f, self._dx, axis=0, edge_order=2) * self._dx
+            fy = np.gradient(f, self._dy, axis=1, edge_order=2) * self._dy
+            fxy = np.gradient(fx, self._dy, axis=1, edge_order=2) * self._dy
+            # Hermite data of each cell, ordered as values then slopes at the
+            # left and right nodes along each axis.
+            F = np.empty((len(rho) - 1, len(p) - 1, 4, 4))
+            for a, b, g in [(0, 0, f), (2, 0, fx), (0, 2, fy), (2, 2, fxy)]:
+                F[..., a, b] = g[:-1, :-1]
+                F[..., a + 1, b] = g[1:, :-1]
+                F[..., a, b + 1] = g[:-1, 1:]
+                F[..., a + 1, b + 1] = g[1:, 1:]
+            coef = np.einsum('ak,ijab,bl->ijkl', _HERMITE, F, _HERMITE)
+        self._coef = coef
+
+    def _locate(self, v, v0, dv, n):
+        s = (v - v0) / dv
+        i = np.clip(np.floor(s).astype(int), 0, n - 2)
+        return i, s - i
+
+    def _interp(self, p, r):
+        """Return the interpolated SIE and its derivatives wrt the two table
+        coordinates.
+        """
+        r, p = np.broadcast_arrays(np.asarray(r, dtype=float),
+                                   np.asarray(p, dtype=float))
+        X = np.log(r) if self.log else r
+        Y = np.log(p) if self.log else p
+        i, tx = self._locate(X, self._x0, self._dx, len(self.rho))
+        j, ty = self._locate(Y, self._y0, self._dy, len(self.p))
+        c = self._coef[i, j]
+        n = c.shape[-1]
+
+        # Horner's rule in ty, then in tx
+        q = c[..., n - 1]
+        dq = (n - 1) * c[..., n - 1]
+        for l in range(n - 2, -1, -1):
+            q = q * ty[..., None] + c[..., l]
+            if l > 0:
+                dq = dq * ty[..., None] + l * c[..., l]
+        val, dfdX, dfdY = q[..., n - 1], (n - 1) * q[..., n - 1], dq[..., n - 1]
+        for k in range(n - 2, -1, -1):
+            val = val * tx + q[..., k]
+            dfdY = dfdY * tx + dq[..., k]
+            if k > 0:
+                dfdX = dfdX * tx + k * q[..., k]
+        return val, dfdX / self._dx, dfdY / self._dy
+
+    def _derivs(self, p, r):
+        val, dfdX, dfdY = self._interp(p, r)
+        if self.log:
+            dfdX, dfdY = dfdX / r, dfdY / p
+        return val, dfdX, dfdY
+
+    def sie(self, p, r):
+        return self._interp(p, r)[0][()]
+
+    def dsdr_cP(self, p, r):
+        return self._derivs(p, r)[1][()]
+
+    def dsdp_cR(self, p, r):
+        return self._derivs(p, r)[2][()]
+
+    def sound_speed(self, p, r):
+        _, dsdr, dsdp = self._derivs(p, r)
+        return sqrt((p / r**2 - dsdr) / dsdp)[()]
+
+    def max_shock_density(self, r):
+        if self.gamma is not None:
+            return super(TabulatedEOS, self).max_shock_density(r)
+        return self.rho[-1] + 0. * r
+
+
+# The cubic Hermite basis on [0, 1] in the monomial basis; row a holds the
+# coefficients of 1, t, t**2, t**3 for the value weights at the left and right
+# nodes, followed by the slope weights at the left and right nodes.
+_HERMITE = np.array([[1., 0., -3., 2.],
+                     [0., 0., 3., -2.],
+                     [0., 1., -2., 1.],
+                     [0., 0., -1., 1.]])
+
+
+def eos_from_problem(problem, gamma, inst):
+    """Build the EOS object matching the legacy ``problem`` string: a
+    :class:`JWLEOS` with the JWL variables of ``inst`` if ``problem``
+    contains 'JWL', and an :class:`IdealGasEOS` otherwise.
+    """
+    if 'JWL' in problem:
+        return JWLEOS(gamma, inst.A, inst.B, inst.R1, inst.R2, inst.r0,
+                      inst.e0)
+    return IdealGasEOS(gamma)
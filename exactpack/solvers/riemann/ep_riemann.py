@@ -4,7 +4,8 @@ r""" ExactPack wrapper for the Riemann solvers.
 from exactpack.base import ExactSolver, ExactSolution, print_when_verbose
 
 from exactpack.solvers.riemann import riemann
-from numpy import interp, mgrid, array
+from exactpack.solvers.riemann.eos import IdealGasEOS, NASGEOS
+from numpy import interp, linspace, asarray, where, inf, isnan, newaxis, errstate
 import matplotlib.pyplot as plt
 
 class IGEOS_Solver(ExactSolver):
@@ -38,7 +39,9 @@ class IGEOS_Solver(ExactSolver):
         'num_x_pts': "The number of points in the spatial array.",
         'num_int_pts': "The number of integration points across a rarefaction state.",
         'int_tol': "The integration tolerance for integrating across a rarefaction.",
-        'problem': "Flag/switch for defining mathematical function calls when integrating across rarefaction states. Default is 'igeos'; 'JWL' is currently an option."
+        'problem': "Flag/switch for defining mathematical function calls when integrating across rarefaction states. Default is 'igeos'; 'JWL' is currently an option.",
+        'eos_l': "The left-state IdealGasEOS object, see :mod:`exactpack.solvers.riemann.eos`, whose adiabatic index replaces `gl`. Default is None, which builds it from `problem`.",
+        'eos_r': "The right-state IdealGasEOS object, see :mod:`exactpack.solvers.riemann.eos`, whose adiabatic index replaces `gr`. Default is None, which builds it from `problem`."
     }
 
     xmin = 0.
@@ -63,6 +66,8 @@ class IGEOS_Solver(ExactSolver):
     num_int_pts = 10001
     num_x_pts = 10001
     int_tol = 1.e-12
+    eos_l = None
+    eos_r = None
     # I do not allow L to be set in the code, but this could easily be changed
 # Should we still be carrying around L and geometry?
     L = 1 # cm
@@ -72,6 +77,14 @@ class IGEOS_Solver(ExactSolver):
         """Set default values if necessary and check for valid inputs.
         """
         super().__init__(**kwargs)
+        for side in 'lr':
+            eos = getattr(self, 'eos_' + side)
+            if eos is None:
+                continue
+            if not isinstance(eos, IdealGasEOS):
+                raise TypeError('the ideal-gas Riemann solver requires IdealGasEOS objects, '
+                                'use GenEOS_Solver for other EOSs')
+            setattr(self, 'g' + side, eos.gamma)
 
     @print_when_verbose
     def _run(self, x, t):
@@ -98,7 +111,108 @@ class IGEOS_Solver(ExactSolver):
                problem = self.problem,
                num_int_pts = self.num_int_pts,
                num_x_pts = self.num_x_pts,
-               int_tol = self.int_tol)
+               int_tol = self.int_tol,
+               eos_l = self.eos_l,
+               eos_r = self.eos_r)
+        prob.driver(x)
+
+        self.x = prob.x
+        self.p = prob.p
+        self.r = prob.r
+        self.u = prob.u
+        self.e = prob.e
+        self.Vregs = prob.Vregs
+        self.soln_type = prob.soln_type
+
+        pressure = interp(x, self.x, self.p)
+        density = interp(x, self.x, self.r)
+        velocity = interp(x, self.x, self.u)
+        sie = interp(x, self.x, self.e)
+
+        return ExactSolution([x, pressure, density, velocity, sie],
+                             names=['position',
+                                    'pressure',
+                                    'density',
+                                    'velocity',
+                                    'specific_internal_energy'])
+
+
+class NASGEOS_Solver(ExactSolver):
+    r"""Computes the analytic solution to the Riemann problem for the Noble-Abel
+        stiffened-gas EOS, :math:`e = (p + \gamma p_{\infty})(1 - b \rho) / [(\gamma - 1) \rho]`,
+        with closed-form wave curves. This covers the stiffened-gas
+        (:math:`b = 0`) and Noble-Abel, or covolume, (:math:`p_{\infty} = 0`)
+        EOSs, and is much faster than the general EOS solver for them. The
+        problem default values are for the Sod shocktube, which is also Riemann
+        problem #1.
+
+        Default values are :math:`xmin=0, xd0=0.5, xmax=1, t=0.25, \rho_l=1, u_l=0, p_l=1, \gamma_l=1.4, \rho_r=0.125, u_r=0, p_r=0.1, \gamma_r=1.4, p_{\infty l}=p_{\infty r}=0, b_l=b_r=0`.
+    """
+
+    parameters = {
+        'xmin': "At t=0, the left-most x-position.",
+        'xd0': "At t=0, the location of the membrane separating the left and right states.",
+        'xmax': "At t=0, the right-most x-position.",
+        't': "The end time.",
+        'pl': "The left-state initial pressure.",
+        'rl': "The left-state initial density.",
+        'ul': "The left-state initial velocity.",
+        'gl': "The left-state adiabatic index.",
+        'pinfl': "The left-state stiffening pressure.",
+        'bl': "The left-state covolume.",
+        'pr': "The right-state initial pressure.",
+        'rr': "The right-state initial density.",
+        'ur': "The right-state initial velocity.",
+        'gr': "The right-state adiabatic index.",
+        'pinfr': "The right-state stiffening pressure.",
+        'br': "The right-state covolume.",
+        'num_x_pts': "The number of points in the spatial array."
+    }
+
+    xmin = 0.
+    xd0  = 0.5
+    xmax = 1.
+    t    = 0.25
+    rl   = 1.
+    ul   = 0.
+    pl   = 1.
+    gl   = 1.4
+    pinfl = 0.
+    bl   = 0.
+    rr   = 0.125
+    ur   = 0.
+    pr   = 0.1
+    gr   = 1.4
+    pinfr = 0.
+    br   = 0.
+    num_x_pts = 10001
+    L = 1 # cm
+    geometry = 1 # convergence study requires us to set geometry
+
+    def __init__(self, **kwargs):
+        """Set default values if necessary and check for valid inputs.
+        """
+        super().__init__(**kwargs)
+
+    @print_when_verbose
+    def _run(self, x, t):
+        self.t = t
+        prob = riemann.RiemannNASGEOS(
+               xmin = self.xmin,
+               xd0 = self.xd0,
+               xmax = self.xmax,
+               t = t,
+               rl = self.rl,
+               ul = self.ul,
+               pl = self.pl,
+               gl = self.gl,
+               rr = self.rr,
+               ur = self.ur,
+               pr = self.pr,
+               gr = self.gr,
+               num_x_pts = self.num_x_pts,
+               eos_l = NASGEOS(self.gl, self.pinfl, self.bl),
+               eos_r = NASGEOS(self.gr, self.pinfr, self.br))
         prob.driver(x)
 
         self.x = prob.x
@@ -153,7 +267,9 @@ class GenEOS_Solver(ExactSolver):
         'num_x_pts': "The number of points in the spatial array.",
         'num_int_pts': "The number of integration points across a rarefaction state.",
         'int_tol': "The integration tolerance for integrating across a rarefaction.",
-        'problem': "Flag/switch for defining mathematical function calls when integrating across rarefaction states. Default is 'igeos'; 'JWL' is currently an option."
+        'problem': "Flag/switch for defining mathematical function calls when integrating across rarefaction states. Default is 'igeos'; 'JWL' is currently an option.",
+        'eos_l': "The left-state EOS object, see :mod:`exactpack.solvers.riemann.eos`. Default is None, which builds it from `problem`.",
+        'eos_r': "The right-state EOS object, see :mod:`exactpack.solvers.riemann.eos`. Default is None, which builds it from `problem`."
     }
 
     xmin = 0.
@@ -178,6 +294,8 @@ class GenEOS_Solver(ExactSolver):
     num_int_pts = 10001
     num_x_pts = 10001
     int_tol = 1.e-12
+    eos_l = None
+    eos_r = None
     # I do not allow L to be set in the code, but this could easily be changed
 # Should we still be carrying around L and geometry?
     L = 1 # cm
@@ -214,7 +332,9 @@ class GenEOS_Solver(ExactSolver):
                problem = self.problem,
                num_int_pts = self.num_int_pts,
                num_x_pts = self.num_x_pts,
-               int_tol = self.int_tol)
+               int_tol = self.int_tol,
+               eos_l = self.eos_l,
+               eos_r = self.eos_r)
         prob.driver()
 
         self.x = prob.x
@@ -238,6 +358,71 @@ class GenEOS_Solver(ExactSolver):
                                     'specific_internal_energy'])
 
 
+def wave_trajectories(solver):
+    """Return the waves of a solved Riemann problem, ordered from left to right.
+
+    Each wave is a tuple ``(kind, speed)``, where ``kind`` is one of
+    ``'rarefaction'``, ``'contact'`` or ``'shock'``. A rarefaction contributes
+    two entries, one each for its head and tail. All trajectories are straight
+    lines through ``(solver.xd0, 0)``, so the position of a wave at time ``t``
+    is ``solver.xd0 + speed * t``.
+
+    Args:
+        solver (ExactSolver): An ExactPack Riemann Solver object that has been run
+    """
+    morphology = solver.soln_type.split('-')[-1]
+    Vregs = solver.Vregs
+    waves = []
+    ii = 0
+    for kind in morphology:
+        if kind == 'R':
+            waves += [('rarefaction', Vregs[ii]), ('rarefaction', Vregs[ii + 1])]
+            ii += 2
+        elif kind == 'S':
+            waves.append(('shock', Vregs[ii]))
+            ii += 1
+        elif kind == 'C':
+            waves.append(('contact', Vregs[ii]))
+            ii += 1
+    return waves
+
+
+def xt_table(solver, soln, xs, t, N=21, var_str='pressure', Nt=None):
+    """Tabulate a field of the solution on a space-time grid.
+
+    The Riemann solution is self-similar in :math:`\\xi = (x - x_{d0}) / t`,
+    so the solution at the final time ``t`` determines the solution at all
+    earlier times. The whole table is computed with a single interpolation in
+    :math:`\\xi`, without a loop over times. At :math:`t = 0` the initial
+    left and right states are returned.
+
+    Args:
+        solver (ExactSolver): An ExactPack Riemann Solver object
+        soln (ExactSolution): The corresponding solution object
+        xs (list, array): A list or 1-D array of the positions at which ``soln`` was computed
+        t (float): The final time
+        N (int): Number of positions in the table
+        var_str (str): The name of the value to tabulate (e.g. 'pressure')
+        Nt (int): Number of times in the table, defaults to ``N``
+
+    Returns:
+        tuple: ``(x, t, Z, waves)``, where ``x`` and ``t`` are the 1-D arrays
+        of table positions and times, ``Z[i, j]`` is the field at ``x[i]`` and
+        ``t[j]`` and ``waves`` is the list returned by :func:`wave_trajectories`.
+    """
+    Nt = N if Nt is None else Nt
+    xs = asarray(xs)
+    xd0 = solver.xd0
+    x = linspace(xs[0], xs[-1], N)
+    ts = linspace(0., t, Nt)
+    with errstate(divide='ignore', invalid='ignore'):
+        scale = where(ts > 0., t / ts, inf)
+        xi = (x - xd0)[:, newaxis] * scale
+    xi[isnan(xi)] = 0.
+    Z = interp(xd0 + xi, xs, soln[var_str])
+    return x, ts, Z, wave_trajectories(solver)
+
+
 def streakplot(solver, soln, xs, t, N=21, var_str='pressure'):
     """Create a streakplot of the solution as a function of time.
 
@@ -249,32 +434,13 @@ def streakplot(solver, soln, xs, t, N=21, var_str='pressure'):
         N (int): Number of ponts to include in the plot
         var_str (str): The name of the value to plot (e.g. 'pressure')
     """
-    X, T = mgrid[xs[0]:xs[-1]:complex(0,N), 0:t:complex(0,N)]
-    T[:,0] += T[0,:][1] / T[0,:][-1] * 1.e-4
-    Z = [interp((X[:,0] - solver.xd0), (xs - solver.xd0) * t / T[0][-1],
-         soln[var_str]) for t in T[0]]
-    Z = array(Z).T
+    x, ts, Z, waves = xt_table(solver, soln, xs, t, N=N, var_str=var_str)
     fig, ax = plt.subplots(1,1)
-    c = ax.pcolor(X, T, Z, shading='auto', vmin=Z.min(), vmax=Z.max())
-    morphology = solver.soln_type.split('-')[-1]
+    c = ax.pcolor(x, ts, Z.T, shading='auto', vmin=Z.min(), vmax=Z.max())
+    styles = {'rarefaction': '--k', 'contact': ':k', 'shock': 'k'}
     xd0 = solver.xd0
-    Vregs = solver.Vregs
-    ii = 0
-    if (morphology[0] == 'R'):
-        plt.plot([xd0, Vregs[ii]*t + xd0], [0., t], '--k')
-        ii += 1
-        plt.plot([xd0, Vregs[ii]*t + xd0], [0., t], '--k')
-    elif (morphology[0] == 'S'):
-        plt.plot([xd0, Vregs[ii]*t + xd0], [0., t], 'k')
-    ii += 1
-    plt.plot([xd0, Vregs[ii]*t + xd0], [0., t], ':k')
-    ii += 1
-    if (morphology[2] == 'R'):
-        plt.plot([xd0, Vregs[ii]*t + xd0], [0., t], '--k')
-        ii += 1
-        plt.plot([xd0, Vregs[ii]*t + xd0], [0., t], '--k')
-    elif (morphology[2] == 'S'):
-        plt.plot([xd0, Vregs[ii]*t + xd0], [0., t], 'k')
+    for kind, speed in waves:
+        plt.plot([xd0, speed*t + xd0], [0., t], styles[kind])
     plt.xlim((xs[0], xs[-1]))
     plt.ylim((0., t))
     plt.xlabel('position')
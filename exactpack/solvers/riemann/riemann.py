@@ -1,12 +1,18 @@
 r"""A pure Python, analytic Riemann solver based on the 2013 paper by LoraClavijo, et. al. [LoraClavijo2013]_, and reports by Jim Kamm [Kamm2014, Kamm2015]_.
 """
 
+from collections import OrderedDict
+from threading import Lock
+
 from scipy.optimize import bisect
-from numpy import linspace, array, sqrt, interp, append, where, argmin
+from numpy import (linspace, array, sqrt, interp, append, where, argmin, arange,
+                   concatenate)
 
 from exactpack.base import ExactSolver, ExactSolution
 
 from exactpack.solvers.riemann.utils import *
+from exactpack.solvers.riemann.eos import (EOS, IdealGasEOS, JWLEOS, NASGEOS,
+                                           TabulatedEOS, eos_from_problem)
 
 # TOC:
 # SetupRiemannProblem(object):
@@ -14,8 +20,14 @@ from exactpack.solvers.riemann.utils import *
 #
 # RiemannIGEOS(SetupRiemannProblem)
 #   def driver(self)
+#   def diagnostics(self)
+#
+# RiemannNASGEOS(SetupRiemannProblem)
+#   def driver(self)
 #
 # RiemannGenEOS(SetupRiemannProblem)
+#   def clear_wave_curve_cache(cls)
+#   def wave_curves(self, p, r, u, eos, side)
 #   def driver(self)
 
 class SetupRiemannProblem(object):
@@ -23,11 +35,17 @@ class SetupRiemannProblem(object):
         is for either an ideal-gas EOS or a generalized EOS like JWL. Also
         initializes the number of integration points across a potential
         rarefaction region, and the number of array points across the 1D region.
+
+        The left and right materials may be given as independent EOS objects,
+        `eos_l` and `eos_r` (see :mod:`exactpack.solvers.riemann.eos`). If
+        they are not given, they are built from `problem`, the adiabatic
+        indices and the JWL variables.
      """
     def __init__(self,xmin=0., xd0=0.5, xmax=1., t=0.25,
                  rl=1., ul=0., pl=1., gl=1.4, rr=0.125, ur=0., pr=0.1, gr=1.4,
                  A=0., B=0., R1=0., R2=0., r0=0., e0=0., problem='igeos',
-                 num_int_pts=10001, num_x_pts = 10001, int_tol=1.e-12):
+                 num_int_pts=10001, num_x_pts = 10001, int_tol=1.e-12,
+                 eos_l=None, eos_r=None):
 
 #: At t=0, the left-most x-position.
         self.xmin = xmin
@@ -73,15 +91,25 @@ class SetupRiemannProblem(object):
         self.int_tol = int_tol
 #: Flag/switch for defining mathematical function calls when integrating across rarefaction states. Default is 'igeos'; 'JWL' is currently an option.
         self.problem = problem
-
-        pl, rl, gl = self.pl, self.rl, self.gl
-        pr, rr, gr = self.pr, self.rr, self.gr
-        self.al = sound_speed(pl, rl, gl, self)
-        self.ar = sound_speed(pr, rr, gr, self)
-        self.el, self.er = sie(pl, rl, gl, self), sie(pr, rr, gr, self)
+#: The left-state EOS object.
+        self.eos_l = eos_from_problem(problem, gl, self) if eos_l is None else eos_l
+#: The right-state EOS object.
+        self.eos_r = eos_from_problem(problem, gr, self) if eos_r is None else eos_r
+
+        pl, rl = self.pl, self.rl
+        pr, rr = self.pr, self.rr
+        self.al = self.eos_l.sound_speed(pl, rl)
+        self.ar = self.eos_r.sound_speed(pr, rr)
+        self.el, self.er = self.eos_l.sie(pl, rl), self.eos_r.sie(pr, rr)
         self.pmax = 10. * max(pl, pr)
 
 
+def _diagnostic(name):
+    """Lazily computed attribute for one of the :meth:`RiemannIGEOS.diagnostics` arrays.
+    """
+    return property(lambda self: self.diagnostics()[name])
+
+
 class RiemannIGEOS(SetupRiemannProblem):
     r"""Computes the analytic solution to the Riemann problem for an ideal-gas
         EOS. See [LoraClavijo2013]_ for the solution description. The problem
@@ -89,7 +117,23 @@ class RiemannIGEOS(SetupRiemannProblem):
         #1.
 
         Default values are :math:`xmin=0, xd0=0.5, xmax=1, t=0.25, \rho_l=1, u_l=0, p_l=1, \gamma_l=1.4, \rho_r=0.125, u_r=0, p_r=0.1, \gamma_r=1.4`.
+
+        The star state is found in closed form from the adiabatic indices, so
+        `eos_l` and `eos_r`, if given, must be
+        :class:`exactpack.solvers.riemann.eos.IdealGasEOS` objects, and their
+        adiabatic indices replace `gl` and `gr`.
     """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for side in 'lr':
+            eos = kwargs.get('eos_' + side)
+            if eos is None:
+                continue
+            if not isinstance(eos, IdealGasEOS):
+                raise TypeError('the ideal-gas Riemann solver requires IdealGasEOS objects, '
+                                'use RiemannGenEOS for other EOSs')
+            setattr(self, 'g' + side, eos.gamma)
+
     def driver(self, x_user=0):
       pl, rl, ul, gl = self.pl, self.rl, self.ul, self.gl
       pr, rr, ur, gr = self.pr, self.rr, self.ur, self.gr
@@ -97,8 +141,9 @@ class RiemannIGEOS(SetupRiemannProblem):
       num_x_pts = self.num_x_pts
       pmax = self.pmax
 
-      al, ar = sound_speed(pl, rl, gl, self), sound_speed(pr, rr, gr, self)
-      el, er = sie(pl, rl, gl, self), sie(pr, rr, gr, self)
+      eos_l, eos_r = self.eos_l, self.eos_r
+      al, ar = eos_l.sound_speed(pl, rl), eos_r.sound_speed(pr, rr)
+      el, er = eos_l.sie(pl, rl), eos_r.sie(pr, rr)
 
       # this if/elif set is based on Fig3 in Gottlieb & Groth
       # determining the solution type considerably aides solution construction
@@ -140,10 +185,10 @@ class RiemannIGEOS(SetupRiemannProblem):
       ux = ul + z * eval(soln_type.split('-')[0] + "(px,pl,rl,0,gl,self)")
       rx1 = eval('rho_star_'+soln_type.split('-')[0]+'(px,pl,rl,gl,self)')
       rx2 = eval('rho_star_'+soln_type.split('-')[2]+'(px,pr,rr,gr,self)')
-      ax1 = sound_speed(px, rx1, gl, self)
-      ax2 = sound_speed(px, rx2, gr, self)
-      ex1 = sie(px, rx1,  gl, self)
-      ex2 = sie(px, rx2,  gr, self)
+      ax1 = eos_l.sound_speed(px, rx1)
+      ax2 = eos_r.sound_speed(px, rx2)
+      ex1 = eos_l.sie(px, rx1)
+      ex2 = eos_r.sie(px, rx2)
 
       # Store velocities that bound regions in time in Vregs. Vh & Vt are the
       # head and tail rarefaction velocities. These values are time-independent.
@@ -176,9 +221,9 @@ class RiemannIGEOS(SetupRiemannProblem):
         ee = where(xl <= xe, e, ee)
         return pe, re, ue, ee
     
-      def rarefaction_region(p, r, u, g, x, xd0, Xr, t, self):
+      def rarefaction_region(p, r, u, g, x, xd0, Xr, t, self, eos):
         rho, prs, vel = rho_p_u_rarefaction(p, r, u, g, x, xd0, t, self)
-        e = sie(prs, rho, g, self)
+        e = eos.sie(prs, rho)
         return reg_state(Xr, x, [prs, rho, vel, e], vals)
 
       # Determine the time-dependent spatial profiles for the physical fields.
@@ -188,16 +233,16 @@ class RiemannIGEOS(SetupRiemannProblem):
       elif (soln_type == 'shock-contact-rarefaction-SCR'):
         vals = reg_state(Xregs[0], x, [px, rx1, ux, ex1], vals)
         vals = reg_state(Xregs[1], x, [px, rx2, ux, ex2], vals)
-        vals = rarefaction_region(pr, rr, ur, gr, x, xd0, Xregs[2], t, self)
+        vals = rarefaction_region(pr, rr, ur, gr, x, xd0, Xregs[2], t, self, eos_r)
       elif (soln_type == 'rarefaction-contact-shock-RCS'):
-        vals = rarefaction_region(pl, rl, ul, gl, x, xd0, Xregs[0], t, self)
+        vals = rarefaction_region(pl, rl, ul, gl, x, xd0, Xregs[0], t, self, eos_l)
         vals = reg_state(Xregs[1], x, [px, rx1, ux, ex1], vals)
         vals = reg_state(Xregs[2], x, [px, rx2, ux, ex2], vals)
       elif (soln_type == 'rarefaction-contact-rarefaction-RCR'):
-        vals = rarefaction_region(pl, rl, ul, gl, x, xd0, Xregs[0], t, self)
+        vals = rarefaction_region(pl, rl, ul, gl, x, xd0, Xregs[0], t, self, eos_l)
         vals = reg_state(Xregs[1], x, [px, rx1, ux, ex1], vals)
         vals = reg_state(Xregs[2], x, [px, rx2, ux, ex2], vals)
-        vals = rarefaction_region(pr, rr, ur, gr, x, xd0, Xregs[3], t, self)
+        vals = rarefaction_region(pr, rr, ur, gr, x, xd0, Xregs[3], t, self, eos_r)
       p, r, u, e = reg_state(Xregs[-1], x, [pr, rr, ur, er], vals)
 
       # Storing solution variables
@@ -209,16 +254,173 @@ class RiemannIGEOS(SetupRiemannProblem):
       self.xmin, self.xmax = xmin, xmax
       self.soln_type = soln_type
 
-      # Storing variables for plotting Fig. 3 in Gottlieb & Groth's 1988 JCP.
-      # This is done in the example riemann solutions.
-      self.plow = linspace(0., pl, num_x_pts + 1)[1:]
-      self.phigh = linspace(pl, pmax, num_x_pts)
-      self.ps = array(append(self.plow, self.phigh))
-      self.uSCNphigh = u_SCN(self.phigh, self)
-      self.uNCRphigh = u_NCR(self.phigh, self)
-      self.uNCSplow = u_NCS(self.plow, self)
-      self.uRCNplow = u_RCN(self.plow, self)
-      self.uaps, self.uRCVRps = u_a(self.ps, self), u_RCVR(self.ps, self)
+      self._diagnostics = None
+
+    def diagnostics(self):
+      """Return the curves of Fig. 3 in Gottlieb & Groth's 1988 JCP.
+
+      The velocity curves, which are plotted in the example riemann solutions,
+      are only needed for diagnostics, so they are computed on the first
+      call after :meth:`driver` and then cached. They are also available as
+      the attributes `plow`, `phigh`, `ps`, `uSCNphigh`, `uNCRphigh`,
+      `uNCSplow`, `uRCNplow`, `uaps` and `uRCVRps`.
+
+      Returns:
+        dict: The pressure arrays and the velocity curves evaluated on them.
+      """
+      if self._diagnostics is None:
+        plow = linspace(0., self.pl, self.num_x_pts + 1)[1:]
+        phigh = linspace(self.pl, self.pmax, self.num_x_pts)
+        ps = array(append(plow, phigh))
+        self._diagnostics = {'plow': plow, 'phigh': phigh, 'ps': ps,
+                             'uSCNphigh': u_SCN(phigh, self),
+                             'uNCRphigh': u_NCR(phigh, self),
+                             'uNCSplow': u_NCS(plow, self),
+                             'uRCNplow': u_RCN(plow, self),
+                             'uaps': u_a(ps, self),
+                             'uRCVRps': u_RCVR(ps, self)}
+      return self._diagnostics
+
+    plow = _diagnostic('plow')
+    phigh = _diagnostic('phigh')
+    ps = _diagnostic('ps')
+    uSCNphigh = _diagnostic('uSCNphigh')
+    uNCRphigh = _diagnostic('uNCRphigh')
+    uNCSplow = _diagnostic('uNCSplow')
+    uRCNplow = _diagnostic('uRCNplow')
+    uaps = _diagnostic('uaps')
+    uRCVRps = _diagnostic('uRCVRps')
+
+
+class RiemannNASGEOS(SetupRiemannProblem):
+    r"""Computes the analytic solution to the Riemann problem for the Noble-Abel
+        stiffened-gas (NASG) EOS, :class:`exactpack.solvers.riemann.eos.NASGEOS`,
+        which contains the stiffened-gas, Noble-Abel (covolume) and ideal-gas
+        EOSs. The left and right materials are given by `eos_l` and `eos_r`,
+        which must be :class:`NASGEOS` or :class:`IdealGasEOS` objects; if they
+        are not given, ideal gases with adiabatic indices `gl` and `gr` are
+        used.
+
+        In terms of :math:`P = p + p_{\infty}` and
+        :math:`\tilde{\rho} = \rho / (1 - b \rho)` the shock and rarefaction
+        curves are those of an ideal gas [Toro2009]_, so the star pressure is
+        found with Newton iterations on closed-form wave curves, rather than
+        by integrating and bisecting as in :class:`RiemannGenEOS`. The
+        rarefaction fans are sampled exactly; with a covolume this requires a
+        vectorized Newton solve of the characteristic condition.
+
+        Default values are :math:`xmin=0, xd0=0.5, xmax=1, t=0.25, \rho_l=1, u_l=0, p_l=1, \gamma_l=1.4, \rho_r=0.125, u_r=0, p_r=0.1, \gamma_r=1.4`.
+    """
+    def driver(self, x_user=0, tol=1.e-15, max_iter=100):
+      pl, rl, ul = self.pl, self.rl, self.ul
+      pr, rr, ur = self.pr, self.rr, self.ur
+      xmin, xd0, xmax, t = self.xmin, self.xd0, self.xmax, self.t
+      eos_l, eos_r = self.eos_l, self.eos_r
+      gl, pinfl, bl = nasg_params(eos_l)
+      gr, pinfr, br = nasg_params(eos_r)
+
+      al, ar = eos_l.sound_speed(pl, rl), eos_r.sound_speed(pr, rr)
+      el, er = eos_l.sie(pl, rl), eos_r.sie(pr, rr)
+
+      def fun(p):
+        fl, dfl = nasg_wave_curve(p, pl, rl, gl, pinfl, bl)
+        fr, dfr = nasg_wave_curve(p, pr, rr, gr, pinfr, br)
+        return fl + fr + ur - ul, dfl + dfr
+
+      # The star pressure must keep P = p + pinf positive on both sides,
+      # otherwise the initial states generate a vacuum.
+      pvac = - min(pinfl, pinfr)
+      if (fun(pvac)[0] >= 0.):
+        raise ValueError('The initial states generate a vacuum, which is '
+                         'not supported.')
+
+      # Safeguarded Newton iterations for the star pressure, px. The wave
+      # curve function is increasing, so [plo, phi] always brackets px.
+      plo, phi = pvac, max(pl, pr)
+      while (fun(phi)[0] <= 0.):
+        phi += 2. * (phi - plo)
+      scale = max(abs(pl), abs(pr), abs(pvac))
+      px = 0.5 * (pl + pr) - 0.125 * (ur - ul) * (rl + rr) * (al + ar)
+      if not (plo < px < phi):
+        px = 0.5 * (plo + phi)
+      for i in range(max_iter):
+        f, df = fun(px)
+        if (f == 0.):
+          break
+        elif (f < 0.):
+          plo = px
+        else:
+          phi = px
+        dp = f / df
+        pnew = px - dp
+        if not (plo < pnew < phi):
+          pnew = 0.5 * (plo + phi)
+        converged = abs(pnew - px) <= tol * scale
+        px = pnew
+        if converged:
+          break
+
+      # Star states and the velocities bounding the regions, which are all
+      # time-independent.
+      fl = nasg_wave_curve(px, pl, rl, gl, pinfl, bl)[0]
+      fr = nasg_wave_curve(px, pr, rr, gr, pinfr, br)[0]
+      ux = 0.5 * (ul + ur) + 0.5 * (fr - fl)
+      rx1 = nasg_star_density(px, pl, rl, gl, pinfl, bl)
+      rx2 = nasg_star_density(px, pr, rr, gr, pinfr, br)
+      ax1 = eos_l.sound_speed(px, rx1)
+      ax2 = eos_r.sound_speed(px, rx2)
+      ex1 = eos_l.sie(px, rx1)
+      ex2 = eos_r.sie(px, rx2)
+
+      left = 'shock' if (px > pl) else 'rarefaction'
+      right = 'shock' if (px > pr) else 'rarefaction'
+      soln_type = '-'.join([left, 'contact', right,
+                            left[0].upper() + 'C' + right[0].upper()])
+      if (left == 'shock'):
+        Vregs = [nasg_shock_velocity(px, pl, rl, ul, gl, pinfl, bl, -1), ux]
+      else:
+        Vregs = [ul - al, ux - ax1, ux]
+      if (right == 'shock'):
+        Vregs += [nasg_shock_velocity(px, pr, rr, ur, gr, pinfr, br, 1)]
+      else:
+        Vregs += [ux + ax2, ur + ar]
+      Vregs = array(Vregs)
+
+      # Determine the time-dependent spatial boundaries, append these points
+      # to the array 'x', and sample the exact solution at xi = (x - xd0)/t.
+      Xregs = xd0 + t * Vregs
+      xmin, xmax = min(xmin, 1.1 * min(Xregs)), max(xmax, 1.1 * max(Xregs))
+      x = linspace(xmin, xmax, self.num_x_pts)
+      x = append(x, Xregs)
+      x = append(x, x_user)
+      x.sort()
+      xi = (x - xd0) / t
+
+      p, r, u = pl + 0. * x, rl + 0. * x, ul + 0. * x
+      star1 = (xi >= Vregs[0]) & (xi <= ux)
+      star2 = (xi > ux) & (xi <= Vregs[-1])
+      p[star1 | star2], u[star1 | star2] = px, ux
+      r[star1], r[star2] = rx1, rx2
+      if (left == 'rarefaction'):
+        fan = (xi > Vregs[0]) & (xi < Vregs[1])
+        p[fan], r[fan], u[fan] = nasg_fan(xi[fan], pl, rl, ul, gl, pinfl, bl,
+                                          px)
+      if (right == 'rarefaction'):
+        fan = (xi > Vregs[-2]) & (xi < Vregs[-1])
+        p[fan], r[fan], u[fan] = nasg_fan(-xi[fan], pr, rr, -ur, gr, pinfr, br,
+                                          px)
+        u[fan] = - u[fan]
+      right_state = xi > Vregs[-1]
+      p[right_state], r[right_state], u[right_state] = pr, rr, ur
+      e = where(x <= xd0 + t * ux, eos_l.sie(p, r), eos_r.sie(p, r))
+
+      # Storing solution variables
+      self.x, self.p, self.r, self.u, self.e = x, p, r, u, e
+      self.px,  self.ux,  self.rx1, self.rx2 = px,  ux,  rx1, rx2
+      self.ex1, self.ex2, self.ax1, self.ax2 = ex1, ex2, ax1, ax2
+      self.Xregs, self.Vregs = Xregs, Vregs
+      self.xmin, self.xmax = xmin, xmax
+      self.soln_type = soln_type
 
 
 class RiemannGenEOS(SetupRiemannProblem):
@@ -228,20 +430,78 @@ class RiemannGenEOS(SetupRiemannProblem):
         #1.
 
         Default values are :math:`xmin=0, xd0=0.5, xmax=1, t=0.25, \rho_l=1, u_l=0, p_l=1, \gamma_l=1.4, \rho_r=0.125, u_r=0, p_r=0.1, \gamma_r=1.4`.
+
+        The rarefaction and shock curves of each side are cached, keyed on the
+        side's EOS parameters and initial state only, so that problems sharing
+        one side's state only compute the curves of the other side, whatever
+        the pressure range of the other side. At most
+        `wave_curve_cache_size` sides are kept, evicting the least recently
+        used; set it to 0 to disable caching.
   """
+  wave_curve_cache_size = 32
+  _wave_curve_cache = OrderedDict()
+  _wave_curve_lock = Lock()
+
+  @classmethod
+  def clear_wave_curve_cache(cls):
+      """Remove all cached wave curves."""
+      with cls._wave_curve_lock:
+        cls._wave_curve_cache.clear()
+
+  def wave_curves(self, p, r, u, eos, side):
+      """Return the rarefaction and shock curves, as P-U data, through the
+      state (p, r, u) of the left (side = -1) or right (side = 1) material.
+
+      The shock curve is sampled at pressures that depend only on the side's
+      own state (see :func:`exactpack.solvers.riemann.utils.shock_pressures`),
+      up to the first one at or above `pmax`. A cached curve is extended when
+      a problem needs higher pressures, and clipped when it needs lower ones.
+      """
+      key = (eos.cache_key(), p, r, u, side, self.num_int_pts, self.int_tol)
+      n = shock_size(p, self.pmax, self)
+      cache = self._wave_curve_cache
+      with self._wave_curve_lock:
+        entry = cache.get(key)
+        if entry is not None:
+          cache.move_to_end(key)
+      if entry is None:
+        empty = array([])
+        entry = (tuple(r_int_call([r, u, p], [eos, side], 0., self)) +
+                 (empty, empty, empty), False)
+      curves, failed = entry
+      m = len(curves[3])
+      if (m < n) and not failed:
+        # Extend the shock curve, up to the first pressure it fails at.
+        k = arange(m, n)
+        shocks = match_shocks(shock_pressures(p, k, self), p, r, u, eos, side,
+                              self)
+        failed = len(shocks[0]) < len(k)
+        curves = curves[:3] + tuple(concatenate([c, s])
+                                    for c, s in zip(curves[3:], shocks))
+        for c in curves:
+          c.flags.writeable = False
+        with self._wave_curve_lock:
+          cache[key] = (curves, failed)
+          cache.move_to_end(key)
+          while (len(cache) > self.wave_curve_cache_size):
+            cache.popitem(last=False)
+      if (len(curves[3]) > n):
+        curves = curves[:3] + tuple(c[:n] for c in curves[3:])
+      return curves
+
   def driver(self, x_user=0):
       xmin, xd0, xmax, t = self.xmin, self.xd0, self.xmax, self.t
       pl, rl, ul, gl = self.pl, self.rl, self.ul, self.gl
       pr, rr, ur, gr = self.pr, self.rr, self.ur, self.gr
-      al, ar = sound_speed(pl, rl, gl, self), sound_speed(pr, rr, gr, self)
-      el, er = sie(pl, rl, gl, self), sie(pr, rr, gr, self)
-      pmax = self.pmax
+      eos_l, eos_r = self.eos_l, self.eos_r
+      al, ar = eos_l.sound_speed(pl, rl), eos_r.sound_speed(pr, rr)
+      el, er = eos_l.sie(pl, rl), eos_r.sie(pr, rr)
 
       # Create rarefaction and shock [p, r, u] values as P-U data.
-      integ_ps_left,  rls, uls = r_int_call([rl, ul, pl], [gl, -1], 0., self)
-      integ_ps_right, rrs, urs = r_int_call([rr, ur, pr], [gr,  1], 0., self)
-      shock_ps_left,  rlx, ulx = match_shocks(pmax, pl, rl, ul, gl, self)
-      shock_ps_right, rrx, urx = match_shocks(pmax, pr, rr, ur, gr, self)
+      (integ_ps_left,  rls, uls,
+       shock_ps_left,  rlx, ulx) = self.wave_curves(pl, rl, ul, eos_l, -1)
+      (integ_ps_right, rrs, urs,
+       shock_ps_right, rrx, urx) = self.wave_curves(pr, rr, ur, eos_r,  1)
 
       # Splice p-u rarefaction and shock values for left & right states.
       ps_left_splice  = append(integ_ps_left,  append(pl, shock_ps_left))
@@ -265,7 +525,7 @@ class RiemannGenEOS(SetupRiemannProblem):
         soln_type[0] = 'R'
         rx1 = interp(px, integ_ps_left, rls)
         ux1 = interp(px, integ_ps_left, uls)
-        ax1 = sound_speed(px, rx1, gl, self)
+        ax1 = eos_l.sound_speed(px, rx1)
         ps_left = integ_ps_left[where(integ_ps_left > px)[0]][::-1]
         rs_left = rls[where(rls > rx1)[0]][::-1]
         us_left = uls[where(uls < ux1)[0]][::-1]
@@ -275,7 +535,7 @@ class RiemannGenEOS(SetupRiemannProblem):
         soln_type[0] = 'S'
         rx1 = interp(px, shock_ps_left, rlx)
         ux1 = interp(px, shock_ps_left, ulx)
-        ax1 = sound_speed(px, rx1, gl, self)
+        ax1 = eos_l.sound_speed(px, rx1)
         ps_left, rs_left, us_left = px, rx1, ux1
         Vregs.append(shock_speed(px, rx1, pl, rl, ul, self))
 
@@ -285,7 +545,7 @@ class RiemannGenEOS(SetupRiemannProblem):
         soln_type[-1] = 'R'
         rx2 = interp(px, integ_ps_right, rrs)
         ux2 = interp(px, integ_ps_right, urs)
-        ax2 = sound_speed(px, rx2, gr, self)
+        ax2 = eos_r.sound_speed(px, rx2)
         ps_right = integ_ps_right[where(integ_ps_right > px)[0]]
         rs_right = rrs[where(rrs > rx2)[0]]
         us_right = urs[where(urs > ux2)[0]]
@@ -295,7 +555,7 @@ class RiemannGenEOS(SetupRiemannProblem):
         soln_type[-1] = 'S'
         rx2 = interp(px, shock_ps_right, rrx)
         ux2 = interp(px, shock_ps_right, urx)
-        ax2 = sound_speed(px, rx2, gr, self)
+        ax2 = eos_r.sound_speed(px, rx2)
         ps_right, rs_right, us_right = px, rx2, ux2
         Vregs.append(shock_speed(px, rx2, pr, rr, ur, self))
       
@@ -307,9 +567,9 @@ class RiemannGenEOS(SetupRiemannProblem):
       rs_right = append(append(rx2, rs_right), rr)
       us_right = append(append(ux2, us_right), ur)
 
-      ex1, ex2 = sie(px, rx1, gl, self), sie(px, rx2, gr, self)
-      es_left  = sie(ps_left,  rs_left,  gl, self)
-      es_right = sie(ps_right, rs_right, gr, self)
+      ex1, ex2 = eos_l.sie(px, rx1), eos_r.sie(px, rx2)
+      es_left  = eos_l.sie(ps_left,  rs_left)
+      es_right = eos_r.sie(ps_right, rs_right)
       left_arrays  = ps_left,  rs_left,  us_left,  es_left
       right_arrays = ps_right, rs_right, us_right, es_right
       
@@ -336,7 +596,7 @@ class RiemannGenEOS(SetupRiemannProblem):
       soln_type = soln_type[0] + soln_type[1] + soln_type[2]
       if (soln_type == 'RCS'):
           # Define region2: rarefaction fan adjacent the constant left state
-          xr = xd0 + t * (us_left - sound_speed(ps_left, rs_left, gl, self))
+          xr = xd0 + t * (us_left - eos_l.sound_speed(ps_left, rs_left))
           vals = reg_state_geos(Xregs[0], xr, x, left_arrays, vals)
           # Define region3: constant left star-state
           xr_argmin = argmin(abs(x - Xregs[2])) - 1
@@ -361,11 +621,11 @@ class RiemannGenEOS(SetupRiemannProblem):
           regvals_send = [[px,px], [rx2,rx2], [ux2,ux2], [ex2,ex2]] 
           vals = reg_state_geos(Xregs[1], xr, x, regvals_send, vals)
           # Define region5: rarefaction fan adjacent the constant right state
-          xr = xd0 + t * (us_right + sound_speed(ps_right, rs_right, gr, self))
+          xr = xd0 + t * (us_right + eos_r.sound_speed(ps_right, rs_right))
           vals = reg_state_geos(Xregs[2], xr, x, right_arrays, vals)
       elif (soln_type == 'RCR'):
           # Define region2: the rarefaction fan adjacent the constant left state
-          xr = xd0 + t * (us_left - sound_speed(ps_left, rs_left, gl, self))
+          xr = xd0 + t * (us_left - eos_l.sound_speed(ps_left, rs_left))
           vals = reg_state_geos(Xregs[0], xr, x, left_arrays, vals)
           # Define region3: the constant left star-state
           xr = append(Xregs[1], array(Xregs[2]))
@@ -376,7 +636,7 @@ class RiemannGenEOS(SetupRiemannProblem):
           regvals_send = [[px, px], [rx2, rx2], [ux2, ux2], [ex2, ex2]] 
           vals = reg_state_geos(Xregs[2], xr, x, regvals_send, vals)
           # Define region5: rarefaction fan adjacent the constant right state
-          xr = xd0 + t * (us_right + sound_speed(ps_right, rs_right, gr, self))
+          xr = xd0 + t * (us_right + eos_r.sound_speed(ps_right, rs_right))
           vals = reg_state_geos(Xregs[3], xr, x, right_arrays, vals)
       elif (soln_type == 'SCS'):
           # Define region3: the constant left star-state, which is a shock jump
@@ -1,75 +1,30 @@
+from warnings import warn
+
 import scipy.integrate
 from scipy.optimize import bisect
-from numpy import linspace, array, sqrt, interp, append, where, argmin, argmax, exp, shape, abs
-
-def JWL_f(r, g, inst):
-  """The JWL EOS ammends the IGEOS pressure with a term depending on density,
-     gamma and empirically determined constants.
-  """
-  G   = g - 1.
-  r0 = inst.r0
-  R1r = inst.R1 * r0 / r
-  R2r = inst.R2 * r0 / r
-  A, B = inst.A, inst.B
-  return A * (1. - G / R1r) * exp(- R1r) + B * (1. - G / R2r) * exp(- R2r)
-
-def JWL_dfdr(r, g, inst):
-  G  = g - 1.
-  r0 = inst.r0
-  R1r = inst.R1 * r0 / r
-  R2r = inst.R2 * r0 / r
-  val  = inst.A * (R1r / r - G / inst.R1 / r0 - G / r) * exp(- R1r)
-  val += inst.B * (R2r / r - G / inst.R2 / r0 - G / r) * exp(- R2r)
-  return val
+from numpy import (linspace, array, sqrt, interp, append, where, argmin, argmax,
+                   exp, shape, abs, clip, ceil, log10)
 
-def sie(p, r, g, inst):
-  JWL_fval = 0 if (inst.problem == 'igeos') else JWL_f(r, g, inst)
-  return (p - JWL_fval) / (g - 1.) / r
-
-def dsdr_cP(p, r, g, inst):
-  """See [Kamm2015]_ eqs. 5 & 6. The generalized definition for sound speed
-     contains the derivative of SIE wrt rho at constant p -> 'dsdr_cP'
-  """
-  G = g - 1.
-  if ('JWL' in inst.problem):
-  # the JWL result
-    return - JWL_dfdr(r, g, inst) / G / r - (p - JWL_f(r, g, inst)) / G / r**2
-  else:
-  # the ideal-gas result
-    return - p / G / r**2
+from exactpack.solvers.riemann.eos import IdealGasEOS, NASGEOS
 
-def dsdp_cR(p, r, g, inst):
-  """See [Kamm2015]_ eqs. 5 & 6. The generalized definition for sound speed
-     contains the derivative of SIE wrt p at constant rho -> 'dsdp_cR'
+def ig_sound_speed(p, r, g):
+  """The ideal-gas sound speed, used by the closed-form ideal-gas wave curves
+     below. The general EOS solver uses the sound speed of its EOS objects.
   """
-  # the ideal-gas and JWL results are the same
-  return 1. / r / (g - 1.)
-
-# Copying and modifying the above equations for a JWL EOS, for example, produces
-# the associated sound speed.
-
-# This is the sound speed for the generalized EOS.
-def sound_speed(p, r, g, inst):
-  """See [Kamm2015]_ eqs. 5 & 6. The generalized definition for sound speed
-     contains the derivative of SIE wrt p at constant rho |-> dsdp_cR
-  """
-  if (inst.problem == 'igeos'):
-    return sqrt(g * p / r)
-  else:
-    return sqrt((p / r**2 - dsdr_cP(p, r, g, inst)) / dsdp_cR(p, r, g, inst))
+  return sqrt(g * p / r)
 
 # These are the generalized ODEs for density and velocity wrt pressure.
-def drdp_dudp(p, vals, g, wave_sign, inst):
+def drdp_dudp(p, vals, eos, wave_sign):
   r, u = vals
-  a = sound_speed(p, r, g, inst)
+  a = eos.sound_speed(p, r)
   drdp_val = 1. / a**2
   dudp_val = 1. / r / a * wave_sign
   return [drdp_val, dudp_val]
 
 # Generalized shock jump for the generalized wave speed relation below.
-def shock_jump(p0, r0, g0, p, r, inst):
-  e0 = sie(p0, r0, g0, inst)
-  e  = sie(p,  r,  g0, inst)
+def shock_jump(p0, r0, p, r, eos):
+  e0 = eos.sie(p0, r0)
+  e  = eos.sie(p,  r)
   val  = e0 + p0 / r0 + r  / r0 * (p - p0) / (r - r0) / 2.
   val -= e  + p  / r  + r0 / r  * (p - p0) / (r - r0) / 2.
   return val
@@ -93,7 +48,7 @@ def r_int_call(init_vals, fparams, pmin, inst):
   dt = integ_array[1] - integ_array[0]
   i = scipy.integrate.ode(drdp_dudp)
   i.set_initial_value(init_vals[:2], init_vals[2])
-  i.set_f_params(fparams[0], fparams[1], inst)
+  i.set_f_params(fparams[0], fparams[1])
   i.set_integrator('vode', atol = inst.int_tol, rtol = inst.int_tol,
                    method = 'bdf', nsteps = int(1e6))
   k, rs, us = 0, [], []
@@ -105,24 +60,68 @@ def r_int_call(init_vals, fparams, pmin, inst):
       k += 1
   return [integ_array[::-1], array(rs[::-1]), array(us[::-1])]
 
-# Shock state match conditions.
-def match_shocks(pmax, p, r, u, g, inst):
-  sgn = -1 if ((p == inst.pl) and (r == inst.rl) and (u == inst.ul)) else 1
-  shock_array = linspace(p, pmax, inst.num_int_pts + 2)
-  shock_array[0] = (shock_array[1] - shock_array[0]) * 1.e-8 + shock_array[0]
-  rxs, rx0, rxf = [], (1. + inst.int_tol) * r, (g + 1.) / (g - 1.) * r
-  for px in shock_array:
-    try:
-      rxs.append(bisect(lambda rx: shock_jump(p, r, g, px, rx, inst), rx0, rxf))
-    except:
-      print('failed px = ', px)
+# Vectorized bisection, taking the same steps as scipy.optimize.bisect.
+def bisect_vec(f, xa, xb, xtol=2.e-12, rtol=8.881784197001252e-16, iters=100):
+  """Bisect the elementwise roots of the vectorized function f on the
+     intervals [xa, xb]. The iterates are those of scipy.optimize.bisect, so
+     each root is the one a scalar bisect call would return. Also returns a
+     mask that is False where f does not change sign over the interval.
+  """
+  xa, xb = array(xa, dtype=float), array(xb, dtype=float)
+  fa, fb = f(xa), f(xb)
+  ok = ~(fa * fb > 0)
+  x = where(fa == 0, xa, xb)
+  done = ~ok | (fa == 0) | (fb == 0)
+  dm = xb - xa
+  for k in range(iters):
+    if done.all():
       break
-  rxs = array(rxs)
-  uxs = star_velocity(p, r, u, shock_array[:len(rxs)], rxs, inst)
-  return [shock_array[:len(rxs)], rxs, uxs]
+    dm = dm * .5
+    xm = xa + dm
+    fm = f(xm)
+    xa = where(fm * fa >= 0, xm, xa)
+    conv = ~done & ((fm == 0) | (abs(dm) < xtol + rtol * abs(xm)))
+    x = where(conv, xm, x)
+    done = done | conv
+  return x, ok
+
+# Shock curve pressures above p, depending only on p: num_int_pts + 2 evenly
+# spaced points from p to 10 p, then num_int_pts + 1 per decade above that.
+# The indices k of the points up to the first one at or above pmax are
+# range(shock_size(p, pmax, inst)).
+def shock_pressures(p, k, inst):
+  n = inst.num_int_pts + 1
+  dp = (10. * p - p) / n
+  k = array(k)
+  ps = where(k <= n, p + k * dp, 10. * p * 10.**((k - n) / n))
+  ps[k == n] = 10. * p
+  ps[k == 0] = (p + dp - p) * 1.e-8 + p
+  return ps
+
+def shock_size(p, pmax, inst):
+  n = inst.num_int_pts + 1
+  if (pmax <= 10. * p):
+    return min(int(ceil((pmax - p) / ((10. * p - p) / n))), n) + 1
+  return n + 1 + int(ceil(log10(pmax / (10. * p)) * n))
+
+# Shock state match conditions at the pressures shock_array above p, for the
+# left (side = -1) or right (side = 1) material.
+def match_shocks(shock_array, p, r, u, eos, side, inst):
+  rx0, rxf = (1. + inst.int_tol) * r, eos.max_shock_density(r)
+  rxs, ok = bisect_vec(lambda rx: shock_jump(p, r, shock_array, rx, eos),
+                       rx0 + 0. * shock_array, rxf + 0. * shock_array)
+  # keep the shock curve up to the first pressure without a bracketed root
+  n = len(ok) if ok.all() else argmin(ok)
+  if (n < len(ok)):
+    warn('the {} shock curve ends at p = {}, where the shock jump has no '
+         'density root'.format('left' if side < 0 else 'right',
+                               shock_array[n]), RuntimeWarning)
+  rxs = rxs[:n]
+  uxs = star_velocity(p, r, u, shock_array[:n], rxs, inst)
+  return [shock_array[:n], rxs, uxs]
 
 def rarefaction(px, p, r, u, g, inst):
-  a = sound_speed(p, r, g, inst)
+  a = ig_sound_speed(p, r, g)
   return 2.*a / (g - 1.) * (1. - (px / p)**((g - 1.) / 2. / g)) + u
 
 def shock(px, p, r, u, g, inst):
@@ -158,18 +157,18 @@ def rho_star_rarefaction(px, p, r, g, inst):
 
 def rho_p_u_rarefaction(p, r, u, g, x, xd0, t, inst):
   sgn = 1 if ((p == inst.pl) and (u == inst.ul) and (r == inst.rl)) else -1
-  a = sound_speed(p, r, g, inst)
+  a = ig_sound_speed(p, r, g)
   y = 2. / (g + 1.) + sgn * (g - 1.) / a / (g + 1.) * (u - (x - xd0) / t)
   v = 2. * (sgn * a + (g - 1.) * u / 2. + (x - xd0) / t) / (g + 1.)
   return r * y**(2. / (g - 1.)), p * y**(2. * g / (g - 1.)), v
 
 def shock_velocity(px, p, r, u, g, inst):
   sgn = -1 if ((p == inst.pl) and (u == inst.ul) and (r == inst.rl)) else 1
-  a = sound_speed(p, r, g, inst)
+  a = ig_sound_speed(p, r, g)
   return u + sgn * a * sqrt((g + 1.) * px / 2. / g / p + (g - 1.) / 2. / g)
 
 def arp(p, inst):
-  return sound_speed(p, inst.rr, inst.gr, inst)
+  return ig_sound_speed(p, inst.rr, inst.gr)
 
 def u_SCN(px, inst):
   u, a, g, p = inst.ul, inst.al, inst.gl, inst.pl
@@ -177,12 +176,12 @@ def u_SCN(px, inst):
 
 def u_NCS(px, inst):
   u, g, p = inst.ul, inst.gr, inst.pl
-  arp = sound_speed(px, inst.rr, inst.gr, inst)
+  arp = ig_sound_speed(px, inst.rr, inst.gr)
   return u - arp / g * (p / px - 1.) / sqrt((g + 1.) / 2. / g * p / px + (g - 1.) / 2. / g)
 
 def u_NCR(px, inst):
   u, g, p = inst.ul, inst.gr, inst.pl
-  arp = sound_speed(px, inst.rr, inst.gr, inst)
+  arp = ig_sound_speed(px, inst.rr, inst.gr)
   return u + 2. * arp / (g - 1.) * (1. - (p / px)**((g - 1.) / 2. / g))
 
 def u_RCN(px, inst):
@@ -190,7 +189,84 @@ def u_RCN(px, inst):
   return u + 2. * a / (g - 1.) * (1. - (px / p)**((g - 1.) / 2. / g))
 
 def u_a(p, inst):
-  return inst.ul + 2. * sound_speed(p, inst.rr, inst.gr, inst) / (inst.gr - 1.)
+  return inst.ul + 2. * ig_sound_speed(p, inst.rr, inst.gr) / (inst.gr - 1.)
 
 def u_RCVR(p, inst):
-  return inst.ul_tilde + 2.*sound_speed(p,inst.rr,inst.gr,inst) / (inst.gr - 1.)
+  return inst.ul_tilde + 2.*ig_sound_speed(p,inst.rr,inst.gr) / (inst.gr - 1.)
+
+# Closed-form wave curves for the Noble-Abel stiffened-gas (NASG) EOS. In terms
+# of P = p + pinf and the reduced density rt = r / (1 - b * r) these are the
+# ideal-gas wave curves, with the reduced sound speed at = a * (1 - b * r).
+def nasg_params(eos):
+  """Return (gamma, pinf, b) for an ideal-gas or NASG EOS object."""
+  if isinstance(eos, NASGEOS):
+    return eos.gamma, eos.pinf, eos.b
+  elif isinstance(eos, IdealGasEOS):
+    return eos.gamma, 0., 0.
+  raise TypeError('the NASG Riemann solver requires IdealGasEOS or NASGEOS objects')
+
+def nasg_wave_curve(px, p, r, g, pinf, b):
+  """The velocity change across a shock (px > p) or rarefaction (px <= p)
+     connecting (p, r) to the pressure px, and its derivative wrt px.
+  """
+  P, Px = p + pinf, px + pinf
+  rt = r / (1. - b * r)
+  if (px > p):
+    A = 2. / (g + 1.) / rt
+    B = (g - 1.) / (g + 1.) * P
+    Q = sqrt(A / (Px + B))
+    return (px - p) * Q, Q * (1. - (px - p) / 2. / (Px + B))
+  at = sqrt(g * P / rt)
+  if (Px <= 0.):
+    # the vacuum limit, where the rarefaction curve has infinite slope
+    return - 2. * at / (g - 1.), float('inf')
+  f = 2. * at / (g - 1.) * ((Px / P)**((g - 1.) / 2. / g) - 1.)
+  return f, (Px / P)**(- (g + 1.) / 2. / g) / rt / at
+
+def nasg_star_density(px, p, r, g, pinf, b):
+  P, Px = p + pinf, px + pinf
+  rt = r / (1. - b * r)
+  if (px > p):
+    G = (g - 1.) / (g + 1.)
+    rtx = rt * (Px / P + G) / (G * Px / P + 1.)
+  else:
+    rtx = rt * (Px / P)**(1. / g)
+  return rtx / (1. + b * rtx)
+
+def nasg_shock_velocity(px, p, r, u, g, pinf, b, sgn):
+  """Shock speed from the mass flux across it; sgn is -1 for a left-facing
+     shock and +1 for a right-facing shock.
+  """
+  P, Px = p + pinf, px + pinf
+  rt = r / (1. - b * r)
+  A = 2. / (g + 1.) / rt
+  B = (g - 1.) / (g + 1.) * P
+  return u + sgn * sqrt((Px + B) / A) / r
+
+def nasg_fan(xi, p, r, u, g, pinf, b, px, tol=4.e-16, iters=50):
+  """Sample a left-facing rarefaction fan of the state (p, r, u) at the
+     similarity coordinates xi = (x - xd0) / t. A right-facing fan is sampled
+     by passing -xi and -u, and negating the returned velocity.
+
+     Along the isentrope y = (P / P0)**((g - 1) / 2 / g) parametrizes the
+     fan, and the characteristic condition u - a = xi is solved for y with
+     vectorized Newton iterations. These start from the closed-form b = 0
+     solution, from which they converge monotonically.
+  """
+  P = p + pinf
+  rt = r / (1. - b * r)
+  at = sqrt(g * P / rt)
+  ystar = ((px + pinf) / P)**((g - 1.) / 2. / g)
+  y = clip(((g - 1.) * (u - xi) / at + 2.) / (g + 1.), ystar, 1.)
+  if (b != 0.):
+    brt, k = b * rt, (g + 1.) / (g - 1.)
+    for i in range(iters):
+      res = u - xi - at * (2. * (y - 1.) / (g - 1.) + y + brt * y**k)
+      dres = - at * (2. / (g - 1.) + 1. + brt * k * y**(k - 1.))
+      dy = res / dres
+      y = y - dy
+      if (abs(dy).max(initial=0.) < tol):
+        break
+  rtx = rt * y**(2. / (g - 1.))
+  return (P * y**(2. * g / (g - 1.)) - pinf, rtx / (1. + b * rtx),
+          u - 2. * at * (y - 1.) / (g - 1.))
@@ -6,7 +6,7 @@ This code is released under LA-CC-05-101.
 """
 
 from ...base import ExactSolver, ExactSolution, print_when_verbose
-from .timmes import rmtv
+from .timmes import Profile
 
 
 class Rmtv(ExactSolver):
@@ -25,6 +25,8 @@ class Rmtv(ExactSolver):
         'xis': 'dimensionless position of the shock front',
         'beta0': 'eigenvalue of the problem',
         'g0': 'heat front scaling parameter',
+        'workers': 'number of threads used to evaluate the solution at the \
+        positions concurrently, or None to evaluate them serially',
         }
 
     aval = -2.0
@@ -37,15 +39,17 @@ class Rmtv(ExactSolver):
     xis = 1.0
     beta0 = 7.197534e7 # LA-UR-05-6865 p. 31
     g0 = 1.0
+    workers = None
 
-    @print_when_verbose
-    def _run(self, r, t=None):
-        # The 't' parameter is required by the ExactPAck API but is not used
-        # here. Ideally we would have some way of converting 't' to a value of
-        # 'rf'.
-
-        den, tev, ener, pres, vel = rmtv(r=r,
-                                         aval_in=self.aval,
+    @property
+    def _profile(self):
+        """The :class:`.timmes.Profile` of this solver, which is computed on
+        first use and reused for all later evaluations.
+        """
+        try:
+            return self._rmtv_profile
+        except AttributeError:
+            self._rmtv_profile = Profile(aval_in=self.aval,
                                          bval_in=self.bval,
                                          chi0=self.chi0,
                                          gamma=self.gamma,
@@ -55,6 +59,15 @@ class Rmtv(ExactSolver):
                                          xis=self.xis,
                                          beta0_in=self.beta0,
                                          g0=self.g0)
+            return self._rmtv_profile
+
+    @print_when_verbose
+    def _run(self, r, t=None):
+        # The 't' parameter is required by the ExactPAck API but is not used
+        # here. Ideally we would have some way of converting 't' to a value of
+        # 'rf'.
+
+        den, tev, ener, pres, vel = self._profile(r, self.workers)
 
         return ExactSolution([r, den, tev, ener, pres, vel],
                              names=['position',
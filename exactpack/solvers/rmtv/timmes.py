@@ -3,13 +3,21 @@
 This is a Python re-implementation Frank Timmes RMTV Fortran solver.
 """
 import numpy as np
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from math import exp, log
 from scipy.integrate import quad, solve_ivp
 from scipy.optimize import brentq
 
 
+#: The parameters shared by the functions below for one evaluation, which
+#: were held in a common block in the Fortran code.
+Context = namedtuple('Context', ['aval', 'bval', 'xif', 'beta0', 'xgeom',
+                                 'alpha', 'amu', 'kappa', 'sigma'])
+
+
 def rmtv(r, aval_in, bval_in, chi0, gamma,
-         bigamma, rf, xif_in, xis, beta0_in, g0):
+         bigamma, rf, xif_in, xis, beta0_in, g0, workers=None):
     """Solves the rmtv in one-dimension, spherical coordinates
     this a highly simplified version of kamm's code that solves for 
     an array of values for a specific tri-lab verification test problem.
@@ -26,6 +34,9 @@ def rmtv(r, aval_in, bval_in, chi0, gamma,
         xis (float): Dimensionless position of the shock front
         beta0 (float): Eigenvalue of the problem
         g0 (float): Heat front scaling parameter
+        workers (int): If given, the positions are evaluated concurrently by
+            a pool of this many threads. The results are identical to those
+            of the serial evaluation.
 
     Returns:
         tuple: A 5-tuple containing:
@@ -35,23 +46,9 @@ def rmtv(r, aval_in, bval_in, chi0, gamma,
             - *ndarray*: pres, presssure erg/cm**3
             - *ndarray*: vel, velocity cm/sh
     """
-    nstep = len(r)
-    den = np.zeros(nstep)
-    tev = np.zeros(nstep)
-    ener = np.zeros(nstep)
-    pres = np.zeros(nstep)
-    vel = np.zeros(nstep)
-
-    for i in range(nstep):
-        d, t, e, p, v = rmtv_1d(r[i], aval_in, bval_in, chi0, gamma,
-                                bigamma, rf, xif_in, xis, beta0_in, g0)
-        den[i] = d
-        tev[i] = t
-        ener[i] = e
-        pres[i] = p
-        vel[i] = v
-
-    return den, tev, ener, pres, vel
+    profile = Profile(aval_in, bval_in, chi0, gamma,
+                      bigamma, rf, xif_in, xis, beta0_in, g0)
+    return profile(r, workers)
 
 
 def rmtv_1d(rpos, aval_in, bval_in, chi0, gamma,
@@ -81,118 +78,168 @@ def rmtv_1d(rpos, aval_in, bval_in, chi0, gamma,
             - *float*: pres, presssure erg/cm**3
             - *float*: vel, velocity cm/sh
     """
-    # Local parameters
-    tol = 1.0e-16
-    zero = 0.0
-    abserr = 1.0e-14
-    relerr = 1.0e-12
-    
-    # Used for the ODE integration
-    nvar = 4
-    jwork = 100 + 21 * nvar
-    epsr = 4.0e-10
-    epsa = 4.0e-10
-    xi_small = 1.0e-4
-
-    # transfer passed values to common
-    # xgeom is for spherical coordinates
-    global aval
-    global bval
-    global xif
-    global beta0
-    global xgeom
-    aval = aval_in
-    bval = bval_in
-    xif = xif_in
-    beta0 = beta0_in
-    xgeom = 3.0
-
-    # Initialize work arrays
-    iwork = np.zeros(5, dtype=np.int32)
-    work = np.zeros(jwork)
-
-    # frequent factors
-    global alpha
-    global amu
-    global kappa
-    global sigma
-    twoa = 2.0 * aval
-    twob = 2.0 * bval
-    alpha = (twob - twoa + 1.0)/(twob - (xgeom + 2.0)*aval +xgeom)
-    amu = 2.0 / (gamma - 1.0)
-    kappa = -((twob - 1.0)*xgeom + 2.0)/(twob - twoa + 1.0)
-    sigma = (twob - 1.0)/(alpha*(1.0 - aval))
-
-    # equations 28, 30, 33, 29
-    # for the scale factor, the phyiscal time, and the shock front position
-    zeta = (((0.5 * beta0 * bigamma**(bval + 1.0) * g0**(1.0 - aval) / chi0)**\
-             (1.0 / (twob - 1.0))) / alpha)**alpha
-    time = (rf / zeta / xif)**(1.0 / alpha)
-    rs = zeta * 1.0 * abs(time)**alpha
-
-    # this section does a root find to obtain the initial conditions
-    # bracket the initial zero-value of u
-    ustar = brentq(rmtvfun, 0, 0.5, xtol=tol)
-    
-    # form the converged value of the integral
-    ans = quad(fun, zero, ustar, epsabs=abserr, epsrel=relerr)[0]
-    
-    # equation 11 for the position to start the integration from
-    xistar = xif * exp(-(beta0 * (xif**((twob - 1.0) / alpha)) * ans))
-    rstar = xistar * zeta * time**alpha
-
-    # equation 11, 13 for the initial values of the other functions
-    gstar = 1.0 / (1.0 - ustar )
-    hstar = xistar**(-sigma) * gstar
-    wstar = 0.5 * (amu - (( amu + 1.0) * ustar))
-    tstar = ustar * (1.0 - ustar)
-
-    # now integrate
-    # beyond the heat front
-    if (rpos > rstar):
-        den = g0 * rpos**kappa
-        vel = 0.0
-        ener = 0.0
-        pres = 0.0
-        tev = 0.0
-    
-    # integrate from the heat front to perhaps the shock front
-    else:
-        ystart = np.array([ustar, hstar, wstar, tstar])
+    return tuple(q[0] for q in rmtv([rpos], aval_in, bval_in, chi0, gamma,
+                                    bigamma, rf, xif_in, xis, beta0_in, g0))
 
-        xiwant = rpos / zeta / time**alpha
-        xi_end = max(xis,xiwant)
+
+class Profile(object):
+    """The similarity solution of one RMTV problem.
+
+    Everything that does not depend on the radius is computed when the
+    profile is created: the scale factor and the time, the root find for the
+    value ustar of u at the heat front, and the initial values there. The
+    similarity ODEs are then integrated once, with dense output, from the
+    heat front to the shock front and, after the jump conditions, from the
+    shock front to near the origin. Calling the profile maps an array of
+    radii onto the two integrations with one vectorized evaluation each.
+
+    Args:
+        The arguments of :func:`rmtv_1d`, except the radius.
+    """
+
+    def __init__(self, aval_in, bval_in, chi0, gamma,
+                 bigamma, rf, xif_in, xis, beta0_in, g0):
+        # Local parameters
+        tol = 1.0e-16
+        zero = 0.0
+        abserr = 1.0e-14
+        relerr = 1.0e-12
+
+        # Used for the ODE integration
+        epsr = 4.0e-10
+        epsa = 4.0e-10
+        self.xi_small = 1.0e-4
+
+        # xgeom is for spherical coordinates
+        aval = aval_in
+        bval = bval_in
+        xif = xif_in
+        beta0 = beta0_in
+        xgeom = 3.0
+
+        # frequent factors
+        twoa = 2.0 * aval
+        twob = 2.0 * bval
+        alpha = (twob - twoa + 1.0)/(twob - (xgeom + 2.0)*aval +xgeom)
+        amu = 2.0 / (gamma - 1.0)
+        kappa = -((twob - 1.0)*xgeom + 2.0)/(twob - twoa + 1.0)
+        sigma = (twob - 1.0)/(alpha*(1.0 - aval))
+        ctx = Context(aval, bval, xif, beta0, xgeom, alpha, amu, kappa, sigma)
+
+        # equations 28, 30, 33, 29
+        # for the scale factor, the phyiscal time, and the shock front position
+        zeta = (((0.5 * beta0 * bigamma**(bval + 1.0) * g0**(1.0 - aval) / chi0)**\
+                 (1.0 / (twob - 1.0))) / alpha)**alpha
+        time = (rf / zeta / xif)**(1.0 / alpha)
+        rs = zeta * 1.0 * abs(time)**alpha
+
+        # this section does a root find to obtain the initial conditions
+        # bracket the initial zero-value of u
+        ustar = brentq(rmtvfun, 0, 0.5, xtol=tol, args=(ctx,))
+
+        # form the converged value of the integral
+        ans = quad(fun, zero, ustar, epsabs=abserr, epsrel=relerr,
+                   args=(ctx,))[0]
+
+        # equation 11 for the position to start the integration from
+        xistar = xif * exp(-(beta0 * (xif**((twob - 1.0) / alpha)) * ans))
+        rstar = xistar * zeta * time**alpha
+
+        # equation 11, 13 for the initial values of the other functions
+        gstar = 1.0 / (1.0 - ustar )
+        hstar = xistar**(-sigma) * gstar
+        wstar = 0.5 * (amu - (( amu + 1.0) * ustar))
+        tstar = ustar * (1.0 - ustar)
+
+        # integrate from the heat front to the shock front
+        ystart = np.array([ustar, hstar, wstar, tstar])
         eta1 = log(xistar)
-        eta2 = log(xi_end)
-        soln = solve_ivp(derivs, (eta1, eta2), ystart, rtol=epsr, atol=epsa)
-        ystart = soln.y[:, -1]
-        # apply equation 15 of kamm 2000 for the post-shock values if we must
-        # integrate farther
-        if (rpos <= rs):
-            usub2 = ystart[0]
-            hsub2 = ystart[1]
-            wsub2 = ystart[2]
-            tsub2 = ystart[3]
-
-            ystart[0] = 1.0 - (tsub2 / (1.0 - usub2))
-            ystart[1] = (1.0 - usub2)**2 / tsub2 * hsub2
-            ystart[2] = (tsub2 * wsub2 - 0.5 * ((1.0-usub2)**4 - tsub2**2)\
-                         / (1.0 - usub2)) / (1.0 - usub2)**2
-            ystart[3] = tsub2
-            # and integrate to near the origin if nned be
-            eta1 = eta2
-            xi_end = max(xi_small,xiwant)
-            eta2 = log(xi_end)
-            soln = solve_ivp(derivs, (eta1, eta2), ystart,
-                             rtol=epsr, atol=epsa)
-            ystart = soln.y[:, -1]
+        eta2 = log(xis)
+        self.outer = solve_ivp(derivs, (eta1, eta2), ystart,
+                               rtol=epsr, atol=epsa, args=(ctx,),
+                               dense_output=True)
+        ystart = self.outer.y[:, -1].copy()
+        # apply equation 15 of kamm 2000 for the post-shock values
+        usub2 = ystart[0]
+        hsub2 = ystart[1]
+        wsub2 = ystart[2]
+        tsub2 = ystart[3]
+
+        ystart[0] = 1.0 - (tsub2 / (1.0 - usub2))
+        ystart[1] = (1.0 - usub2)**2 / tsub2 * hsub2
+        ystart[2] = (tsub2 * wsub2 - 0.5 * ((1.0-usub2)**4 - tsub2**2)\
+                     / (1.0 - usub2)) / (1.0 - usub2)**2
+        ystart[3] = tsub2
+        # and integrate to near the origin
+        eta1 = eta2
+        eta2 = log(self.xi_small)
+        self.inner = solve_ivp(derivs, (eta1, eta2), ystart,
+                               rtol=epsr, atol=epsa, args=(ctx,),
+                               dense_output=True)
+
+        self.ctx = ctx
+        self.gamma = gamma
+        self.bigamma = bigamma
+        self.g0 = g0
+        self.xis = xis
+        self.zeta = zeta
+        self.time = time
+        self.rs = rs
+        self.rstar = rstar
+
+    def __call__(self, r, workers=None):
+        """Return the solution at the radii r, as in :func:`rmtv`.
+
+        If workers is given, chunks of r are evaluated concurrently by a pool
+        of that many threads.
+        """
+        r = np.asarray(r, dtype=float)
+        if workers is None:
+            return self._evaluate(r)
+        chunks = np.array_split(r, max(min(workers, r.size), 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._evaluate, chunks))
+        return tuple(np.concatenate(q) for q in zip(*results))
+
+    def _evaluate(self, r):
+        alpha, kappa, sigma = self.ctx.alpha, self.ctx.kappa, self.ctx.sigma
+        gamma = self.gamma
+        time = self.time
+
+        nstep = len(r)
+        den = np.zeros(nstep)
+        tev = np.zeros(nstep)
+        ener = np.zeros(nstep)
+        pres = np.zeros(nstep)
+        vel = np.zeros(nstep)
+
+        # beyond the heat front
+        front = r > self.rstar
+        den[front] = self.g0 * r[front]**kappa
+
+        # between the heat front and perhaps the shock front, and behind the
+        # shock front
+        xiwant = r / self.zeta / time**alpha
+        inside = ~front & (r <= self.rs)
+        outside = ~front & ~inside
+        xi_end = np.where(inside, np.maximum(self.xi_small, xiwant),
+                          np.maximum(self.xis, xiwant))
+        y = np.zeros((4, nstep))
+        if np.any(outside):
+            y[:, outside] = self.outer.sol(np.log(xi_end[outside]))
+        if np.any(inside):
+            y[:, inside] = self.inner.sol(np.log(xi_end[inside]))
+
         # convert the integration variables to physical quantities
         # equations 5, 2 of kamm 2000
-        vel = alpha * rpos * ystart[0] / time
-        den = g0 * rpos**kappa * xi_end**sigma * ystart[1]
-        ener = (alpha * rpos / time)**2 * ystart[3] / (gamma - 1.0)
-        pres = (gamma - 1.0) * den * ener
-        tev = (alpha * rpos / time)**2 * ystart[3] / bigamma
+        rpos = r[~front]
+        ystart = y[:, ~front]
+        vel[~front] = alpha * rpos * ystart[0] / time
+        den[~front] = self.g0 * rpos**kappa * xi_end[~front]**sigma \
+            * ystart[1]
+        ener[~front] = (alpha * rpos / time)**2 * ystart[3] / (gamma - 1.0)
+        pres[~front] = (gamma - 1.0) * den[~front] * ener[~front]
+        tev[~front] = (alpha * rpos / time)**2 * ystart[3] / self.bigamma
         # convert from jerk = 1e16 erg,  kev = 1e3 ev,  sh = 10e-8 s to cgs
         # units
         vel  = vel  * 1.0e8
@@ -200,14 +247,15 @@ def rmtv_1d(rpos, aval_in, bval_in, chi0, gamma,
         pres = pres * 1.0e16
         tev  = tev  * 1.0e3
 
-    return den, tev, ener, pres, vel
+        return den, tev, ener, pres, vel
 
 
-def rmtvfun(u):
+def rmtvfun(u, ctx):
     """evaluates the expression for the initial integral for a root find
 
     Args:
         u (float): Upper bound of integral
+        ctx (Context): The parameters of the problem
 
     Returns:
         float: The integrated value.
@@ -216,20 +264,22 @@ def rmtvfun(u):
     abserr = 1.0e-14
     relerr = 1.0e-12
     smallval = 1.0e-12
-    ans = quad(fun, zero, u, epsabs=abserr, epsrel=relerr)[0]
-    return log(1.0 - smallval) + (beta0 *\
-               (xif**(((2.0 * bval) - 1.0) / alpha)) * ans)
+    ans = quad(fun, zero, u, epsabs=abserr, epsrel=relerr, args=(ctx,))[0]
+    return log(1.0 - smallval) + (ctx.beta0 *\
+               (ctx.xif**(((2.0 * ctx.bval) - 1.0) / ctx.alpha)) * ans)
 
 
-def fun(y):
+def fun(y, ctx):
     """evaluates the integrand of the initial integral"""
+    aval, bval, amu = ctx.aval, ctx.bval, ctx.amu
     return ((1.0 - (2.0 * y)) / (amu - ((amu + 1.0)*y))) \
              * (y**(bval - 1.0)) \
              * ((1.0 - y)**(bval - aval))
 
 
-def derivs(t, y):
+def derivs(t, y, ctx):
     """evaluates the rhs of the system of odes """
+    aval, bval, _, beta0, xgeom, alpha, amu, kappa, sigma = ctx
     eps16 = 1.0e-16
     eps12 = 1.0e-12
     # some factors
@@ -63,11 +63,6 @@ By default, :py:mod:`exactpack.solvers.sedov` attempts to load
 linking errors, for example), it loads
 :py:mod:`exactpack.solvers.sedov.sedov`.
 
-NOTE: The values of density and specific internal energy produced by the
-Doebling solver at small values of radius, for the standard Sedov case,
-are not trustworthy. See the solver documentation
-(:py:mod:`exactpack.solvers.sedov.sedov`) for more detail.
-
 NOTE: Currently, the Kamm solver does not return the correct value of the
 physical variables at the shock location, for at least some cases. The
 development team recommends not using the Kamm solver until this is resolved.
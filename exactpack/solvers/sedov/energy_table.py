@@ -0,0 +1,133 @@
+r'''A persistent table of the Sedov energy integrals.
+
+The energy integrals :math:`J_1` and :math:`J_2` (``eval1`` and ``eval2`` in
+:class:`exactpack.solvers.sedov.sedov.Sedov`), and hence :math:`\alpha`,
+depend only on the geometry, :math:`\gamma` and :math:`\omega`. Evaluating
+them with adaptive quadrature dominates the cost of constructing a solver,
+which matters in parameter sweeps that construct thousands of solvers.
+
+:class:`EnergyIntegralTable` holds the logarithms of the integrals on a
+uniform grid in :math:`\log(\gamma - 1)` and :math:`\omega` for each geometry.
+Grid nodes are computed with quadrature the first time they are needed, and
+are kept in a persistent table (see :mod:`exactpack.cache`), so that later
+solvers only interpolate. The interpolation is a tensor-product Lagrange
+polynomial of degree 5, and it is only used if it agrees with the degree 3
+interpolant to a relative tolerance. Otherwise, for example across the
+transition between the standard and vacuum solutions, or outside of the grid,
+:meth:`EnergyIntegralTable.lookup` returns ``None`` and the solver falls back
+to quadrature.
+'''
+
+import os
+from threading import Lock
+
+import numpy as np
+
+from ...cache import cache_dir, lagrange_weights, save
+
+#: Version of the table file. It must be incremented whenever the grid or the
+#: computation of the integrals changes, so that stale files are ignored.
+VERSION = 1
+
+#: Grid spacing in :math:`\log(\gamma - 1)`.
+DU = 0.02
+#: Grid spacing in :math:`\omega`.
+DOMEGA = 0.02
+#: Range of :math:`\gamma` covered by the grid.
+GAMMA_MIN, GAMMA_MAX = 1.02, 6.0
+
+
+class EnergyIntegralTable(object):
+    r'''Lazily built, persistent table of the Sedov energy integrals.
+
+    :param compute: function of ``(geometry, gamma, omega)`` that returns the
+        energy integrals ``(eval1, eval2)`` by quadrature.
+    :param str path: the table file, by default ``sedov_energy_v<VERSION>.npz``
+        in :func:`exactpack.cache.cache_dir`.
+    :param float rtol: relative tolerance for accepting the interpolated
+        integrals.
+    '''
+
+    def __init__(self, compute, path=None, rtol=1.e-8):
+        self.compute = compute
+        self._path = path
+        self.rtol = rtol
+        self._nodes = None
+        self._lock = Lock()
+
+    @property
+    def path(self):
+        '''The table file, in the cache directory at the time it is read or
+        written if no path was given.'''
+        return self._path or os.path.join(cache_dir(),
+                                          'sedov_energy_v{}.npz'.format(VERSION))
+
+    def _load(self):
+        self._nodes = {}
+        try:
+            with np.load(self.path) as data:
+                for key, values in zip(data['keys'], data['values']):
+                    self._nodes[tuple(int(k) for k in key)] = tuple(values)
+        except (OSError, KeyError, ValueError):
+            pass
+
+    def save(self):
+        '''Write the computed grid nodes to the table file.'''
+
+        keys = np.array(sorted(self._nodes), dtype=int).reshape(-1, 3)
+        values = np.array([self._nodes[tuple(k)] for k in keys]).reshape(-1, 2)
+        save(self.path, keys=keys, values=values)
+
+    def _node(self, geometry, i, j):
+        key = (geometry, i, j)
+        if key not in self._nodes:
+            gamma = 1.0 + (GAMMA_MIN - 1.0) * np.exp(i * DU)
+            try:
+                with np.errstate(all='ignore'):
+                    eval1, eval2 = self.compute(geometry, gamma, j * DOMEGA)
+                values = np.log(eval1), np.log(eval2)
+            except (ValueError, ZeroDivisionError, FloatingPointError):
+                values = np.nan, np.nan
+            self._nodes[key] = values
+            self._modified = True
+        return self._nodes[key]
+
+    def lookup(self, geometry, gamma, omega):
+        '''Return the interpolated energy integrals ``(eval1, eval2)``, or
+        ``None`` if the point is outside of the grid or the interpolation does
+        not meet the tolerance.
+        '''
+
+        n = 6
+        ngamma = int(np.log((GAMMA_MAX - 1.0) / (GAMMA_MIN - 1.0)) / DU) + 1
+        nomega = int(np.ceil(geometry / DOMEGA))
+        if not (GAMMA_MIN <= gamma <= GAMMA_MAX and 0.0 <= omega < geometry):
+            return None
+        x = np.log((gamma - 1.0) / (GAMMA_MIN - 1.0)) / DU
+        y = omega / DOMEGA
+        i0 = min(max(int(x) - n // 2 + 1, 0), ngamma - n)
+        j0 = min(max(int(y) - n // 2 + 1, 0), nomega - n)
+        if j0 < 0:
+            return None
+
+        with self._lock:
+            if self._nodes is None:
+                self._load()
+            self._modified = False
+            values = np.array([[self._node(int(geometry), i0 + i, j0 + j)
+                                for j in range(n)] for i in range(n)])
+            if self._modified:
+                self.save()
+
+        wx, wy = lagrange_weights(x - i0, n), lagrange_weights(y - j0, n)
+        fine = np.einsum('i,ijk,j->k', wx, values, wy)
+        # the degree 3 interpolant on the central nodes of the stencil
+        i1 = min(max(int(x) - 1, i0), i0 + 2)
+        j1 = min(max(int(y) - 1, j0), j0 + 2)
+        wx, wy = lagrange_weights(x - i1, 4), lagrange_weights(y - j1, 4)
+        coarse = np.einsum('i,ijk,j->k', wx,
+                           values[i1 - i0:i1 - i0 + 4, j1 - j0:j1 - j0 + 4],
+                           wy)
+        if not np.all(np.abs(fine - coarse) <= self.rtol):
+            return None
+        return tuple(np.exp(fine))
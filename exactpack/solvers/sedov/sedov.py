@@ -1,33 +1,44 @@
 r'''A Python implementation of the Sedov solver in double precision.
 
 This is a pure Python implentation of the Timmes Sedov solver in ExactPack.
-It uses SciPy optimization to find values of v that minimize the
-error in lambda, and SciPy integration to evaluate the energy integrals.
+It inverts the similarity variable :math:`\lambda(v)` for all the requested
+points at once, by interpolating in a table of the Sedov functions that is
+refined to near machine precision where it is used, and uses SciPy
+integration to evaluate the energy integrals. The table depends only on the
+geometry, :math:`\gamma` and :math:`\omega`, so it is shared by all solvers
+with these values, and solutions at other times or blast energies are found
+by rescaling it. With the ``alpha_table`` parameter, the energy integrals
+are interpolated in the persistent table of
+:mod:`exactpack.solvers.sedov.energy_table` where it is accurate, which makes
+constructing many solvers in a parameter sweep cheap once the table holds the
+nodes around the parameters of the sweep. Computing the nodes costs much more
+than the quadrature of one solver, so the table is not used by default.
 
 This solver uses double precision (64 bit), while the Timmes and Kamm solvers
 use quad precision (128 bit).
-At small values of radius, the changes in the similarity variable become
-too small to track with double precision arithmetic. Therefore, the values of
-the physical variables are interpolated in that regime. The practical effect
-of this is that the density and specific internal energy values,
-for the Standard Sedov case at small
-radius, are less accurate in this solver than in the Kamm or Timmes solvers,
-and should not be trusted. It may be, however, that the impact of
-this solution inaccuracy on a global error norm is low, due to the magnitude
-of the solution at small radius being so much smaller than the magnitude of the
-solution at larger radius. An asymptotic solution for the Sedov functions
-at small values of radius may be able to mitigate this problem and should be
-developed.
+At small values of radius, v approaches its value at the origin, :math:`v_0`,
+and the changes in v become too small to track with double precision
+arithmetic. The inversion is therefore done for :math:`s = v - v_0`, which
+keeps its relative precision, and the factor of the Sedov functions that
+vanishes at the origin is computed from s. Below the values of
+:math:`\lambda` that are tabulated, the near-origin expansion
+:math:`\lambda \propto s^{\beta}` provides the starting values. The
+physical variables then follow their power laws down to the origin. The
+inversion can also be done in ``numpy.longdouble`` extended precision with
+the ``longdouble`` parameter.
 '''
 
 import sys
 import scipy.integrate as sci_int
-import scipy.optimize as sci_opt
-from scipy.interpolate import interp1d
 import math
+import warnings
+from collections import OrderedDict
+from threading import Lock
+
 import numpy as np
 
 from ...base import ExactSolver, ExactSolution, Jump, JumpCondition
+from .energy_table import EnergyIntegralTable
 
 
 class Sedov(ExactSolver):
@@ -44,6 +55,15 @@ class Sedov(ExactSolver):
                  :math:`\\rho \equiv \\rho_0 r^{-\omega}`',
         'eblast': 'total amount of energy deposited at the origin\
                   at time zero',
+        'longdouble': 'if True, invert the similarity variable in\
+                      numpy.longdouble extended precision',
+        'alpha_table': 'if True, interpolate the energy integrals in the\
+                       persistent table of\
+                       :mod:`exactpack.solvers.sedov.energy_table` where it\
+                       is accurate',
+        'rtol': 'relative tolerance of the Sedov functions interpolated in\
+                 the cached profile, by default 512 times the machine\
+                 epsilon of the working precision',
         }
 
     # Default parameter values
@@ -53,6 +73,15 @@ class Sedov(ExactSolver):
     rho0 = 1.0
     omega = 0.0
     eblast = 0.851072
+    longdouble = False
+    alpha_table = False
+    rtol = None
+
+    # Dimensionless profiles, shared by the solvers with the same geometry,
+    # gamma and omega, least recently used first
+    profile_cache_size = 32
+    _profile_cache = OrderedDict()
+    _profile_lock = Lock()
 
     def __init__(self, **kwargs):
 
@@ -72,6 +101,9 @@ class Sedov(ExactSolver):
         if self.eblast < 0:
             raise ValueError('eblast must be greater than 0')
 
+        if self.rtol is not None and not self.rtol > 0:
+            raise ValueError('rtol must be greater than 0')
+
         # Omega must be between 0 and geometry (see Kamm&Timmes)
         if self.omega < 0 or self.omega >= self.geometry:
             raise ValueError('omega must be between 0 and geometry')
@@ -168,15 +200,16 @@ class Sedov(ExactSolver):
             if self.solution_type == 'vacuum':
                 self.vmin = self.vv
 
-            # First energy integral
-
-            self.eval1 = sci_int.quad(self.efun01, self.vmin, self.v2,
-                                      epsabs=1e-12)[0]
-
-            # Second energy integral
+            # Look up the energy integrals in the persistent table, or
+            # evaluate them by quadrature
 
-            self.eval2 = sci_int.quad(self.efun02, self.vmin, self.v2,
-                                      epsabs=1e-12)[0]
+            integrals = None
+            if self.alpha_table:
+                integrals = _energy_table.lookup(self.geometry, self.gamma,
+                                                 self.omega)
+            if integrals is None:
+                integrals = self.energy_integrals()
+            self.eval1, self.eval2 = integrals
 
             # Compute alpha
 
@@ -186,7 +219,16 @@ class Sedov(ExactSolver):
                 self.alpha = (self.geometry - 1.0) * math.pi *\
                     (self.eval1 + 2.0 * self.eval2 / self.gamm1)
 
-    def _run(self, r, t, npts=101, vtol=1.e-14):
+    def _run(self, r, t, npts=None, vtol=None):
+
+        # npts and vtol set the initial grid and the tolerance of the scalar
+        # root finding of v, which the interpolated profile replaced
+        if npts is not None or vtol is not None:
+            warnings.warn('the npts and vtol arguments of Sedov._run are '
+                          'ignored, use the rtol parameter of Sedov instead',
+                          DeprecationWarning, stacklevel=2)
+
+        r = np.asarray(r, dtype=float)
 
         # There is no valid solution a t = 0
         if t <= 0:
@@ -201,27 +243,6 @@ class Sedov(ExactSolver):
                                         'velocity',
                                         'sound_speed'])
 
-        # Re-map the desired list of points r to a list of points linearly
-        # spaced between radius of 0.0 and max(r)
-
-        r_eval = np.linspace(0.0, max(r), npts)[-1::-1]
-
-        self.r_pnts = r_eval
-
-        # Initialize arrays for physical variables and Sedov functions
-
-        density = np.zeros(npts)
-        velocity = np.zeros(npts)
-        pressure = np.zeros(npts)
-
-        l_fun = np.zeros(npts)
-        dlamdv = np.zeros(npts)
-        f_fun = np.zeros(npts)
-        g_fun = np.zeros(npts)
-        h_fun = np.zeros(npts)
-
-        vwant = np.zeros(npts)
-
         # Shock-jump conditions at time t
 
         # shock position
@@ -259,147 +280,59 @@ class Sedov(ExactSolver):
             self.jumps.append(JumpCondition(location=self.rvv,
                                             description='Vacuum Boundary'))
 
-        # Loop over values of r_eval from highest to lowest
-        # and compute the sedov functions.
-        # When vwant stops changing, stop computing the sedov functions because
-        # the solution has become invalid. Then add a solution point at the
-        # origin. Then interpolate from r_eval back to r
-
-        vconverged = False
-        i = 0
-
-        while not vconverged and i < npts:
-
-            # index r_eval from largest to smallest value
-            rwant = r_eval[i]
-            # Compute physical solution at a single point (rwant,t)
-
-            # if r is inside the shock
-            if rwant <= self.r2:
-
-                # Transition region between standard and vacuum cases
-                # Kamm page 15 or equations 88-92
-                # lambda = l_fun is book's zeta
-                # f_fun is books V, g_fun is book's D, h_fun is book's P
-                if self.solution_type == 'singular':
-                    l_fun[i], dlamdv[i], f_fun[i], g_fun[i], h_fun[i] =\
-                        self.sedov_funcs_singular(rwant)
-
-                # for the vacuum case in the hole
-                elif self.solution_type == 'vacuum' and rwant < self.rvv:
-                    l_fun[i], dlamdv[i], f_fun[i], g_fun[i], h_fun[i] =\
-                        self.sedov_funcs_vacuum()
-
-                else:
-                    #  solve for vwant at lam_want using sed_lam_min
-
-                    self.lam_want = rwant/self.r2
-
-                    #    First, set the bounds for v
-
-                    if self.solution_type == 'standard':
-                        vmin = self.v0
-                        vmax = self.v2
-                    elif self.solution_type == 'vacuum':
-                        vmin = self.v2
-                        vmax = self.vv
-
-                    # Solve for initial guess of v_want at lam_want
-                    # using scipy fminbound
-
-                    vwant[i] = sci_opt.fminbound(
-                        self.sed_lam_min, vmin, vmax, xtol=1.e-30,
-                        maxfun=1000, disp=True)
-                    # print(vwant[i])
-
-                    # Compute Sedov functions at vwant
-                    l_fun[i], dlamdv[i], f_fun[i], g_fun[i], h_fun[i] =\
-                        self.sedov_funcs_standard(vwant[i])
-
-                    # check to see if vwant is converged to package precision
-                    if i > 0:
-                        if abs(vwant[i]-vwant[i-1]) < vtol:
-                            vconverged = True
-
-                # Compute physical variables from Sedov functions
-                density[i], velocity[i], pressure[i], _, _=\
-                    self.physical(f_fun[i], g_fun[i], h_fun[i])
-                
-                
-
-
-            # if outside the shock, solution is equal to inital conditions
-            else:
-                density[i] = self.rho0 * rwant**(-self.omega)
-                velocity[i] = 0.0
-                pressure[i] = 0.0
-
-            i += 1
-
-        # Truncate solution vectors according to how many evaluations were made
-        self.f_fun_list = f_fun[0:i-1]
-        self.h_fun_list = h_fun[0:i-1]
-        self.g_fun_list = g_fun[0:i-1]
-        self.l_fun_list = l_fun[0:i-1]
-        
-        
-
-        r_eval = r_eval[0:i-1]
-        
-        density = density[0:i-1]
-        velocity = velocity[0:i-1]
-        pressure = pressure[0:i-1]
+        # Evaluate the Sedov functions at lambda = r / r2 for all the points
+        # inside the shock at once.
+        # lambda = l_fun is book's zeta
+        # f_fun is books V, g_fun is book's D, h_fun is book's P
 
-        # Compute Sedov functions at origin
+        inside = r <= self.r2
+        lam = r[inside] / self.r2
+        vwant = np.full(len(lam), np.nan)
 
         if self.solution_type == 'singular':
-            l_funo, dlamdvo, f_funo, g_funo, h_funo =\
-                self.sedov_funcs_singular(rwant=0.0)
-        elif self.solution_type == 'vacuum':
-            l_funo, dlamdvo, f_funo, g_funo, h_funo =\
-                self.sedov_funcs_vacuum()
+            l_fun, dlamdv, f_fun, g_fun, h_fun = \
+                self.sedov_funcs_singular(r[inside])
         else:
-            self.lam_want = 0.  # the origin
-            vwanto = sci_opt.fminbound(self.sed_lam_min, vmin, vmax,
-                                      xtol=1.e-30, maxfun=1000, disp=True)
-            self.vwanto = vwanto
-            l_funo, dlamdvo, f_funo, g_funo, h_funo =\
-                self.sedov_funcs_standard(vwanto)
-
-        # Evaluate physical solution at origin point and append to result
-
-        deno, velo, preso, sieo, sso = self.physical(f_funo, g_funo, h_funo)
-        self.f_fun_list = np.append(self.f_fun_list, f_funo)
-        self.l_fun_list = np.append(self.l_fun_list, l_funo)
-        self.g_fun_list = np.append(self.g_fun_list, g_funo)
-        self.h_fun_list = np.append(self.h_fun_list, h_funo)
-        self.vlist = vwant[0:i-1]
-        self.vlist = np.append(self.vlist, vwanto)
-
-        
-        r_eval = np.append(r_eval, 0.)
-        
-        self.r_pnts = r_eval
-
-        
-        density = np.append(density, deno)
-        velocity = np.append(velocity, 0.0)
-        pressure = np.append(pressure, preso)
-
-        # interpolate from r_eval back to desired r list
-
-        interp = interp1d(r_eval, density)
-        density = interp(r)
-
-        interp = interp1d(r_eval, velocity)
-        velocity = interp(r)
-
-        interp = interp1d(r_eval, pressure)
-        pressure = interp(r)
-
-
-        specific_internal_energy = pressure / self.gamm1 / density
-        sound_speed = (self.gamma * pressure / density)**(1./2.)
+            l_fun, dlamdv, f_fun, g_fun, h_fun = \
+                [np.zeros(len(lam)) for i in range(5)]
+
+            # points that are not in the vacuum hole; the profile only
+            # depends on lambda, so it is interpolated in the cached table
+            # rather than solved for at each time
+            solve = lam >= self.rvv / self.r2
+            profile = self._profile
+            ds = profile.interpolate(lam[solve], self.rtol)
+            funcs = profile.funcs(ds)
+            vwant[solve] = profile.table[0] + ds
+            for fun, value in zip([l_fun, dlamdv, f_fun, g_fun, h_fun],
+                                  funcs):
+                fun[solve] = value
+
+        if self.solution_type == 'standard':
+            self.vwanto = self.v0
+
+        # Compute physical solution inside the shock
+        # Outside the shock, solution is equal to inital conditions
+
+        density = np.zeros(len(r))
+        density[~inside] = self.rho0 * r[~inside]**(-self.omega)
+        velocity = np.zeros(len(r))
+        pressure = np.zeros(len(r))
+        density[inside], velocity[inside], pressure[inside], _, _ = \
+            self.physical(f_fun, g_fun, h_fun)
+
+        # Store the Sedov functions at the points inside the shock
+
+        self.r_pnts = r[inside]
+        self.vlist = vwant
+        self.l_fun_list = l_fun
+        self.f_fun_list = f_fun
+        self.g_fun_list = g_fun
+        self.h_fun_list = h_fun
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            specific_internal_energy = pressure / self.gamm1 / density
+            sound_speed = (self.gamma * pressure / density)**(1./2.)
 
         return ExactSolution([r, density, pressure, specific_internal_energy,
                               velocity, sound_speed],
@@ -411,10 +344,38 @@ class Sedov(ExactSolver):
                                     'sound_speed'],
                              jumps=self.jumps)
 
-    def sedov_funcs_standard(self, v):
+    @property
+    def _profile(self):
+        r'''The :class:`_LambdaProfile` of this solver. It depends only on the
+        geometry, :math:`\gamma` and :math:`\omega`, so it is shared by all
+        solvers with the same values, at all times and blast energies. The
+        profiles of the last `profile_cache_size` solvers are kept.
+        '''
+        key = (self.geometry, self.gamma, self.omega, self.longdouble)
+        cache = self._profile_cache
+        with self._profile_lock:
+            profile = cache.pop(key, None)
+            if profile is None:
+                profile = _LambdaProfile(self)
+            cache[key] = profile
+            while len(cache) > max(self.profile_cache_size, 1):
+                cache.popitem(last=False)
+        return profile
+
+    @classmethod
+    def clear_profile_cache(cls):
+        '''Remove all cached profiles.'''
+        with cls._profile_lock:
+            cls._profile_cache.clear()
+
+    def sedov_funcs_standard(self, v, dv0=None):
 
         r''' Given similarity variable v, compute Sedov functions: f, g, h,
-             :math:`\lambda`, and :math:`\frac{d\lambda}{dv}`
+             :math:`\lambda`, and :math:`\frac{d\lambda}{dv}`. If given,
+             ``dv0`` is :math:`v - v_0`, from which the factor
+             :math:`c v - 1`, which vanishes at the origin, is computed
+             without cancellation. At the origin, where ``dv0`` is 0, the
+             functions are their limits.
         '''
 
         # Frequent combinations and their derivative with v
@@ -425,16 +386,25 @@ class Sedov(ExactSolver):
         dx1dv = self.a_val
 
         # o avoid singularity when c_val * v = 1.0:
-        cbag = max(1e-30, self.c_val * v - 1.0)
+        if dv0 is None:
+            cbag = np.maximum(1e-30, self.c_val * v - 1.0)
+        else:
+            cbag = self.c_val * dv0
         x2 = self.b_val * cbag
         dx2dv = self.b_val * self.c_val
 
+        # At the origin x2 vanishes, and the functions are evaluated with
+        # x2 = 1, then multiplied by the limits of their powers of x2 below
+        origin = np.equal(x2, 0)
+        if np.any(origin):
+            x2 = np.where(origin, 1, x2)
+
         ebag = 1.0 - self.e_val * v
         x3 = self.d_val * ebag
         dx3dv = -self.d_val * self.e_val
 
         x4 = self.b_val * (1.0 - 0.5 * self.xg2 * v)
-        x4 = max(x4, 1e-12)  # Weird math happens below if x4 is exactly zero
+        x4 = np.maximum(x4, 1e-12)  # Weird math happens below if x4 is exactly zero
         dx4dv = -self.b_val * 0.5 * self.xg2
 
         # Transition region between standard and vacuum cases
@@ -462,6 +432,7 @@ class Sedov(ExactSolver):
             g_fun = x1**(self.a0*self.omega) * x2**pp3 * x4**self.a5 *\
                 np.exp(-2.0*pp2)
             h_fun = x1**(self.a0*self.geometry) * x2**pp4 * x4**(1.0 + self.a5)
+            powers = pp1, pp3, pp4
 
         # omega = omega3 = xgeom*(2 - gamma) case, denom3 = 0
         # book expressions 23-25
@@ -480,6 +451,7 @@ class Sedov(ExactSolver):
             f_fun = x1 * l_fun
             g_fun = x1**(self.a0*self.omega) * x2**pp1 * x4**pp2 * np.exp(pp3)
             h_fun = x1**(self.a0*self.geometry) * x4**pp4 * np.exp(pp3)
+            powers = -self.a2, pp1, 0.0
 
           
 
@@ -495,17 +467,35 @@ class Sedov(ExactSolver):
                 x3**(self.a4 + self.a1 * self.omega) * x4**self.a5
             h_fun = x1**(self.a0*self.geometry) *\
                 x3**(self.a4+self.a1*(self.omega-2.0))*x4**(1.0 + self.a5)
-            myg =  (0.14581612994701457*(1. - 1.2*v)**2.7777777777777777*(-1. + 2.1*v)**0.5555555555555556)/(1. - 1.5*v)**3.3333333333333335
-            # print(g_fun, myg, v)
-        # print(g_fun, 'g', v)
-        # R = g_fun * 6
-        # self.l_fun_list = np.append(self.l_fun_list,l_fun)
-        # self.g_fun_list = np.append(self.g_fun_list,g_fun)
-        # self.v_list = np.append(self.v_list,v)
-        # self.vlist.append(v)
+            powers = -self.a2, self.a3 + self.a2 * self.omega, 0.0
+
+        if np.any(origin):
+            p_l, p_g, p_h = powers
+            dlamdv = np.where(origin, _origin_limit(p_l * dx2dv * l_fun,
+                                                    p_l - 1), dlamdv)
+            l_fun = np.where(origin, _origin_limit(l_fun, p_l), l_fun)
+            f_fun = np.where(origin, _origin_limit(f_fun, p_l), f_fun)
+            g_fun = np.where(origin, _origin_limit(g_fun, p_g), g_fun)
+            h_fun = np.where(origin, _origin_limit(h_fun, p_h), h_fun)
 
         return l_fun, dlamdv, f_fun, g_fun, h_fun
 
+    def energy_integrals(self, **kwargs):
+        r'''Evaluate the two Sedov energy integrals by quadrature. Keyword
+        arguments are passed to :func:`scipy.integrate.quad`.'''
+
+        kwargs.setdefault('epsabs', 1e-12)
+
+        # First energy integral
+
+        eval1 = sci_int.quad(self.efun01, self.vmin, self.v2, **kwargs)[0]
+
+        # Second energy integral
+
+        eval2 = sci_int.quad(self.efun02, self.vmin, self.v2, **kwargs)[0]
+
+        return eval1, eval2
+
     def efun01(self, v):
 
         r'Integrand for first Sedov energy integral'
@@ -525,30 +515,22 @@ class Sedov(ExactSolver):
 
         return dlamdv * l_fun**(self.geometry - 1.0) * h_fun * z
 
-    def sed_lam_min(self, v):
-
-        # Calculate the objective function (l_fun(v) - lam_want[i])**2
-
-        [l_fun, dlamdv, f_fun, g_fun, h_fun] = self.sedov_funcs_standard(v)
-
-        return (l_fun - self.lam_want)**2
-
     def physical(self, f_fun, g_fun, h_fun):
-        '''Returns physical variables from single values of Sedov functions'''
+        '''Returns physical variables from values of Sedov functions'''
 
         density = self.rho2 * g_fun
         velocity = self.u2 * f_fun
         pressure = self.p2 * h_fun
-        specific_internal_energy = 0.
-        sound_speed = 0.
 
         # Compute actual values for specific_internal_energy and
         # sound_speed only if density is greater than 0.
 
-        if (density > 0.):
-            specific_internal_energy = pressure /\
-                (self.gamm1 * density)
-            sound_speed = math.sqrt(self.gamma * pressure/density)
+        positive = density > 0.
+        safe_density = np.where(positive, density, 1.)
+        specific_internal_energy = np.where(
+            positive, pressure / (self.gamm1 * safe_density), 0.)
+        sound_speed = np.where(
+            positive, np.sqrt(np.abs(self.gamma * pressure / safe_density)), 0.)
 
         return density, velocity, pressure, specific_internal_energy,\
             sound_speed
@@ -570,3 +552,171 @@ class Sedov(ExactSolver):
         h_fun = 0.0
 
         return l_fun, dlamdv, f_fun, g_fun, h_fun
+
+
+def _origin_limit(value, power):
+    '''The limit of value times x to the power at x = 0.'''
+    if power > 0:
+        return 0 * value
+    if power < 0:
+        return np.copysign(np.inf, value)
+    return value
+
+
+class _LambdaProfile(object):
+    r'''The dimensionless profile of a Sedov solution, which depends only on
+    :math:`\lambda = r / r_2` for given geometry, :math:`\gamma` and
+    :math:`\omega`.
+
+    The profile is a table of :math:`\lambda`, :math:`s = v - v_{min}` and
+    :math:`\frac{d\lambda}{dv}`, sorted by increasing :math:`\lambda`,
+    where :math:`v_{min}` is :math:`v_0` at the origin, or :math:`v_2` at
+    the shock in the vacuum case. s keeps its relative precision at the
+    origin, where :math:`v \to v_0`. The initial grid is coarse, and
+    clustered geometrically towards both ends of the v-range, that is
+    towards the origin and the shock.
+
+    :meth:`interpolate` brackets each :math:`\lambda`, which is monotone in
+    v, in the table, and finds s by cubic Hermite interpolation of
+    :math:`\log s` in :math:`\log \lambda`. The table is refined lazily,
+    only in the intervals that are used: the Sedov functions at the
+    interpolated s are compared with their exact values at the midpoint of
+    the interval, and the interval is bisected until the relative error
+    meets the tolerance. The error estimate of each interval is kept, so
+    that the table is only refined further for a smaller tolerance.
+
+    :param solver: a :class:`Sedov` solver with the geometry,
+        :math:`\gamma` and :math:`\omega` of the profile.
+    '''
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.standard = solver.solution_type == 'standard'
+        dtype = np.longdouble if solver.longdouble else float
+        if self.standard:
+            vmin, vmax = solver.v0, solver.v2
+        else:
+            vmin, vmax = solver.v2, solver.vv
+        vmin, width = dtype(vmin), dtype(vmax) - dtype(vmin)
+        eps = np.finfo(dtype).eps
+        self.rtol = 512 * eps
+        s = np.geomspace(eps, dtype(0.5), 27)
+        s = np.unique(width * np.concatenate([s, 1 - s]))
+        l_fun, dlamdv = self.funcs(s, vmin)[:2]
+        order = np.argsort(l_fun, kind='stable')
+        l_fun, s, dlamdv = l_fun[order], s[order], dlamdv[order]
+        # drop points where lambda does not increase, which happens when
+        # the changes in lambda are below the precision
+        keep = np.concatenate([[True], np.diff(l_fun) > 0])
+        self.table = vmin, l_fun[keep], s[keep], dlamdv[keep]
+        # error estimates of the intervals, nan if they are not checked
+        self.error = np.full(np.count_nonzero(keep) - 1, np.nan)
+        self.lock = Lock()
+
+    def funcs(self, s, vmin=None):
+        '''The Sedov functions of :meth:`Sedov.sedov_funcs_standard` at
+        :math:`v = v_{min} + s`.'''
+        if vmin is None:
+            vmin = self.table[0]
+        if self.standard:
+            # c v - 1 vanishes at the origin, v = v0, so it is computed from
+            # s = v - v0
+            return self.solver.sedov_funcs_standard(vmin + s, dv0=s)
+        return self.solver.sedov_funcs_standard(vmin + s)
+
+    @staticmethod
+    def _hermite(y, y_tab, u_tab, dydu_tab, idx):
+        '''Cubic Hermite interpolation of u in the interval of the table
+        ending at idx.'''
+        h = y_tab[idx] - y_tab[idx - 1]
+        x = (y - y_tab[idx - 1]) / h
+        return (u_tab[idx - 1] * (1 + 2 * x) * (1 - x)**2 +
+                u_tab[idx] * x**2 * (3 - 2 * x) +
+                h * x * (1 - x)**2 / dydu_tab[idx - 1] -
+                h * x**2 * (1 - x) / dydu_tab[idx])
+
+    def _refine(self, intervals, rtol):
+        '''Estimate the error of the interpolation on the given intervals,
+        and bisect the ones where it does not meet the tolerance.'''
+        vmin, l_tab, s_tab, dlamdv_tab = self.table
+        u_tab = np.log(s_tab)
+        idx = intervals + 1
+        um = 0.5 * (u_tab[idx - 1] + u_tab[idx])
+        sm = np.exp(um)
+        exact = self.funcs(sm)
+        lm, dlamdvm = exact[:2]
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            uh = self._hermite(np.log(lm), np.log(l_tab), u_tab,
+                               dlamdv_tab * s_tab / l_tab, idx)
+            interpolated = self.funcs(np.exp(uh))
+            # relative error of f, g and h
+            error = np.max([np.abs(interpolated[i] / exact[i] - 1)
+                            for i in (2, 3, 4)], axis=0)
+        # intervals this short are only limited by rounding
+        short = u_tab[idx] - u_tab[idx - 1] < 1e-6
+        error[short] = 0
+        ok = error <= rtol
+        # the new nodes must keep lambda increasing
+        split = ~ok & (lm > l_tab[idx - 1]) & (lm < l_tab[idx])
+        error[~ok & ~split] = 0
+        self.error[intervals[~split]] = error[~split]
+        at = idx[split]
+        self.table = (vmin, np.insert(l_tab, at, lm[split]),
+                      np.insert(s_tab, at, sm[split]),
+                      np.insert(dlamdv_tab, at, dlamdvm[split]))
+        self.error[intervals[split]] = np.nan
+        self.error = np.insert(self.error, intervals[split], np.nan)
+
+    def interpolate(self, lam, rtol=None):
+        r'''Interpolate s for an array of :math:`\lambda` values, refining
+        the table where it is needed to meet the relative tolerance
+        ``rtol`` of the Sedov functions, by default 512 times the machine
+        epsilon of the table. Below the smallest :math:`\lambda` in
+        the table, s follows the leading term of the near-origin
+        expansion, :math:`\lambda \propto s^{\beta}`, with :math:`\beta`
+        taken from the end of the table. Values of :math:`\lambda` above
+        the table are clipped to its end.
+        '''
+        if rtol is None:
+            rtol = self.rtol
+        with self.lock:
+            vmin, l_tab, s_tab, dlamdv_tab = self.table
+            lam = np.asarray(lam, dtype=l_tab.dtype)
+            shape = lam.shape
+            lam = np.minimum(lam.ravel(), l_tab[-1])
+            below = lam < l_tab[0]
+            while True:
+                vmin, l_tab, s_tab, dlamdv_tab = self.table
+                idx = np.clip(np.searchsorted(l_tab, lam), 1, len(l_tab) - 1)
+                intervals = np.unique(idx[~below]) - 1
+                intervals = intervals[~(self.error[intervals] <= rtol)]
+                if len(intervals) == 0:
+                    break
+                self._refine(intervals, rtol)
+
+        y_tab, u_tab = np.log(l_tab), np.log(s_tab)
+        dydu_tab = dlamdv_tab * s_tab / l_tab
+        with np.errstate(divide='ignore', invalid='ignore'):
+            y = np.log(lam)
+            u = self._hermite(y, y_tab, u_tab, dydu_tab, idx)
+        u[below] = u_tab[0] + (y[below] - y_tab[0]) / dydu_tab[0]
+        with np.errstate(over='ignore'):
+            s = np.exp(u)
+        return s.reshape(shape)
+
+
+def _quadrature_integrals(geometry, gamma, omega):
+    '''Energy integrals by quadrature, for the nodes of the persistent table'''
+
+    solver = Sedov(geometry=geometry, gamma=gamma, omega=omega, rho0=1.0,
+                   eblast=1.0, longdouble=False, alpha_table=False, rtol=None)
+    if solver.solution_type == 'singular':
+        return solver.eval1, solver.eval2
+    # The nodes are computed once, so they are computed more accurately than
+    # the default quadrature.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', sci_int.IntegrationWarning)
+        return solver.energy_integrals(epsabs=1e-15, epsrel=1e-13, limit=500)
+
+
+_energy_table = EnergyIntegralTable(_quadrature_integrals)
@@ -15,11 +15,18 @@ class SuOlson(ExactSolver):
         'opac': r'constant opacity :math:`\kappa_0` in Eq. :eq:`cvkappaDef`',
         'alpha': r'coefficient :math:`\alpha` in Eq. :eq:`cvkappaDef` for \
          the specific heat (:math:`\alpha = 4 a`)',
+        'workers': 'number of threads used to evaluate the solution at the \
+         positions concurrently, or None to evaluate them serially',
+        'table': 'whether to interpolate the dimensionless solutions in a \
+         persistent table (see :mod:`exactpack.solvers.suolson.table`) \
+         where possible, rather than to compute them by quadrature',
         }
 
     alpha = 3.02636565993931701e-14 # alpha = 4 * a [erg/cm^3]
     trad_bc_ev = 1.0e3              # [ev]
     opac = 1.0                      # [cm^2/g]
+    workers = None
+    table = False
 
     def __init__(self, **kwargs):
         """Initialize the Su-Olson solver class.
@@ -33,7 +40,9 @@ class SuOlson(ExactSolver):
                                    x=r,
                                    trad_bc_ev=self.trad_bc_ev,
                                    opac=self.opac,
-                                   alpha=self.alpha)
+                                   alpha=self.alpha,
+                                   workers=self.workers,
+                                   table=self.table)
 
         return ExactSolution([r, trad_ev, tmat_ev],
                              names=['position',
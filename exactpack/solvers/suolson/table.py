@@ -0,0 +1,162 @@
+r'''A persistent table of the dimensionless Su-Olson solutions.
+
+The Su-Olson solution depends on position and time only through the
+dimensionless solutions :math:`u(x, \tau)` and :math:`v(x, \tau)` of
+:mod:`.timmes`, for a given :math:`\epsilon`. Evaluating them by quadrature
+is expensive, and runs at the same times keep evaluating the same integrals.
+
+:class:`SolutionTable` holds :math:`u` and :math:`v` for one
+:math:`\epsilon` on a grid uniform in :math:`\xi = x / \sqrt{\tau}` and in
+:math:`\log \tau`. Grid nodes are computed with the batched quadrature of
+:mod:`.batch` the first time they are needed, and are kept in a persistent
+table (see :mod:`exactpack.cache`), so that later evaluations only
+interpolate. The interpolation is a tensor-product Lagrange polynomial of
+degree 5, and it is only used where it agrees with the degree 3 interpolant
+to a relative tolerance, so that it is not used for the small values in the
+tail of the wave, where the absolute accuracy of the quadrature of the grid
+nodes is not enough. Elsewhere, in particular outside of the grid,
+:meth:`SolutionTable.lookup` returns NaN and the caller falls back to
+quadrature.
+'''
+
+import os
+from threading import Lock
+
+import numpy as np
+
+from ...cache import cache_dir, lagrange_weights, save
+from . import batch
+
+#: Version of the table files. It must be incremented whenever the grid or
+#: the computation of the solutions changes, so that stale files are ignored.
+VERSION = 1
+
+#: Grid spacing in :math:`\xi = x / \sqrt{\tau}`.
+DXI = 0.025
+#: Largest :math:`\xi` covered by the grid.
+XI_MAX = 20.0
+#: Grid spacing in :math:`\log \tau`.
+DLOGTAU = 0.05
+#: Range of :math:`\tau` covered by the grid.
+TAU_MIN, TAU_MAX = 1.0e-3, 1.0e2
+
+_tables = {}
+_tables_lock = Lock()
+
+
+def solution_table(epsilon):
+    r'''Return the :class:`SolutionTable` for :math:`\epsilon`, which is
+    shared by all callers in the process.'''
+
+    with _tables_lock:
+        if epsilon not in _tables:
+            _tables[epsilon] = SolutionTable(epsilon)
+        return _tables[epsilon]
+
+
+class SolutionTable(object):
+    r'''Lazily built, persistent table of the dimensionless Su-Olson
+    solutions for one :math:`\epsilon`.
+
+    :param float epsilon: the ratio :math:`\epsilon` of the problem.
+    :param str path: the table file, by default
+        ``suolson_v<VERSION>_<epsilon>.npz`` in :func:`exactpack.cache.cache_dir`.
+    :param float rtol: relative tolerance for accepting the interpolated
+        solutions.
+    '''
+
+    def __init__(self, epsilon, path=None, rtol=1.e-6):
+        self.epsilon = epsilon
+        self.path = path or os.path.join(
+            cache_dir(), 'suolson_v{}_{!r}.npz'.format(VERSION, epsilon))
+        self.rtol = rtol
+        self.nxi = int(round(XI_MAX / DXI)) + 1
+        self.ntau = int(round(np.log(TAU_MAX / TAU_MIN) / DLOGTAU)) + 1
+        self._rows = None
+        self._lock = Lock()
+
+    def _load(self):
+        self._rows = {}
+        try:
+            with np.load(self.path) as data:
+                if data['values'].shape[2:] == (self.nxi,):
+                    for key, values in zip(data['keys'], data['values']):
+                        self._rows[int(key)] = values
+        except (OSError, KeyError, ValueError, IndexError):
+            pass
+
+    def save(self):
+        '''Write the computed grid nodes to the table file.'''
+
+        keys = np.array(sorted(self._rows), dtype=int)
+        values = np.array([self._rows[k] for k in keys]).reshape(
+            -1, 2, self.nxi)
+        save(self.path, keys=keys, values=values)
+
+    def _row(self, i, columns):
+        '''Return row i of the grid, the values of u and v at the i-th tau,
+        after computing any of the given columns that are missing.'''
+
+        row = self._rows.get(i)
+        if row is None:
+            row = self._rows[i] = np.full((2, self.nxi), np.nan)
+        missing = columns[np.isnan(row[0, columns])]
+        if missing.size:
+            tau = TAU_MIN * np.exp(i * DLOGTAU)
+            posx = missing * DXI * np.sqrt(tau)
+            u = batch.usolution(posx, tau, self.epsilon)
+            row[0, missing] = u
+            row[1, missing] = batch.vsolution(posx, tau, self.epsilon, u)
+            self._modified = True
+        return row
+
+    def lookup(self, posx, tau):
+        '''Return the interpolated solutions ``(u, v)`` at the positions
+        posx and time tau, with NaN where a position is outside of the grid
+        or the interpolation does not meet the tolerance.
+        '''
+
+        n = 6
+        shape = np.shape(posx)
+        posx = np.ravel(posx).astype(float)
+        u = np.full(posx.shape, np.nan)
+        v = np.full(posx.shape, np.nan)
+        xi = posx / np.sqrt(tau) if tau > 0 else np.nan * posx
+        inside = np.flatnonzero((0.0 <= xi) & (xi <= XI_MAX))
+        if not (TAU_MIN <= tau <= TAU_MAX and inside.size):
+            return u.reshape(shape), v.reshape(shape)
+        x = np.log(tau / TAU_MIN) / DLOGTAU
+        y = xi[inside] / DXI
+        i0 = min(max(int(x) - n // 2 + 1, 0), self.ntau - n)
+        j0 = np.clip(y.astype(int) - n // 2 + 1, 0, self.nxi - n)
+        stencil = j0[:, np.newaxis] + np.arange(n)
+        columns = np.unique(stencil)
+
+        with self._lock:
+            if self._rows is None:
+                self._load()
+            self._modified = False
+            rows = [self._row(i0 + i, columns) for i in range(n)]
+            # values[i, k, m, l] is u (k = 0) or v (k = 1) at row i0 + i
+            # and column stencil[m, l]
+            values = np.array([row[:, stencil] for row in rows])
+            if self._modified:
+                self.save()
+
+        wx = lagrange_weights(x - i0, n)
+        wy = lagrange_weights(y - j0, n)
+        fine = np.einsum('i,ikml,ml->km', wx, values, wy)
+        # the degree 3 interpolant on the central nodes of the stencil
+        i1 = min(max(int(x) - 1, i0), i0 + 2)
+        j1 = np.clip(y.astype(int) - 1, j0, j0 + 2)
+        wx = lagrange_weights(x - i1, 4)
+        wy = lagrange_weights(y - j1, 4)
+        central = values[i1 - i0:i1 - i0 + 4][
+            :, :, np.arange(y.size)[:, np.newaxis],
+            (j1 - j0)[:, np.newaxis] + np.arange(4)]
+        coarse = np.einsum('i,ikml,ml->km', wx, central, wy)
+        ok = np.all(np.abs(fine - coarse) <= self.rtol * np.abs(fine), axis=0)
+        u[inside[ok]] = fine[0, ok]
+        v[inside[ok]] = fine[1, ok]
+        return u.reshape(shape), v.reshape(shape)
+
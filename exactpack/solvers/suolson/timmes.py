@@ -6,19 +6,26 @@ This code is released under LA-CC-05-101.
 """
 
 import numpy as np
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from math import sqrt, sin, acos, exp, pi
 from scipy.integrate import quad
 from scipy.optimize import brentq
 
+from . import batch
+from .table import solution_table
 
-# common block variables
-posx = None
-tau = None
-epsilon = None
-jwant = None
 
+#: The parameters shared by the integrands and root functions of one
+#: evaluation, which were held in a common block in the Fortran code:
+#: the dimensionless position, time and epsilon.
+Context = namedtuple('Context', ['posx', 'tau', 'epsilon'])
 
-def suolson(t, x, trad_bc_ev, opac, alpha):
+#: Number of positions evaluated together by :func:`suolson`.
+CHUNK = 256
+
+
+def suolson(t, x, trad_bc_ev, opac, alpha, workers=None, table=False):
     """Compute the solution to the Su-Olson problem over an array of x-values.
 
     Args:
@@ -27,6 +34,14 @@ def suolson(t, x, trad_bc_ev, opac, alpha):
         trad_bc_ev (float): boundary condition temperature in electron volts
         opac (float): the opacity in cm**2/g
         alpha (float): coefficient of the material equation of state c_v = alpha T_mat**3
+        workers (int): If given, the positions are evaluated concurrently by
+            a pool of this many threads. The results are identical to those
+            of the serial evaluation.
+        table (bool): Whether to interpolate the dimensionless solutions in
+            the persistent table of :mod:`.table`, where possible.
+
+    The positions are evaluated in chunks of :data:`CHUNK` with the batched
+    quadrature of :mod:`.batch`.
 
     Returns:
         tuple: A 2-tuple containing:
@@ -43,25 +58,38 @@ def suolson(t, x, trad_bc_ev, opac, alpha):
         tmat_ev[:] = np.nan
 
     else:
-        for i in range(nstep):
-            zpos = x[i]
-            _, _, trad_ev_out, _, tmat_ev_out = so_wave(t, zpos, trad_bc_ev,
-                                                        opac, alpha)
-            trad_ev[i] = trad_ev_out
-            tmat_ev[i] = tmat_ev_out
+        def wave(zpos):
+            return so_wave(t, zpos, trad_bc_ev, opac, alpha, table)
+
+        chunks = [np.asarray(x[i:i + CHUNK], dtype=float)
+                  for i in range(0, nstep, CHUNK)]
+        if workers is None:
+            waves = map(wave, chunks)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                waves = list(executor.map(wave, chunks))
+        for i, (_, _, trad_ev_out, _, tmat_ev_out) in zip(
+                range(0, nstep, CHUNK), waves):
+            trad_ev[i:i + CHUNK] = trad_ev_out
+            tmat_ev[i:i + CHUNK] = tmat_ev_out
 
     return trad_ev, tmat_ev
 
 
-def so_wave(time, zpos, trad_bc_ev, opac, alpha):
+def so_wave(time, zpos, trad_bc_ev, opac, alpha, table=False):
     """Provides solution to the Su-Olson problem.
     
     Args:
         time (float): time point where solution is desired
-        zpos (float): spatial point where solution is desired
+        zpos (float): spatial point where solution is desired, or an array
+            of points, which are evaluated with the batched quadrature of
+            :mod:`.batch`
         trad_bc_ev (float): boundary condition temperature in electron volts
         opac (float): the opacity in cm**2/g
         alpha (float): coefficient of the material equation of state c_v = alpha T_mat**3
+        table (bool): Whether to interpolate the dimensionless solutions in
+            the persistent table of :mod:`.table`. Quadrature is used where
+            the table does not answer.
 
     Returns:
         tuple: A 5-tuple containing the following:
@@ -88,8 +116,22 @@ def so_wave(time, zpos, trad_bc_ev, opac, alpha):
     epsilon = a4 * ialpha
     
     # get the dimensionless solutions
-    uans = usolution(xpos, tau, epsilon)
-    vans = vsolution(xpos, tau, epsilon, uans)
+    if table:
+        uans, vans = solution_table(epsilon).lookup(xpos, tau)
+    else:
+        uans, vans = np.full((2,) + np.shape(xpos), np.nan)
+    if np.ndim(zpos) == 0:
+        if np.isnan(uans):
+            uans = usolution(xpos, tau, epsilon)
+            vans = vsolution(xpos, tau, epsilon, uans)
+        else:
+            uans, vans = float(uans), float(vans)
+    else:
+        missing = np.isnan(uans)
+        if np.any(missing):
+            uans[missing] = batch.usolution(xpos[missing], tau, epsilon)
+            vans[missing] = batch.vsolution(xpos[missing], tau, epsilon,
+                                            uans[missing])
 
     # compute the physical solution
     erad = uans * ener_in
@@ -119,29 +161,22 @@ def usolution(posx_in, tau_in, epsilon_in):
     rt3 = 1.7320508075688772
     rt3opi = rt3/pi
 
-    # transfer input to common block
-    global posx
-    global tau
-    global epsilon
-    global jwant 
-    posx = posx_in
-    tau = tau_in
-    epsilon = epsilon_in
+    ctx = Context(posx_in, tau_in, epsilon_in)
 
     # integrand may not oscillate for small values of posx
     eta_lo = 0.0
     eta_hi = 1.0
     sum1 = 0.0
-    jwant = 1
-    bracket = (gamma_one_root(eta_lo) * gamma_one_root(eta_hi)) <= 0.0
+    bracket = (gamma_one_root(eta_lo, ctx, 1)
+               * gamma_one_root(eta_hi, ctx, 1)) <= 0.0
     if not bracket:
-        sum1 = quad(upart1, eta_lo, eta_hi, epsabs=eps)[0]
+        sum1 = quad(upart1, eta_lo, eta_hi, epsabs=eps, args=(ctx,))[0]
     # integrate over each oscillitory piece
     else:
         for i in range(100):
-            jwant = i + 1
-            eta_int = brentq(gamma_one_root, eta_lo, eta_hi, xtol=tol, maxiter=100)
-            xi1 = quad(upart1, eta_lo, eta_int, epsabs=eps)[0]
+            eta_int = brentq(gamma_one_root, eta_lo, eta_hi, xtol=tol,
+                             maxiter=100, args=(ctx, i + 1))
+            xi1 = quad(upart1, eta_lo, eta_int, epsabs=eps, args=(ctx,))[0]
             sum1  = sum1 + xi1
             eta_lo = eta_int
             if abs(xi1) <= eps2:
@@ -151,22 +186,22 @@ def usolution(posx_in, tau_in, epsilon_in):
     eta_lo = 0.0
     eta_hi = 1.0
     sum2 = 0.0
-    jwant = 1
-    bracket = (gamma_two_root(eta_lo) * gamma_two_root(eta_hi)) <= 0.0
+    bracket = (gamma_two_root(eta_lo, ctx, 1)
+               * gamma_two_root(eta_hi, ctx, 1)) <= 0.0
     if not bracket:
-        sum2 = quad(upart2, eta_lo, eta_hi, epsabs=eps)[0]
+        sum2 = quad(upart2, eta_lo, eta_hi, epsabs=eps, args=(ctx,))[0]
     # Use eta_int to avoid integrating singularity
     else:
         for i in range(100):
-            jwant = i + 1
-            eta_int = brentq(gamma_two_root, eta_lo, eta_hi, xtol=tol, maxiter=100)
-            xi2 = quad(upart2, eta_int, eta_hi, epsabs=eps)[0]
+            eta_int = brentq(gamma_two_root, eta_lo, eta_hi, xtol=tol,
+                             maxiter=100, args=(ctx, i + 1))
+            xi2 = quad(upart2, eta_int, eta_hi, epsabs=eps, args=(ctx,))[0]
             sum2  = sum2 + xi2
             eta_hi = eta_int
             if abs(xi2) <= eps2:
                 break
 
-    return 1.0 - 2.0 * rt3opi * sum1 - rt3opi * exp(-tau) * sum2
+    return 1.0 - 2.0 * rt3opi * sum1 - rt3opi * exp(-tau_in) * sum2
 
 
 def vsolution(posx_in, tau_in, epsilon_in, uans):
@@ -187,29 +222,22 @@ def vsolution(posx_in, tau_in, epsilon_in, uans):
     rt3 = 1.7320508075688772
     rt3opi = rt3/pi
 
-    # transfer input to common block
-    global posx
-    global tau
-    global epsilon
-    global jwant 
-    posx = posx_in
-    tau = tau_in
-    epsilon = epsilon_in
+    ctx = Context(posx_in, tau_in, epsilon_in)
 
     # integrand may not oscillate for small values of posx
     eta_lo = 0.0
     eta_hi = 1.0
     sum1 = 0.0
-    jwant = 1
-    bracket = gamma_three_root(eta_lo) * gamma_three_root(eta_hi) <= 0.0
+    bracket = gamma_three_root(eta_lo, ctx, 1) \
+        * gamma_three_root(eta_hi, ctx, 1) <= 0.0
     if not bracket:
-        sum1 = quad(vpart1, eta_lo, eta_hi, epsabs=eps)[0]
+        sum1 = quad(vpart1, eta_lo, eta_hi, epsabs=eps, args=(ctx,))[0]
     # integrate over each oscillitory piece
     else:
         for i in range(100):
-            jwant = i + 1
-            eta_int = brentq(gamma_three_root, eta_lo, eta_hi, xtol=tol, maxiter=100)
-            xi1 = quad(vpart1, eta_int, eta_hi, epsabs=eps)[0]
+            eta_int = brentq(gamma_three_root, eta_lo, eta_hi, xtol=tol,
+                             maxiter=100, args=(ctx, i + 1))
+            xi1 = quad(vpart1, eta_int, eta_hi, epsabs=eps, args=(ctx,))[0]
             sum1 = sum1 + xi1
             eta_hi = eta_int
             if abs(xi1) <= eps2:
@@ -219,26 +247,27 @@ def vsolution(posx_in, tau_in, epsilon_in, uans):
     eta_lo = 0.0
     eta_hi = 1.0
     sum2 = 0.0
-    jwant = 1
-    bracket = gamma_two_root(eta_lo) * gamma_two_root(eta_hi) <= 0.0
+    bracket = gamma_two_root(eta_lo, ctx, 1) \
+        * gamma_two_root(eta_hi, ctx, 1) <= 0.0
     if not bracket:
-        sum2 = quad(vpart2, eta_lo, eta_hi, epsabs=eps)[0]
+        sum2 = quad(vpart2, eta_lo, eta_hi, epsabs=eps, args=(ctx,))[0]
     # integrate over each oscillitory piece
     else:
         for i in range(100):
-            jwant = i + 1
-            eta_int = brentq(gamma_two_root, eta_lo, eta_hi, xtol=tol, maxiter=100)
-            xi2 = quad(vpart2, eta_int, eta_hi, epsabs=eps)[0]
+            eta_int = brentq(gamma_two_root, eta_lo, eta_hi, xtol=tol,
+                             maxiter=100, args=(ctx, i + 1))
+            xi2 = quad(vpart2, eta_int, eta_hi, epsabs=eps, args=(ctx,))[0]
             sum2 = sum2 + xi2
             eta_hi = eta_int
             if abs(xi2) <= eps2:
                 break
 
-    return uans - 2.0 * rt3opi * sum1 + rt3opi * exp(-tau) * sum2
+    return uans - 2.0 * rt3opi * sum1 + rt3opi * exp(-tau_in) * sum2
 
 
-def upart1(eta):
+def upart1(eta, ctx):
     """equation 36 of su & olson jqsrt 1996, first integrand"""
+    posx, tau, epsilon = ctx
     tiny = 1.0e-14
     numer = sin(posx * gamma_one(eta, epsilon) + theta_one(eta, epsilon))
 
@@ -248,8 +277,9 @@ def upart1(eta):
     return exp(-tau * eta * eta) * numer / denom
 
 
-def upart2(eta):
+def upart2(eta, ctx):
     """equation 36 of su & olson jqsrt 1996, second integrand"""
+    posx, tau, epsilon = ctx
     tiny = 1.0e-14
     numer = sin(posx * gamma_two(eta, epsilon) + theta_two(eta, epsilon))
 
@@ -260,8 +290,9 @@ def upart2(eta):
     return exp(-tau / (max(tiny, eta * epsilon))) * numer / denom
 
 
-def vpart1(eta):
+def vpart1(eta, ctx):
     """equation 42 of su & olson jqsrt 1996, first integrand"""
+    posx, tau, epsilon = ctx
     tiny = 1.0e-14
     eta2 = eta * eta
 
@@ -273,8 +304,9 @@ def vpart1(eta):
     return exp(-tau * (1.0 - eta2)) * numer / denom
 
 
-def vpart2(eta):
+def vpart2(eta, ctx):
     """equation 42 of su & olson jqsrt 1996, second integrand"""
+    posx, tau, epsilon = ctx
     tiny = 1.0e-14
 
     numer = sin(posx * gamma_two(eta, epsilon) + theta_two(eta, epsilon))
@@ -285,24 +317,30 @@ def vpart2(eta):
     return exp(-tau / (max(tiny, eta * epsilon))) * numer / denom
 
 
-def gamma_one_root(eta_in):
-    """used by a root finder to determine the integration inveral"""
+def gamma_one_root(eta_in, ctx, jwant):
+    """used by a root finder to determine the integration inveral for the
+    jwant-th oscillation"""
+    posx, _, epsilon = ctx
     root = gamma_one(eta_in, epsilon) * posx
     root += theta_one(eta_in, epsilon)
     root -= jwant * pi * 2
     return root
 
 
-def gamma_two_root(eta_in):
-    """used by a root finder to determine the integration inveral"""
+def gamma_two_root(eta_in, ctx, jwant):
+    """used by a root finder to determine the integration inveral for the
+    jwant-th oscillation"""
+    posx, _, epsilon = ctx
     root = gamma_two(eta_in, epsilon) * posx
     root += theta_two(eta_in, epsilon)
     root -= jwant * pi * 2
     return root
 
 
-def gamma_three_root(eta_in):
-    """used by a root finder to determine the integration inveral"""
+def gamma_three_root(eta_in, ctx, jwant):
+    """used by a root finder to determine the integration inveral for the
+    jwant-th oscillation"""
+    posx, _, epsilon = ctx
     root = gamma_three(eta_in, epsilon) * posx
     root += theta_three(eta_in, epsilon)
     root -= jwant * pi * 2
@@ -0,0 +1,38 @@
+"""Unittests for the ExactPack base classes.
+"""
+
+import pytest
+
+from exactpack.base import ExactSolver, ExactSolution, print_when_verbose
+
+
+class Printing(ExactSolver):
+    """A solver that prints while it runs."""
+
+    parameters = {}
+
+    @print_when_verbose
+    def _run(self, r, t):
+        print('running at t =', t)
+        return ExactSolution([r, r / (1.0 / t)],
+                             names=['position', 'density'])
+
+
+class TestPrintWhenVerbose():
+    """Tests the :func:`exactpack.base.print_when_verbose` decorator."""
+
+    def test_quiet(self, capsys):
+        solution = Printing()([0.0, 1.0], 2.0)
+        assert capsys.readouterr().out == ''
+        assert list(solution['density']) == [0.0, 2.0]
+
+    def test_verbose(self, capsys):
+        Printing(verbose=True)([0.0, 1.0], 2.0)
+        assert capsys.readouterr().out == 'running at t = 2.0\n'
+
+    def test_restored(self, capsys):
+        """The standard output is restored when the solver fails."""
+        with pytest.raises(ZeroDivisionError):
+            Printing()([0.0, 1.0], 0.0)
+        print('after')
+        assert capsys.readouterr().out == 'after\n'
@@ -1,12 +1,17 @@
 """Unit tests for the Guderley solver.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 import numpy
 
+import exactpack.solvers.guderley.eexp as eexp_module
+from exactpack.solvers.guderley import eigenvalue_table, ramsey
 from exactpack.solvers.guderley.eexp import eexp
-from exactpack.solvers.guderley.ramsey import get_shock_position
+from exactpack.solvers.guderley.ramsey import eigenvalues, get_shock_position
+from exactpack.solvers.guderley.ramsey import guderley_1d, state
 from exactpack.solvers.guderley.guderley import Guderley
 
 
@@ -14,15 +19,14 @@ class TestGuderleyLambda():
     """Test the calculation of the Lambda value by the eexp routine.
     Results taken from [Guderley2012]_
     """
-    # gamma = 5/3 case not tested as it takes several minutes to run. 
     test_data = [
         (2, 1.4, 0.835323192),
-        # (2, 5.0/3.0, 0.815624901),
+        (2, 5.0/3.0, 0.815624901),
         (2, 2.0, 0.800112351),
         (2, 3.0, 0.775666619),
         (2, 6.0, 0.751561684),
         (3, 1.4, 0.717174501),
-        # (3, 5.0/3.0, 0.688376823),
+        (3, 5.0/3.0, 0.688376823),
         (3, 2.0, 0.667046070),
         (3, 3.0, 0.636410594),
         (3, 6.0, 0.610339148),
@@ -58,6 +62,62 @@ class TestGuderleyShockPosition():
         assert B == pytest.approx(posn, rel=5.0e-5)
 
 
+class TestGuderleyEigenvalues():
+    """Tests the table of lambda and B, and the cache of
+    :func:`exactpack.solvers.guderley.ramsey.eigenvalues`.
+    """
+
+    def test_table(self):
+        """The tabulated values are those that are computed."""
+        lambda_, B = eigenvalue_table.lookup(3, 3.0)
+        assert eexp(3, 3.0) == pytest.approx(lambda_, rel=1.0e-12)
+        assert get_shock_position(3, 3.0, lambda_) == \
+            pytest.approx(B, rel=1.0e-12)
+
+    def test_lookup(self, monkeypatch):
+        """Values in the table are not computed."""
+        eigenvalues.cache_clear()
+
+        def fail(*args):
+            raise AssertionError('computed a tabulated value')
+
+        monkeypatch.setattr(ramsey, 'eexp', fail)
+        monkeypatch.setattr(ramsey, 'get_shock_position', fail)
+        assert eigenvalues(2, 5.0/3.0) == eigenvalue_table.lookup(2, 5.0/3.0)
+        assert 1.0 / eigenvalues(3, 1.4)[0] == pytest.approx(0.717174501)
+
+    def test_outside(self):
+        assert eigenvalue_table.lookup(1, 1.4) is None
+        assert eigenvalue_table.lookup(3, 1.45) is None
+        assert eigenvalue_table.brackets(3, 10.0) == (None, None)
+        assert eigenvalue_table.brackets(1, 1.4) == (None, None)
+
+    def test_seeded(self, monkeypatch):
+        """Values between the table entries are found from brackets
+        interpolated in the table, with fewer iterations, and are cached.
+        """
+        eigenvalues.cache_clear()
+        calls = []
+        cdiff = eexp_module.Cdiff
+
+        def counted(*args):
+            calls.append(args)
+            return cdiff(*args)
+
+        monkeypatch.setattr(eexp_module, 'Cdiff', counted)
+        lambda_ = eexp(2, 2.5)
+        B = get_shock_position(2, 2.5, lambda_)
+        ncalls = len(calls)
+        del calls[:]
+        seeded = eigenvalues(2, 2.5)
+        assert len(calls) < ncalls
+        assert seeded[0] == pytest.approx(lambda_, rel=1.0e-9)
+        assert seeded[1] == pytest.approx(B, rel=1.0e-7)
+        del calls[:]
+        assert eigenvalues(2, 2.5) == seeded
+        assert len(calls) == 0
+
+
 class TestGuderleyRamseyGamma3():
     """Tests for the Guderley problem 
     :class:`exactpack.solvers.guderley.ramsey.Guderley`.
@@ -85,3 +145,59 @@ class TestGuderleyRamseyGamma3():
         """Regression test for specific internal energy."""
         assert self.solution.specific_internal_energy[0] == \
             pytest.approx(0.050627305536782685)
+
+
+class TestGuderleySampling():
+    """Tests that sampling a single integration of the similarity ODEs at
+    all the points agrees with integrating to each point.
+    """
+
+    @pytest.mark.parametrize("t", [0.5, 0.9])
+    def test_sampling(self, t):
+        r = numpy.linspace(0.1, 1.5, 41)
+        lambda_, B = eigenvalues(3, 3.0)
+        targetx = (t / 0.750024322 - 1.0) / r**lambda_
+        if t < 0.75:
+            # unshocked, and behind the converging shock
+            assert numpy.any(targetx < -1.0) and numpy.any(targetx > -1.0)
+        else:
+            # ahead of, and behind the reflected shock
+            assert numpy.any(targetx < B) and numpy.any(targetx > B)
+        solution = guderley_1d(t, r, 3, 3.0, 1.0)
+        for i in range(0, len(r), 4):
+            expected = state(r[i], 1.0, 3, 3.0, lambda_, B, targetx[i])
+            for computed, value in zip(solution, expected):
+                assert computed[i] == pytest.approx(value, rel=1.0e-7,
+                                                    abs=1.0e-12)
+
+
+class TestGuderleyThreads():
+    """Tests that evaluations with different parameters can run concurrently
+    in one process, and give bit for bit the results of serial evaluation.
+    """
+
+    cases = [(2, 1.4), (3, 1.4), (2, 3.0), (3, 3.0), (3, 6.0)]
+
+    @staticmethod
+    def evaluate(case):
+        n, gamma = case
+        lambda_, B = eigenvalues(n, gamma)
+        r = numpy.linspace(0.1, 1.5, 21)
+        targetx = 0.2 / r**lambda_
+        return (ramsey.Guderley(1.001 * B, n, gamma, lambda_),) \
+            + state(r, 1.0, n, gamma, lambda_, B, targetx)
+
+    def test_concurrent(self):
+        serial = [self.evaluate(case) for case in self.cases]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent = list(executor.map(self.evaluate, 4 * self.cases))
+        for i, result in enumerate(concurrent):
+            for computed, expected in zip(result, serial[i % len(self.cases)]):
+                numpy.testing.assert_array_equal(computed, expected)
+
+    def test_concurrent_eexp(self):
+        cases = [(2, 2.2), (3, 2.2), (3, 1.8)]
+        serial = [eexp(*case) for case in cases]
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            concurrent = list(executor.map(lambda case: eexp(*case), cases))
+        assert concurrent == serial
@@ -2,6 +2,9 @@ r"""Unit tests for the heat conduction solvers.
 """
 
 import numpy as np
+from scipy import special as sp
+from scipy.integrate import quad
+from scipy.optimize import brentq
 
 import pytest
 
@@ -12,6 +15,9 @@ from exactpack.solvers.heat import PlanarSandwichHalf
 from exactpack.solvers.heat import CylindricalSandwich
 from exactpack.solvers.heat import Hutchens1
 from exactpack.solvers.heat import Hutchens2
+from exactpack.solvers.heat import Rectangle
+from exactpack.solvers.heat.rod1d import mode_sum, robin_roots, tail_bound
+from exactpack.solvers.heat.cylindrical_sandwich import annulus_roots, annulus_moments
 
 
 class TestHeatCylindricalSandwich():
@@ -108,6 +114,80 @@ class TestHeatCylindricalSandwich():
                 # Anm = solver.Anm_int(a, b, k, m, alphanm, betanm)  # error
 
 
+class TestHeatCylindricalSandwichModes():
+    r"""Tests the cache of the modes of
+    :class:`exactpack.solvers.heat.cylindrical_sandwich.CylindricalSandwich`."""
+
+    r = np.array([0.3, 0.5, 0.7])
+    theta = np.array([0.2, 0.7, 1.2])
+
+    def test_regression(self):
+        r"""Regression test, against the sums over the modes in loops."""
+        soln = CylindricalSandwich(Nsum=3, Msum=4)([self.r, self.theta], 0.01)
+        np.testing.assert_allclose(soln.temperature,
+                                   [0.12161089027012081, 0.33973014187888473,
+                                    0.5575388652131569], rtol=1.e-12)
+
+    def test_cache(self, monkeypatch):
+        r"""The modes are only computed again if the parameters change."""
+        solver = CylindricalSandwich(Nsum=3, Msum=4)
+        first = solver([self.r, self.theta], 0.01)
+        modes = solver.modes()
+        monkeypatch.setattr(CylindricalSandwich, 'alpha', None)
+        second = solver([self.r, self.theta], 0.01)
+        assert solver.modes() is modes
+        np.testing.assert_array_equal(first.temperature, second.temperature)
+        monkeypatch.undo()
+        solver.Msum = 5
+        assert solver.modes()[0].shape == (3, 5)
+
+    def test_table(self, tmp_path, monkeypatch):
+        r"""The modes are read back from the persistent table."""
+        monkeypatch.setenv('EXACTPACK_CACHE_DIR', str(tmp_path))
+        first = CylindricalSandwich(Nsum=3, Msum=4, table=True)([self.r, self.theta], 0.01)
+        assert len(list(tmp_path.iterdir())) == 1
+        monkeypatch.setattr(CylindricalSandwich, 'alpha', None)
+        second = CylindricalSandwich(Nsum=3, Msum=4, table=True)([self.r, self.theta], 0.01)
+        np.testing.assert_array_equal(first.temperature, second.temperature)
+
+    @pytest.mark.parametrize('a, b', [(0.25, 0.85), (0.05, 1.0), (0.6, 0.7)])
+    def test_roots(self, a, b):
+        r"""The roots are those of the cross product, bracketed on a fine grid,
+        with none skipped."""
+        k = np.array([2, 8, 30])
+        roots = annulus_roots(k, a, b, 150)
+        for n in range(k.size):
+            x = np.linspace(roots[n, 0] / 2, roots[n, -1] + 0.01, 20001)
+            F = CylindricalSandwich.bc_solve(x, k[n], a, b)
+            brackets = np.flatnonzero(F[:-1] * F[1:] < 0)
+            expected = [brentq(CylindricalSandwich.bc_solve, x[i], x[i + 1],
+                               args=(k[n], a, b), xtol=1.e-14) for i in brackets]
+            np.testing.assert_allclose(roots[n], expected[:150], rtol=1.e-12)
+
+    def test_moments(self):
+        r"""The closed form integrals of :math:`r R_{nm}` agree with
+        quadrature."""
+        a, b = 0.25, 0.85
+        solver = CylindricalSandwich(Nsum=10, Msum=200)
+        alphax, betax = solver.alpha(10, 200, a, b)
+        k = 2 * (np.arange(10) + 1)
+        moments = annulus_moments(k, alphax, betax, a, b)
+        for n, m in [(0, 0), (0, 199), (4, 30), (9, 0), (9, 120)]:
+            expected = quad(lambda r: r * (sp.jn(k[n], alphax[n, m] * r) +
+                                           betax[n, m] * sp.yn(k[n], alphax[n, m] * r)),
+                            a, b, limit=500, epsabs=1.e-14, epsrel=1.e-12)[0]
+            assert abs(moments[n, m] - expected) < 1.e-13
+
+    def test_bounds(self):
+        r"""The bounds of the modes are at least their maxima on a fine grid."""
+        solver = CylindricalSandwich(a=0.05, b=1.0, Nsum=6, Msum=30)
+        alphax, betax = solver.modes()[:2]
+        k = 2 * (np.arange(6) + 1)[:, np.newaxis, np.newaxis]
+        arg = alphax[:, :, np.newaxis] * np.linspace(0.05, 1.0, 1001)
+        Rnm = sp.jn(k, arg) + betax[:, :, np.newaxis] * sp.yn(k, arg)
+        assert np.all(solver.Rmax(alphax, betax) >= np.max(np.abs(Rnm), axis=2))
+
+
 class TestHeatRod1dBoundary():
     r"""Tests the 1D Rod :class:`exactpack.solvers.heat.rod1d.Rod1D`."""
     # construct spatial grid and select time
@@ -119,7 +199,7 @@ class TestHeatRod1dBoundary():
     Nsum = 1000
     Nx = 3001
     x = np.linspace(0.0, L, Nx)
-    dx = float(L) / float(Nx)
+    dx = float(L) / float(Nx - 1)
 
     def test_BC1_homogeneous(self):
         r"""Checks Boundary Conditions."""        
@@ -256,8 +336,9 @@ class TestHeatRod1dBoundary():
         beta2 = 2.0
         solver = Rod1D(alpha1=alpha1, beta1=beta1, alpha2=alpha2, beta2=beta2, L=2, TL=3, TR=4)
         soln = solver(self.x, self.t)
-        bc1 = alpha1 * soln.temperature[0] + (beta1 * (soln.temperature[1] - soln.temperature[0]) / self.dx)
-        bc2 = alpha2 * soln.temperature[-1] + (beta2 * (soln.temperature[-1] - soln.temperature[-2]) / self.dx)
+        T = soln.temperature
+        bc1 = alpha1 * T[0] + beta1 * (-3 * T[0] + 4 * T[1] - T[2]) / (2 * self.dx)
+        bc2 = alpha2 * T[-1] + beta2 * (3 * T[-1] - 4 * T[-2] + T[-3]) / (2 * self.dx)
         assert bc1 == pytest.approx(0.0, abs=1.e-4)
         assert bc2 == pytest.approx(0.0, abs=1.e-3)
 
@@ -274,8 +355,9 @@ class TestHeatRod1dBoundary():
         gamma2 = 1.0
         solver = Rod1D(alpha1=alpha1, beta1=beta1, gamma1=gamma1, alpha2=alpha2, beta2=beta2, gamma2=gamma2, L=2)
         soln = solver(self.x, self.t)
-        bc1 = alpha1 * soln.temperature[0] + (beta1 * (soln.temperature[1] - soln.temperature[0]) / self.dx)
-        bc2 = alpha2 * soln.temperature[-1] + (beta2 * (soln.temperature[-1] - soln.temperature[-2]) / self.dx)
+        T = soln.temperature
+        bc1 = alpha1 * T[0] + beta1 * (-3 * T[0] + 4 * T[1] - T[2]) / (2 * self.dx)
+        bc2 = alpha2 * T[-1] + beta2 * (3 * T[-1] - 4 * T[-2] + T[-3]) / (2 * self.dx)
         assert bc1 == pytest.approx(gamma1, abs=1.e-4)
         assert bc2 == pytest.approx(gamma2, abs=1.e-3)
 
@@ -338,13 +420,13 @@ class TestHeatRod1dRegression():
         np.testing.assert_allclose(soln.temperature, temp0)
 
     def test_heat_rod1d_regression7(self):
-        temp0 = [0.59627172, 0.51704211, 0.36237742]
+        temp0 = [2.52621966, 3.12626018, 3.30083585]
         solver = Rod1D(alpha1=1, beta1=-1, alpha2=1, beta2=2, L=2, TL=3, TR=4)
         soln = solver(self.x, self.t)
         np.testing.assert_allclose(soln.temperature, temp0)
 
     def test_heat_rod1d_regression8(self):
-        temp0 = [1.97797341, 1.99708713, 1.89143987]
+        temp0 = [2.62288129, 2.91103453, 2.96524841]
         solver = Rod1D(alpha1=1, beta1=-1, gamma1=1.2, alpha2=1, beta2=2, gamma2=2.3, L=2)
         soln = solver(self.x, self.t)
         np.testing.assert_allclose(soln.temperature, temp0)
@@ -415,6 +497,320 @@ class TestRod1DFunctions():
         np.testing.assert_allclose(solver.Bn, Bn0)
 
 
+class TestHeatRobinRoots():
+    r"""Tests the eigenvalues of the general boundary conditions,
+    :func:`exactpack.solvers.heat.rod1d.robin_roots`."""
+
+    @pytest.mark.parametrize('a1, b1, a2, b2', [
+        (1.0, -0.5, 1.0, 1.0),
+        (0.0, 0.5, 1.0, 1.0),
+        (1.0, 0.25, 2.0, 0.15),
+        (0.0, 0.5, -0.2, 1.0),
+        (2.0, -0.05, 0.0, 0.5),
+        (1.0, 1.e-4, 1.0, -1.e-4),
+        (1.0, 1.e-6, 1.0, 1.e-6),
+        ])
+    def test_roots(self, a1, b1, a2, b2):
+        r"""The roots are the sign changes of the secular function, with none
+        missing or duplicated."""
+        mu = robin_roots(a1, b1, a2, b2, 2000)
+
+        def secular(mu):
+            return (a1 * a2 + b1 * b2 * mu**2) * np.sin(mu) + \
+                (a1 * b2 - a2 * b1) * mu * np.cos(mu)
+
+        scale = abs(a1 * a2) + abs(b1 * b2) * mu**2 + abs(a1 * b2 - a2 * b1) * mu
+        assert np.all(np.abs(secular(mu)) <= 1.e-9 * scale)
+        assert np.all(np.diff(mu) > 0)
+        grid = np.linspace(1.e-9, mu[-1] + 1.0, 2000000)
+        assert np.count_nonzero(np.diff(np.sign(secular(grid)))) == mu.size
+
+    def test_dirichlet_limit(self):
+        r"""Small flux coefficients approach the boundary condition BC1."""
+        x = np.linspace(0.0, 2.0, 11)
+        solver1 = Rod1D(TL=3, TR=4, L=2, alpha1=1, beta1=0, alpha2=1, beta2=0)
+        solver = Rod1D(TL=3, TR=4, L=2, alpha1=1, beta1=1.e-9, alpha2=1,
+                       beta2=1.e-9)
+        np.testing.assert_allclose(solver(x, 0.1).temperature,
+                                   solver1(x, 0.1).temperature, atol=1.e-7)
+
+    def test_steady_state(self):
+        r"""At late times the solution satisfies the nonhomogeneous boundary
+        conditions."""
+        L = 2.0
+        solver = Rod1D(alpha1=1, beta1=-1, gamma1=1.2, alpha2=1, beta2=2,
+                       gamma2=2.3, L=L)
+        T = solver(np.array([0.0, L]), 100.0).temperature
+        slope = (T[1] - T[0]) / L
+        assert T[0] - slope == pytest.approx(1.2)
+        assert T[1] + 2 * slope == pytest.approx(2.3)
+
+    def test_large_nsum(self):
+        r"""Many modes are found quickly."""
+        solver = Rod1D(alpha1=1, beta1=-1, alpha2=1, beta2=2, Nsum=10000)
+        assert np.all(np.diff(solver.kn[1:]) > 0)
+
+
+class TestHeatModeSum():
+    r"""Tests the blocked evaluation of the Fourier sums,
+    :func:`exactpack.solvers.heat.rod1d.mode_sum`."""
+
+    x = np.linspace(0.0, 2.0, 301).reshape(7, 43)
+
+    def direct(self, kn, An, Bn):
+        return sum(An[n] * np.cos(kn[n] * self.x) + Bn[n] * np.sin(kn[n] * self.x)
+                   for n in range(len(kn)))
+
+    def test_uniform(self):
+        r"""Equally spaced modes, with the phases split into blocks."""
+        kn = (2 * np.arange(200) + 1) * np.pi / 4.0
+        An = np.cos(np.arange(200)) / (1.0 + np.arange(200))
+        Bn = np.exp(-0.01 * kn**2)
+        np.testing.assert_allclose(mode_sum(self.x, kn, An, Bn),
+                                   self.direct(kn, An, Bn), rtol=0, atol=1.e-12)
+
+    def test_general(self):
+        r"""Modes that are not equally spaced."""
+        kn = np.sqrt(np.arange(1, 1500))
+        An = 1.0 / kn**2
+        Bn = np.zeros(kn.size)
+        np.testing.assert_allclose(mode_sum(self.x, kn, An, Bn),
+                                   self.direct(kn, An, Bn), rtol=0, atol=1.e-12)
+
+    def test_truncated(self):
+        r"""Modes with zero or subnormal coefficients are dropped."""
+        kn = np.arange(50) * np.pi / 2.0
+        An = np.zeros(50)
+        Bn = np.zeros(50)
+        Bn[:5] = 1.0
+        Bn[40] = 1.e-320
+        np.testing.assert_allclose(mode_sum(self.x, kn, An, Bn),
+                                   self.direct(kn[:5], An, Bn), rtol=0, atol=1.e-14)
+        assert np.all(mode_sum(self.x, kn, An, 0 * Bn) == 0)
+
+    def test_rod1d(self):
+        r"""The solver agrees with the sum over the modes."""
+        solver = Rod1D(TL=3, TR=4, L=2, alpha1=1, beta1=0, alpha2=0, beta2=1)
+        t = 0.01
+        decay = np.exp(-solver.kappa * solver.kn**2 * t)
+        temp = self.direct(solver.kn, solver.An * decay, solver.Bn * decay)
+        soln = solver(self.x.ravel(), t)
+        np.testing.assert_allclose(soln.temperature, temp.ravel(), rtol=0, atol=1.e-12)
+
+
+class TestHeatImageSeries():
+    r"""Tests the short time series of images,
+    :func:`exactpack.solvers.heat.rod1d.image_sum`, against the Fourier
+    series."""
+
+    x = np.linspace(0.0, 2.0, 41)
+
+    @pytest.mark.parametrize('bc', [
+        dict(alpha1=1, beta1=0, gamma1=2, alpha2=1, beta2=0, gamma2=0.5),
+        dict(alpha1=0, beta1=1, gamma1=0.5, alpha2=0, beta2=1, gamma2=0.5),
+        dict(alpha1=1, beta1=0, gamma1=1, alpha2=0, beta2=1, gamma2=-1),
+        dict(alpha1=0, beta1=1, gamma1=2, alpha2=1, beta2=0, gamma2=1),
+    ])
+    @pytest.mark.parametrize('t', [1.e-4, 0.01, 0.5])
+    def test_rod1d(self, bc, t):
+        r"""Both methods agree for the boundary conditions BC1 to BC4."""
+        images = Rod1D(L=2, TL=1, TR=4, method='images', Nsum=4000, **bc)(self.x, t)
+        fourier = Rod1D(L=2, TL=1, TR=4, method='fourier', Nsum=4000, **bc)(self.x, t)
+        np.testing.assert_allclose(images.temperature, fourier.temperature,
+                                   rtol=0, atol=1.e-10)
+
+    def test_hutchens1(self):
+        r"""Both methods agree for the sphere, including at the center."""
+        r = np.linspace(0.0, 1.0, 21)
+        for t in [1.e-3, 0.1, 1.0]:
+            images = Hutchens1(method='images')(r, t)
+            fourier = Hutchens1(method='fourier', Nsum=2000)(r, t)
+            np.testing.assert_allclose(images.temperature, fourier.temperature,
+                                       rtol=0, atol=1.e-12)
+
+    def test_initial(self):
+        r"""The images give the initial condition exactly, without Gibbs
+        oscillations near the boundaries."""
+        soln = Rod1D(L=2, alpha1=1, beta1=0, alpha2=1, beta2=0, TL=1, TR=4,
+                     method='images')(self.x, 0.0)
+        np.testing.assert_allclose(soln.temperature[1:-1], 1 + 1.5 * self.x[1:-1],
+                                   rtol=0, atol=1.e-14)
+
+    def test_auto(self):
+        r"""The images are selected at early times only."""
+        solver = Rod1D(L=2, alpha1=1, beta1=0, alpha2=1, beta2=0, Nsum=1000)
+        assert solver.use_images(1.e-5)
+        assert not solver.use_images(1.0)
+        assert Hutchens1().use_images(1.e-4)
+        assert not Hutchens1().use_images(0.1)
+        general = Rod1D(L=2, alpha1=1, beta1=1, alpha2=1, beta2=2, Nsum=1000)
+        assert not general.use_images(1.e-5)
+
+    def test_unsupported(self):
+        r"""The images are not available for the general Robin conditions."""
+        solver = Rod1D(L=2, alpha1=1, beta1=1, alpha2=1, beta2=2, method='images')
+        with pytest.raises(ValueError):
+            solver(self.x, 0.1)
+
+
+class TestHeatRectangle():
+    r"""Tests the Rectangle solver :class:`exactpack.solvers.heat.rectangle.Rectangle`."""
+
+    x = np.array([0.25, 0.5, 1.0, 1.5, 1.0])
+    y = np.array([0.5, 1.0, 1.0, 1.9, 0.25])
+
+    def test_regression(self):
+        r"""Regression test, against the sums over the modes in loops."""
+        soln = Rectangle()([self.x, self.y], 0.1)
+        np.testing.assert_allclose(soln.temperature,
+                                   [3.6042032076170905e-04, 2.0227551558142154e-02,
+                                    2.4704832094626455e-02, 8.0297113413264398e-01,
+                                    8.7234710938535742e-05], rtol=1.e-11)
+        soln = Rectangle(NonHomogeneousOnly=True)([self.x, self.y], 0.1)
+        np.testing.assert_allclose(soln.temperature,
+                                   [0.03698236572530332, 0.18202833188693837, 0.25,
+                                    0.8597522324296283, 0.04431570801772546], rtol=1.e-13)
+
+    def test_tensor_mesh(self):
+        r"""The same solution on a tensor product mesh and at scattered points."""
+        x, y = np.meshgrid(np.linspace(0.0, 2.0, 13), np.linspace(0.0, 2.0, 11))
+        solver = Rectangle(Nsum=30)
+        mesh = solver([x, y], 0.05)
+        assert mesh.temperature.shape == x.shape
+        for i, j in [(0, 0), (3, 7), (10, 12), (5, 5)]:
+            point = solver([np.append(self.x, x[i, j]), np.append(self.y, y[i, j])], 0.05)
+            np.testing.assert_allclose(mesh.temperature[i, j], point.temperature[-1],
+                                       rtol=0, atol=1.e-14)
+
+    def test_large_nsum(self):
+        r"""The hyperbolic sines do not overflow."""
+        soln = Rectangle(Nsum=500)([self.x, self.y], 0.1)
+        assert np.all(np.isfinite(soln.temperature))
+        np.testing.assert_allclose(soln.temperature,
+                                   Rectangle(Nsum=200)([self.x, self.y], 0.1).temperature,
+                                   rtol=0, atol=1.e-5)
+
+
+class TestHeatTruncation():
+    r"""Tests the truncation of the heat series to a tolerance."""
+
+    def test_tail_bound(self):
+        r"""The geometric bound of the modes beyond the last one."""
+        rates = (np.arange(1, 40) * np.pi / 2.0)**2
+        t = 0.05
+        assert np.sum(np.exp(-rates[10:] * t)) <= tail_bound(1.0, rates[:10], t)
+        assert tail_bound(1.0, rates[:10], 0.0) == np.inf
+        assert tail_bound(0.0, rates[:10], 0.0) == 0.0
+
+    @pytest.mark.parametrize('t', [0.01, 0.1, 1.0])
+    def test_rod1d(self, t):
+        r"""The error of the truncated series is within the reported bound."""
+        x = np.linspace(0.0, 2.0, 101)
+        params = dict(TL=1, TR=4, gamma1=2, method='fourier')
+        reference = Rod1D(Nsum=20000, **params)(x, t)
+        soln = Rod1D(Nsum=2000, rtol=1.e-8, **params)(x, t)
+        assert soln.metadata['terms'] < 100
+        assert soln.metadata['tail_bound'] <= 4.e-8
+        assert np.max(np.abs(soln.temperature - reference.temperature)) <= \
+            soln.metadata['tail_bound'] + 1.e-14
+
+    def test_default(self):
+        r"""Without a tolerance all the modes are kept."""
+        soln = Rod1D(Nsum=50, method='fourier')(np.linspace(0.0, 2.0, 5), 0.1)
+        assert soln.metadata['terms'] == 50
+
+    def test_hutchens1(self):
+        r"""The error of the truncated series is within the reported bound."""
+        r = np.linspace(0.0, 1.0, 21)
+        reference = Hutchens1(method='fourier', Nsum=2000)(r, 0.1)
+        soln = Hutchens1(method='fourier', atol=1.e-10)(r, 0.1)
+        assert soln.metadata['terms'] < 20
+        assert np.max(np.abs(soln.temperature - reference.temperature)) <= \
+            soln.metadata['tail_bound'] <= 1.e-10
+
+    def test_rectangle(self):
+        r"""The error of the truncated series is within the reported bound."""
+        x, y = np.meshgrid(np.linspace(0.0, 2.0, 11), np.linspace(0.0, 1.8, 11))
+        reference = Rectangle(Nsum=200)([x.ravel(), y.ravel()], 0.1)
+        soln = Rectangle(rtol=1.e-6)([x.ravel(), y.ravel()], 0.1)
+        assert soln.metadata['modes'] < 20
+        assert np.max(np.abs(soln.temperature - reference.temperature)) <= \
+            soln.metadata['tail_bound'] <= 1.e-6
+
+    def test_cylindrical_sandwich(self):
+        r"""The error of the truncated series is within the reported bound."""
+        r, theta = np.meshgrid(np.linspace(0.25, 0.85, 5), np.linspace(0, np.pi / 2, 5))
+        reference = CylindricalSandwich(Nsum=10, Msum=10)([r, theta], 0.5)
+        soln = CylindricalSandwich(Nsum=10, Msum=10, rtol=1.e-5)([r, theta], 0.5)
+        N, M = soln.metadata['modes']
+        assert N * M < 100
+        assert np.max(np.abs(soln.temperature - reference.temperature)) <= \
+            soln.metadata['tail_bound'] <= 1.e-5
+
+    @pytest.mark.parametrize('t', [0.05, 0.1, 0.3])
+    def test_cylindrical_sandwich_nsum(self, t):
+        r"""The reported bound includes the modes beyond Nsum."""
+        r, theta = np.meshgrid(np.linspace(0.25, 0.85, 7), np.linspace(0, np.pi / 2, 7))
+        reference = CylindricalSandwich(Nsum=60, Msum=50)([r, theta], t)
+        with pytest.warns(UserWarning, match='tolerance'):
+            soln = CylindricalSandwich(Nsum=4, Msum=50, atol=1.e-4)([r, theta], t)
+        assert np.max(np.abs(soln.temperature - reference.temperature)) <= \
+            soln.metadata['tail_bound']
+
+    def test_unmet(self):
+        r"""A warning is issued if there are not enough modes."""
+        with pytest.warns(UserWarning, match='tolerance'):
+            soln = Rod1D(Nsum=10, rtol=1.e-8, method='fourier')(np.linspace(0.0, 2.0, 5), 1.e-3)
+        assert soln.metadata['terms'] == 10
+
+    def test_bad_tolerance(self):
+        r"""The tolerances must be positive."""
+        with pytest.raises(ValueError):
+            Rod1D(rtol=0.0, method='fourier')(np.linspace(0.0, 2.0, 5), 0.1)
+
+
+class TestHeatMeshSolution():
+    r"""Tests the evaluation at many times on a fixed mesh,
+    :class:`exactpack.solvers.heat.rod1d.MeshSolution`."""
+
+    times = [0.0, 1.e-4, 0.01, 0.1, 1.0]
+
+    def check(self, solver, points):
+        mesh = solver.bind(points)
+        temperature = mesh.temperature(self.times)
+        for t, row in zip(self.times, temperature):
+            np.testing.assert_allclose(row, solver(points, t).temperature,
+                                       rtol=0, atol=1.e-12)
+        soln = mesh(self.times[-1])
+        np.testing.assert_allclose(soln.temperature, temperature[-1])
+        assert soln.metadata == solver(points, self.times[-1]).metadata
+
+    @pytest.mark.parametrize('bc', [
+        dict(alpha1=1, beta1=0, gamma1=2, alpha2=1, beta2=0, gamma2=0.5),
+        dict(alpha1=1, beta1=1, gamma1=1, alpha2=1, beta2=2, gamma2=0),
+    ])
+    def test_rod1d(self, bc):
+        r"""The same solution as the solver, at early and late times."""
+        self.check(Rod1D(L=2, TL=1, TR=4, **bc), np.linspace(0.0, 2.0, 41))
+
+    def test_hutchens1(self):
+        r"""The same solution as the solver."""
+        self.check(Hutchens1(method='fourier'), np.linspace(0.0, 1.0, 21))
+
+    def test_rectangle(self):
+        r"""The same solution as the solver."""
+        x, y = np.meshgrid(np.linspace(0.0, 2.0, 9), np.linspace(0.0, 2.0, 9))
+        self.check(Rectangle(Nsum=20), [x, y])
+
+    def test_modes(self):
+        r"""The modes are only computed as far as they are needed."""
+        mesh = Rod1D(L=2, TL=1, TR=4, method='fourier').bind(np.linspace(0.0, 2.0, 41))
+        mesh(10.0)
+        late = mesh.state['cos'].shape[1]
+        mesh(0.01)
+        assert late < mesh.state['cos'].shape[1] <= 100
+
+
 class TestHeatPlanarSandwich():
     r"""Tests the planar sandwich :class:`exactpack.solvers.heat.planar_sandwich.PlanarSandwich`"""
     # construct spatial grid and select time
@@ -446,7 +842,7 @@ class TestHeatPlanarSandwich():
 
 
 
-class TestHeatPlanarHutchens():
+class TestHeatSphericalHutchens():
     r"""Tests the Hutchens heat solver :class:`exactpack.solvers.heat.hutchens1.Hutchens1`."""
 
     def test_heat_planar_hutchens1_regression(self):
@@ -456,7 +852,7 @@ class TestHeatPlanarHutchens():
         t = 0.1
         solver = Hutchens1()
         soln = solver(r, t)
-        temp_h1 = [1.0, 1.0033374549970184, 1.107411979374676, 2.15419627072115,
+        temp_h1 = [1.0001549931654905, 1.0033374549970184, 1.107411979374676, 2.15419627072115,
                    4.999999999999999]
         np.testing.assert_allclose(soln.temperature, temp_h1)
 
@@ -475,6 +871,35 @@ class TestHeatPlanarHutchens():
         t = 0  # dummy argument
         solver = Hutchens2()
         soln = solver(rzlist, t)
-        temp_h2 = [-6969.729767307974, -6932.525739227717, -6807.659371413964]
+        temp_h2 = [22.70924601751383, 18.886230722605383, 4.985842418778347]
         for n in range(len(r0)):
             assert soln[0, n][2] == pytest.approx(temp_h2[n])
+
+    def test_heat_planar_hutchens2_scattered(self):
+        r"""The points of a mesh give the same solution one at a time, in
+        any order, as on the mesh."""
+        r, z = np.meshgrid(np.linspace(0.0, 1.0, 11), np.linspace(0.0, 2.0, 21))
+        mesh = Hutchens2(Nsum=50)((r, z), 0).temperature
+        order = np.random.RandomState(0).permutation(r.size)
+        points = Hutchens2(Nsum=50)((r.ravel()[order], z.ravel()[order]), 0).temperature
+        np.testing.assert_allclose(points, mesh.ravel()[order], rtol=1.e-12)
+        single = Hutchens2(Nsum=50)((r[3, 4], z[3, 4]), 0).temperature
+        np.testing.assert_allclose(single, mesh[3, 4], rtol=1.e-12)
+
+    @pytest.mark.parametrize('Nsum', [10, 1000, 5000])
+    def test_heat_planar_hutchens2_convergence(self, Nsum):
+        r"""The series converges as Nsum grows: inside the cylinder it is
+        converged with the default Nsum, and on :math:`r = b` it approaches
+        :math:`T_b` as :math:`1/N`. The ratios of the Bessel functions do not
+        overflow for large Nsum."""
+        solver = Hutchens2(Nsum=Nsum)
+        r, z = np.meshgrid([0.0, 0.5], [0.5, 1.5])
+        soln = solver((r, z), 0)
+        converged = Hutchens2(Nsum=100)((r, z), 0)
+        np.testing.assert_allclose(soln.temperature, converged.temperature,
+                                   rtol=1.e-6 if Nsum == 10 else 1.e-12)
+        z = np.linspace(0.5, 1.5, 5)
+        boundary = solver((solver.b + 0 * z, z), 0).temperature
+        np.testing.assert_allclose(boundary, solver.Tb, atol=2. / Nsum)
+        ends = solver(([0.3, 0.3], [0.0, solver.L]), 0).temperature
+        np.testing.assert_allclose(ends, [solver.T0, solver.TL], atol=1.e-12)
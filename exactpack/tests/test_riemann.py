@@ -8,7 +8,7 @@ from numpy import array, interp, diff, sqrt, abs, argmin, linspace
 
 import numpy.random
 
-from exactpack.solvers.riemann.ep_riemann import IGEOS_Solver, GenEOS_Solver, streakplot
+from exactpack.solvers.riemann.ep_riemann import IGEOS_Solver, GenEOS_Solver, NASGEOS_Solver, streakplot, xt_table
 from exactpack.solvers.riemann.riemann import *
 
 warnings.simplefilter('ignore', RuntimeWarning)
@@ -1671,7 +1671,7 @@ class Test_Riemann4():
     pstar  = 10.333334047951963
     ustar  = -0.8106310956659113
     ustar1 = -0.8118752612474093
-    ustar2 = -0.8106311343790868
+    ustar2 = -0.8106310985101152
     rstar1 = 3.8571431905336095
     rstar2 = 3.8571429508974844
     estar1 = 6.697530748477618
@@ -3509,20 +3509,20 @@ class Test_RiemannJWL_Shyue():
     soln_gen.driver()
 
     # Test that star state values are computed correctly.
-    pstar  = 4.407101735576622
-    ustar1 = 1.6952362789470772
-    ustar2 = 1.6952362789473674
-    rstar1 = 0.8880765637317387
-    rstar2 = 3.781280243757399
-    estar1 = 19.796096879271513
-    estar2 = 3.7361758546784607
-    astar1 = 2.496140921360204
-    astar2 = 1.2955224481797556
+    pstar  = 4.40710130621415
+    ustar1 = 1.69523647265503
+    ustar2 = 1.6952364726542064
+    rstar1 = 0.8880764948195898
+    rstar2 = 3.7812806792041918
+    estar1 = 19.7960964942382
+    estar2 = 3.7361747615799237
+    astar1 = 2.496140896063162
+    astar2 = 1.295522317219196
 
     # Test that spatial region boundaries are computed correctly.
     # Xregs = Vregs * t + xd0
-    Xregs = array([17.16330032209335, 40.38914429104248, 70.34283534736493, 77.65703780340685])
-    Vregs = array([-2.73639163982555, -0.80090464241313,  1.69523627894708,  2.3047531502839 ])
+    Xregs = array([17.16330032209335, 40.389146919102416, 70.34283767186037, 77.65703571118374])
+    Vregs = array([-2.736391639825554, -0.800904423408132,  1.69523647265503,  2.3047529759319776])
 
     def test_riemShyuegen_star_states(self):
         """Using the general EOS solver, test star-state values adjacent to the contact discontinuity.
@@ -3633,22 +3633,22 @@ class Test_RiemannJWL_Lee():
     soln_gen.driver()
 
     # Test that star state values are computed correctly.
-    pstar  = 1.1911636719202543
-    ustar1 = -0.13299594880743928
-    ustar2 = -0.1329959488075938
-    rstar1 = 1.0445599160997083
-    rstar2 = 3.5156639171076782
-    estar1 = 1.279298064619773
-    estar2 = -0.0010148657564458242
-    astar1 = 1.4692503217111825
-    astar2 = 1.5222127467374922
+    pstar  = 1.1911635117803019
+    ustar1 = -0.13299597872952426
+    ustar2 = -0.13299597873037045
+    rstar1 = 1.0445599090965543
+    rstar2 = 3.5156638479995794
+    estar1 = 1.2792979016423849
+    estar2 = -0.0010148724189750684
+    astar1 = 1.469250227810455
+    astar2 = 1.5222126829906513
 
     # Test that spatial region boundaries are computed correctly.
     # Xregs = Vregs * t + xd0
     Xregs = array([19.852754491950297, 47.343612034675, 77.85476097025833, 85.80228712253455])
     Vregs = array([-1.5073622754024851, -0.13281939826625017,1.392738048512916, 1.7901143561267274])
-    Xregs = array([19.81914240303341, 47.34008102385121, 77.78433595859796, 85.74918935763472])
-    Vregs = array([-1.50904287984833, -0.13299594880744, 1.3892167979299, 1.78745946788174])
+    Xregs = array([19.81915399767576, 47.34008042540952, 77.78433408520561, 85.74918935763472])
+    Vregs = array([-1.509042300116212, -0.13299597872952426, 1.3892167042602808, 1.7874594678817362])
 
 
     def test_riemLeegen_star_states(self):
@@ -3740,6 +3740,267 @@ class Test_RiemannJWL_Lee():
         assert self.pr == approx(pl, abs=1.e-12)
 
 
+class TestRiemannEOSObjects():
+    """Tests the EOS objects of :mod:`exactpack.solvers.riemann.eos` and their use in the general EOS solver.
+    """
+
+    # Shyue's JWL Riemann Problem star states, see Test_RiemannJWL_Shyue
+    jwl = JWLEOS(1.25, A=8.545, B=0.205, R1=4.6, R2=1.35, r0=1.84, e0=0.0)
+    pstar, rstar1, rstar2 = 4.407101735576622, 0.8880765637317387, 3.781280243757399
+    estar1, estar2 = 19.796096879271513, 3.7361758546784607
+    astar1, astar2 = 2.496140921360204, 1.2955224481797556
+
+    # an ideal-gas table, uniform in log(rho) and log(p)
+    rho = numpy.geomspace(0.01, 3., 200)
+    p = numpy.geomspace(1.e-6, 2., 400)
+    sie_table = p[None, :] / 0.4 / rho[:, None]
+
+    def test_jwl_star_states(self):
+        """The JWL EOS object reproduces the star-state energies and sound speeds of Shyue's problem.
+        """
+        assert self.estar1 == approx(self.jwl.sie(self.pstar, self.rstar1), abs=1.e-12)
+        assert self.estar2 == approx(self.jwl.sie(self.pstar, self.rstar2), abs=1.e-12)
+        assert self.astar1 == approx(self.jwl.sound_speed(self.pstar, self.rstar1), abs=1.e-12)
+        assert self.astar2 == approx(self.jwl.sound_speed(self.pstar, self.rstar2), abs=1.e-12)
+
+    def test_eos_objects_match_problem_string(self):
+        """Independent ideal-gas EOS objects give the same solution as the default problem setup.
+        """
+        default = RiemannGenEOS(num_int_pts=2001, num_x_pts=2001)
+        default.driver()
+        objects = RiemannGenEOS(num_int_pts=2001, num_x_pts=2001,
+                                eos_l=IdealGasEOS(1.4), eos_r=IdealGasEOS(1.4))
+        objects.driver()
+        assert default.px == objects.px
+        assert default.rx1 == objects.rx1
+        assert default.rx2 == objects.rx2
+
+    @pytest.mark.parametrize("method", ['bilinear', 'bicubic'])
+    def test_tabulated_vectorized(self, method):
+        """Tabulated EOS lookups are vectorized and reproduce the table data at the nodes.
+        """
+        tab = TabulatedEOS(self.rho, self.p, self.sie_table, method=method,
+                           log=True, gamma=1.4)
+        i, j = [3, 50, 199], [7, 100, 300]
+        e = tab.sie(self.p[j], self.rho[i])
+        assert e.shape == (3,)
+        assert e == approx(self.sie_table[i, j], rel=1.e-12)
+
+    def test_tabulated_sound_speed(self):
+        """The bicubic table reproduces the ideal-gas sound speed between nodes.
+        """
+        tab = TabulatedEOS(self.rho, self.p, self.sie_table, log=True, gamma=1.4)
+        p, r = linspace(0.1, 1., 7), linspace(0.2, 2., 7)
+        assert tab.sound_speed(p, r) == approx(sqrt(1.4 * p / r), rel=1.e-3)
+
+    def test_tabulated_sod(self):
+        """The general EOS solver with a tabulated ideal-gas EOS reproduces the Sod star state.
+        """
+        tab = TabulatedEOS(self.rho, self.p, self.sie_table, log=True, gamma=1.4)
+        soln = RiemannGenEOS(num_int_pts=2001, num_x_pts=2001, eos_l=tab, eos_r=tab)
+        soln.driver()
+        assert soln.px == approx(0.30313017805042364, abs=1.e-5)
+        assert soln.rx1 == approx(0.42631942817827095, abs=1.e-5)
+        assert soln.rx2 == approx(0.26557371170518734, abs=1.e-5)
+
+    def test_tabulated_irregular_grid(self):
+        """Tables must be uniformly spaced in the interpolation coordinates.
+        """
+        with pytest.raises(ValueError):
+            TabulatedEOS(self.rho, self.p, self.sie_table, log=False)
+
+
+class TestRiemannIGEOSDiagnostics():
+    """Tests the lazily computed Gottlieb & Groth curves of
+    :class:`exactpack.solvers.riemann.riemann.RiemannIGEOS`.
+    """
+
+    def test_not_computed_by_driver(self):
+        soln = RiemannIGEOS(num_x_pts=101)
+        soln.driver()
+        assert soln._diagnostics is None
+        assert 'plow' not in vars(soln)
+
+    def test_diagnostic_curves(self):
+        soln = RiemannIGEOS(num_x_pts=101)
+        soln.driver()
+        diag = soln.diagnostics()
+        assert soln.diagnostics() is diag
+        assert soln.plow is diag['plow']
+        assert len(soln.ps) == 202
+        assert soln.plow[-1] == soln.pl
+        assert soln.phigh[-1] == soln.pmax
+        assert soln.uSCNphigh == approx(u_SCN(soln.phigh, soln))
+        assert soln.uNCRphigh == approx(u_NCR(soln.phigh, soln))
+        assert soln.uNCSplow == approx(u_NCS(soln.plow, soln))
+        assert soln.uRCNplow == approx(u_RCN(soln.plow, soln))
+        assert soln.uaps == approx(u_a(soln.ps, soln))
+        assert soln.uRCVRps == approx(u_RCVR(soln.ps, soln))
+        # The star state lies on the velocity curves
+        assert u_RCN(soln.px, soln) == approx(soln.ux, abs=1.e-10)
+
+    def test_reset_by_driver(self):
+        soln = RiemannIGEOS(num_x_pts=101)
+        soln.driver()
+        soln.diagnostics()
+        soln.driver()
+        assert soln._diagnostics is None
+
+
+class TestRiemannGenEOSWaveCurveCache():
+    """Tests the reuse of wave curves between general EOS problems that share a
+    left or right state.
+    """
+
+    jwl = JWLEOS(1.25, 8.545, 0.205, 4.6, 1.35, 1.84, 0.0)
+    kwargs = dict(xmin=0., xd0=50., xmax=100., t=12.,
+                  rl=1.7, ul=0., pl=10., rr=1.0, ur=0., pr=0.5, gr=1.25,
+                  num_x_pts=1001, num_int_pts=1001)
+
+    def solve(self, **kwargs):
+        soln = RiemannGenEOS(**dict(self.kwargs, **kwargs))
+        soln.driver()
+        return soln
+
+    def test_reuse_fixed_side(self):
+        RiemannGenEOS.clear_wave_curve_cache()
+        first = self.solve(eos_l=self.jwl, eos_r=IdealGasEOS(1.25), pr=0.4)
+        left = first.wave_curves(first.pl, first.rl, first.ul, self.jwl, -1)
+        # An EOS object with the same parameters reuses the curves.
+        second = self.solve(eos_l=JWLEOS(1.25, 8.545, 0.205, 4.6, 1.35, 1.84),
+                            eos_r=IdealGasEOS(1.25), pr=0.6)
+        assert len(RiemannGenEOS._wave_curve_cache) == 3
+        assert second.wave_curves(second.pl, second.rl, second.ul,
+                                  self.jwl, -1) is left
+
+    def test_cached_solution_unchanged(self):
+        RiemannGenEOS.clear_wave_curve_cache()
+        cold = self.solve(eos_l=self.jwl, eos_r=self.jwl)
+        warm = self.solve(eos_l=self.jwl, eos_r=self.jwl)
+        assert warm.px == cold.px
+        assert warm.Vregs == approx(cold.Vregs, abs=0.)
+        assert warm.r == approx(cold.r, abs=0.)
+
+    def test_reuse_other_pressure_range(self):
+        """The curves of a side do not depend on the other side's pressure,
+        which sets the highest pressure of the shock curves.
+        """
+        RiemannGenEOS.clear_wave_curve_cache()
+        cold = [self.solve(eos_l=self.jwl, eos_r=IdealGasEOS(1.25), pr=pr)
+                for pr in [20., 0.5]]
+        RiemannGenEOS.clear_wave_curve_cache()
+        # The left curves are extended for pr = 20 and clipped for pr = 0.5.
+        for pr in [0.5, 20., 0.5]:
+            self.solve(eos_l=self.jwl, eos_r=IdealGasEOS(1.25), pr=pr)
+        assert len(RiemannGenEOS._wave_curve_cache) == 3
+        warm = [self.solve(eos_l=self.jwl, eos_r=IdealGasEOS(1.25), pr=pr)
+                for pr in [20., 0.5]]
+        for c, w in zip(cold, warm):
+            assert w.px == c.px
+            assert w.Vregs == approx(c.Vregs, abs=0.)
+            assert w.r == approx(c.r, abs=0.)
+
+    def test_shock_curve_failure(self):
+        """A shock curve that cannot be continued warns with its side and
+        pressure, and ends there.
+        """
+        soln = RiemannGenEOS(**dict(self.kwargs, eos_l=self.jwl,
+                                    eos_r=IdealGasEOS(1.25)))
+        # too close to pr for the shock density to be bracketed
+        with pytest.warns(RuntimeWarning, match='right shock curve ends at p'):
+            shocks = match_shocks(array([0.5 * (1. + 1.e-15), 0.6]),
+                                  0.5, 1.0, 0., soln.eos_r, 1, soln)
+        assert [len(c) for c in shocks] == [0, 0, 0]
+
+    def test_bounded_eviction(self, monkeypatch):
+        RiemannGenEOS.clear_wave_curve_cache()
+        monkeypatch.setattr(RiemannGenEOS, 'wave_curve_cache_size', 2)
+        for pr in [0.4, 0.5, 0.6]:
+            self.solve(eos_l=self.jwl, eos_r=IdealGasEOS(1.25), pr=pr)
+        cache = RiemannGenEOS._wave_curve_cache
+        assert len(cache) == 2
+        # The shared left side was used most recently but one
+        assert [key[1:5] for key in cache] == [(10., 1.7, 0., -1),
+                                               (0.6, 1.0, 0., 1)]
+
+    def test_disabled(self, monkeypatch):
+        RiemannGenEOS.clear_wave_curve_cache()
+        monkeypatch.setattr(RiemannGenEOS, 'wave_curve_cache_size', 0)
+        self.solve(eos_l=self.jwl, eos_r=self.jwl)
+        assert len(RiemannGenEOS._wave_curve_cache) == 0
+
+
+class TestRiemannNASGEOS():
+    """Tests the closed-form Noble-Abel stiffened-gas solver :class:`exactpack.solvers.riemann.riemann.RiemannNASGEOS`.
+    """
+
+    # Stiffened-gas left state and Noble-Abel right state
+    eos_l, eos_r = NASGEOS(4.4, pinf=0.6), NASGEOS(1.4, b=0.3)
+    soln = RiemannNASGEOS(rl=1., ul=0., pl=2., rr=0.125, ur=0., pr=0.1,
+                          eos_l=eos_l, eos_r=eos_r)
+    soln.driver()
+
+    def test_ideal_gas_limit(self):
+        """With pinf = b = 0 the star states of the Sod problem are recovered.
+        """
+        soln = RiemannNASGEOS()
+        soln.driver()
+        assert soln.soln_type == 'rarefaction-contact-shock-RCS'
+        assert soln.px == approx(0.30313017805042364, abs=1.e-12)
+        assert soln.ux == approx(0.9274526200494746, abs=1.e-12)
+        assert soln.rx1 == approx(0.42631942817827095, abs=1.e-12)
+        assert soln.rx2 == approx(0.26557371170518734, abs=1.e-12)
+        assert soln.Vregs == approx([-1.1832159566199232, -0.07027281256055373,
+                                     0.9274526200494746, 1.7521557320295664],
+                                    abs=1.e-12)
+
+    def test_matches_general_eos(self):
+        """The closed-form solution matches the general EOS solver with the same EOS objects.
+        """
+        gen = RiemannGenEOS(rl=1., ul=0., pl=2., rr=0.125, ur=0., pr=0.1,
+                            eos_l=self.eos_l, eos_r=self.eos_r)
+        gen.driver()
+        assert gen.soln_type == 'RCS'
+        assert self.soln.px == approx(gen.px, abs=1.e-5)
+        assert self.soln.ux == approx(gen.ux1, abs=1.e-5)
+        assert self.soln.rx1 == approx(gen.rx1, abs=1.e-5)
+        assert self.soln.rx2 == approx(gen.rx2, abs=1.e-5)
+        assert self.soln.Vregs == approx(gen.Vregs, abs=1.e-5)
+
+    def test_covolume_fan(self):
+        """Inside a covolume rarefaction fan the characteristic condition and the isentrope are satisfied.
+        """
+        eos = NASGEOS(1.4, b=0.3)
+        soln = RiemannNASGEOS(eos_l=eos, eos_r=eos)
+        soln.driver()
+        fan = (soln.x > soln.Xregs[0]) & (soln.x < soln.Xregs[1])
+        p, r, u = soln.p[fan], soln.r[fan], soln.u[fan]
+        xi = (soln.x[fan] - soln.xd0) / soln.t
+        assert u - eos.sound_speed(p, r) == approx(xi, abs=1.e-12)
+        entropy = p * (1. / r - eos.b)**eos.gamma
+        assert entropy == approx(soln.pl * (1. / soln.rl - eos.b)**eos.gamma,
+                                 rel=1.e-12)
+
+    def test_vacuum(self):
+        """Initial states that generate a vacuum raise an error.
+        """
+        soln = RiemannNASGEOS(rl=1., ul=-20., pl=0.4, rr=1., ur=20., pr=0.4)
+        with pytest.raises(ValueError):
+            soln.driver()
+
+    def test_solver_wrapper(self):
+        """The ExactSolver wrapper reproduces the Sod solution with its default values.
+        """
+        solver = NASGEOS_Solver(xmin=0., xd0=0.5, xmax=1., t=0.25,
+                                rl=1., ul=0., pl=1., gl=1.4,
+                                rr=0.125, ur=0., pr=0.1, gr=1.4)
+        soln = solver(linspace(0.3, 0.7, 11), 0.25)
+        expected = [0.67811609, 0.57279963, 0.481826  , 0.40352901, 0.33640109,
+                    0.30313018, 0.30313018, 0.30313018, 0.30313018, 0.30313018,
+                    0.30313018]
+        assert soln['pressure'] == approx(expected)
+
+
 class TestRiemannIGSEOSSolver():
     """Regression test of the Ideal Gas solver wrapper."""
     # Riemann Problem 1
@@ -3791,6 +4052,29 @@ class TestRiemannIGSEOSSolver():
                     1.77760007]
         assert self.soln['specific_internal_energy'] == approx(expected)
 
+    def test_eos_objects(self):
+        """The adiabatic indices of EOS objects replace gl and gr."""
+        kwargs = dict(xmin=self.xmin, xd0=self.xd0, xmax=self.xmax, t=self.t,
+                      rl=self.rl, ul=self.ul, pl=self.pl,
+                      rr=self.rr, ur=self.ur, pr=self.pr)
+        soln = IGEOS_Solver(gl=3.0, gr=self.gr, **kwargs)(self.x, self.t)
+        soln_eos = IGEOS_Solver(gl=self.gl, gr=self.gr,
+                                eos_l=IdealGasEOS(3.0),
+                                **kwargs)(self.x, self.t)
+        for name in ('pressure', 'density', 'velocity',
+                     'specific_internal_energy'):
+            assert soln_eos[name] == approx(soln[name])
+        assert soln_eos['density'][-1] != approx(self.soln['density'][-1])
+
+    def test_eos_objects_not_ideal_gas(self):
+        """Only IdealGasEOS objects are accepted."""
+        with pytest.raises(TypeError):
+            IGEOS_Solver(xmin=self.xmin, xd0=self.xd0, xmax=self.xmax,
+                         t=self.t, rl=self.rl, ul=self.ul, pl=self.pl,
+                         gl=self.gl, rr=self.rr, ur=self.ur, pr=self.pr,
+                         gr=self.gr,
+                         eos_r=JWLEOS(0.25, 3.712, 0.0323, 4.15, 0.95, 1.63))
+
 
 class TestRiemannGenEOSSolver():
     """Regression test of the Gen EOS solver wrapper."""
@@ -3855,3 +4139,23 @@ class TestRiemannStreakPlot():
 
         riem1_ig_result = riem1_ig_soln._run(xvec, t_final)
         streakplot(solver=riem1_ig_soln, soln=riem1_ig_result, xs=xvec, t=t_final)
+
+    def test_xt_table_sod(self):
+        """The space-time table reproduces the self-similar solution at each time."""
+        xvec = linspace(0., 1., 1001)
+        t_final = 0.25
+        solver = IGEOS_Solver(rl=1.0,   ul=0.,   pl=1.0,  gl=1.4,
+                              rr=0.125, ur=0.,   pr=0.1,  gr=1.4,
+                              xmin=0.,  xd0=0.5, xmax=1., t=t_final)
+        result = solver._run(xvec, t_final)
+        x, t, Z, waves = xt_table(solver, result, xvec, t_final, N=51, Nt=41,
+                                  var_str='density')
+        assert Z.shape == (51, 41)
+        assert Z[:, -1] == approx(interp(x, xvec, result['density']))
+        assert Z[:, 20] == approx(interp(0.5 + (x - 0.5) * t_final / t[20],
+                                         xvec, result['density']))
+        assert Z[x < 0.5, 0] == approx(1.0)
+        assert Z[x > 0.5, 0] == approx(0.125)
+        assert [kind for kind, speed in waves] == ['rarefaction', 'rarefaction',
+                                                   'contact', 'shock']
+        assert [speed for kind, speed in waves] == approx(solver.Vregs)
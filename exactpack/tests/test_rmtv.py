@@ -4,11 +4,15 @@ The expected data for these tests has been generated using the old Fortran
 implementation of the solver by Timmes.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 import numpy
+from scipy.integrate import solve_ivp
 
 from exactpack.solvers.rmtv import Rmtv
+from exactpack.solvers.rmtv.timmes import derivs
 
 
 class TestRmtvTimmes():
@@ -87,4 +91,51 @@ class TestRmtvTimmes():
         numpy.testing.assert_allclose(self.solrt.velocity[1:], expected[1:], rtol=1.0e-6)
 
 
+class TestRmtvThreads():
+    """Tests that evaluations with different parameters can run concurrently
+    in one process, and give bit for bit the results of serial evaluation.
+    """
+    r = numpy.linspace(0.001, 1.0, 8)
+    cases = [dict(), dict(rf=0.5), dict(gamma=5.0 / 3.0), dict(g0=2.0)]
+
+    def evaluate(self, case):
+        return Rmtv(**case)._run(self.r)
+
+    def test_concurrent(self):
+        serial = [self.evaluate(case) for case in self.cases]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent = list(executor.map(self.evaluate, 4 * self.cases))
+        for i, result in enumerate(concurrent):
+            numpy.testing.assert_array_equal(result,
+                                             serial[i % len(self.cases)])
+
+    def test_workers(self):
+        """The threaded evaluation mode of the solver"""
+        serial = Rmtv()._run(self.r)
+        threaded = Rmtv(workers=4)._run(self.r)
+        numpy.testing.assert_array_equal(threaded, serial)
+
+
+class TestRmtvProfile():
+    """Tests of the similarity profile that is computed once per solver."""
+
+    def test_reused(self):
+        """The profile is computed once per solver"""
+        sol = Rmtv()
+        profile = sol._profile
+        sol._run(numpy.linspace(0.001, 1.0, 5))
+        assert sol._profile is profile
 
+    @pytest.mark.parametrize("side", ["outer", "inner"])
+    def test_dense_output(self, side):
+        """The profile sampled between the heat front and the shock front,
+        and behind the shock front, agrees with integrating the ODEs to each
+        point"""
+        profile = Rmtv()._profile
+        soln = getattr(profile, side)
+        for eta in numpy.linspace(soln.t[0], soln.t[-1], 7)[1:-1]:
+            expected = solve_ivp(derivs, (soln.t[0], eta), soln.y[:, 0],
+                                 rtol=4.0e-10, atol=4.0e-10,
+                                 args=(profile.ctx,)).y[:, -1]
+            numpy.testing.assert_allclose(soln.sol(eta), expected,
+                                          rtol=1.0e-6)
@@ -8,7 +8,9 @@ import numpy as np
 import scipy.optimize as sci_opt
 from scipy.integrate import IntegrationWarning
 
-from exactpack.solvers.sedov.sedov import Sedov
+from exactpack.solvers.sedov.sedov import Sedov, _quadrature_integrals
+from exactpack.solvers.sedov.energy_table import EnergyIntegralTable
+from exactpack.base import UsingDefaultWarning
 
 
 def sedovFcnTable(solution, lamvec):
@@ -844,3 +846,265 @@ class TestSedovShock():
         for ikey in self.analytic_postshock:
             assert self.solution[ikey][self.ishock] == \
                     pytest.approx(self.analytic_postshock[ikey], abs=1.0e-5)
+
+
+class TestSedovLambdaInversion():
+    """Tests the vectorized inversion of :math:`\\lambda(v)` by the
+    interpolation of :class:`exactpack.solvers.sedov.sedov._LambdaProfile`.
+    """
+
+    # Kamm & Timmes, Table 1, gamma=1.4, planar geometry case
+
+    lamvec = TestSedovFunctionsTable1.lamvec
+    v_ref = TestSedovFunctionsTable1.v_ref
+    g_fun_ref = TestSedovFunctionsTable1.g_fun_ref
+
+    @staticmethod
+    def v_from_lambda(solution, lam):
+        profile = solution._profile
+        return profile.table[0] + profile.interpolate(lam)
+
+    def test_table1(self):
+        solution = Sedov(gamma=1.4, geometry=1, omega=0.)
+        v = self.v_from_lambda(solution, self.lamvec)
+        g_fun = solution.sedov_funcs_standard(v)[3]
+        np.testing.assert_allclose(v, self.v_ref, atol=1.0e-4)
+        np.testing.assert_allclose(g_fun, self.g_fun_ref, atol=1.0e-4)
+
+    @pytest.mark.parametrize('geometry', [1, 2, 3])
+    def test_round_trip(self, geometry):
+        solution = Sedov(gamma=1.4, geometry=geometry, omega=0.)
+        profile = solution._profile
+        lam = np.geomspace(1.0e-6, 1.0, 1001)
+        l_fun = profile.funcs(profile.interpolate(lam))[0]
+        np.testing.assert_allclose(l_fun, lam, rtol=1.0e-12)
+
+    def test_matches_scalar_inversion(self):
+        solution = Sedov(gamma=1.4, geometry=3, omega=0.)
+        lamvec = [0.95, 0.8, 0.6, 0.4]
+        l_fun, v, f_fun, g_fun, h_fun = sedovFcnTable(solution, lamvec)
+        np.testing.assert_allclose(self.v_from_lambda(solution, lamvec), v,
+                                   rtol=1.0e-10)
+
+    def test_solution_at_points(self):
+        solver = Sedov(gamma=1.4, geometry=3, omega=0., eblast=0.851072)
+        r = np.linspace(0.3, 1.0, 8)
+        solution = solver(r, 1.0)
+        profile = solver._profile
+        dv = profile.interpolate(r / solver.r2)
+        l_fun, dlamdv, f_fun, g_fun, h_fun = \
+            solver.sedov_funcs_standard(profile.table[0] + dv, dv0=dv)
+        np.testing.assert_allclose(solution['density'], solver.rho2 * g_fun,
+                                   rtol=1.0e-12)
+        np.testing.assert_allclose(solution['velocity'], solver.u2 * f_fun,
+                                   rtol=1.0e-12)
+        np.testing.assert_allclose(solution['pressure'], solver.p2 * h_fun,
+                                   rtol=1.0e-12)
+        assert solution['density'][-1] == pytest.approx(6.0, rel=1.0e-6)
+
+    def test_vacuum(self):
+        solver = Sedov(gamma=1.4, geometry=3, omega=2.4, eblast=5.45670)
+        r = np.linspace(0.0, 1.0, 11)
+        solution = solver(r, 1.0)
+        assert solver.jumps[1].location == pytest.approx(0.272644, abs=1.0e-6)
+        assert np.all(solution['density'][r < solver.rvv] == 0.0)
+        assert np.all(solution['density'][r > solver.rvv] > 0.0)
+
+
+class TestSedovSmallRadius():
+    """Tests the Sedov solution near the origin, where the similarity variable
+    v approaches v0.
+    """
+
+    r = np.geomspace(1.0e-8, 1.0e-2, 13)
+
+    @pytest.mark.parametrize('geometry', [1, 2, 3])
+    def test_power_law(self, geometry):
+        """Near the origin the density is a power of radius,
+        :math:`\\rho \\propto \\lambda^{-(\\alpha_3 + \\alpha_2 \\omega)/\\alpha_2}`.
+        """
+        solver = Sedov(gamma=1.4, geometry=geometry, omega=0.)
+        solution = solver(self.r, 1.0)
+        slope = np.diff(np.log(solution['density'])) / np.diff(np.log(self.r))
+        expected = -(solver.a3 + solver.a2 * solver.omega) / solver.a2
+        np.testing.assert_allclose(slope, expected, rtol=1.0e-8)
+        np.testing.assert_allclose(solution['pressure'],
+                                   solution['pressure'][0], rtol=1.0e-6)
+
+    def test_longdouble(self):
+        solver = Sedov(gamma=1.4, geometry=3, omega=0.)
+        extended = Sedov(gamma=1.4, geometry=3, omega=0., longdouble=True)
+        r = np.concatenate([self.r, np.linspace(0.05, 1.0, 20)])
+        solution = solver(r, 1.0)
+        solution_ext = extended(r, 1.0)
+        assert solver._profile.table[1].dtype == np.float64
+        assert extended._profile.table[1].dtype == np.longdouble
+        for ikey in ['density', 'pressure', 'velocity']:
+            np.testing.assert_allclose(solution[ikey], solution_ext[ikey],
+                                       rtol=1.0e-12)
+
+    def test_origin(self):
+        solver = Sedov(gamma=1.4, geometry=3, omega=0.)
+        solution = solver([0.0, 1.0e-8], 1.0)
+        assert solution['density'][0] == 0.0
+        assert solution['velocity'][0] == 0.0
+        assert solution['pressure'][0] == \
+            pytest.approx(solution['pressure'][1], rel=1.0e-12)
+
+    @pytest.mark.parametrize('kwargs', [dict(gamma=1.4, geometry=1),
+                                        dict(gamma=1.4, geometry=3, omega=1.5),
+                                        dict(gamma=2.0, geometry=1, omega=0.9),
+                                        dict(gamma=1.05, geometry=3,
+                                             omega=2.85)])
+    def test_origin_limits(self, kwargs):
+        """The origin gives the limits of the Sedov functions, without
+        floating point warnings."""
+        solver = Sedov(**kwargs)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            solution = solver([0.0, 1.0e-8, 0.5], 1.0)
+            l_fun, dlamdv, f_fun, g_fun, h_fun = solver._profile.funcs(0.0)
+        assert l_fun == 0.0
+        assert f_fun == 0.0
+        assert solution['velocity'][0] == 0.0
+        # the density is a power of radius near the origin
+        slope = -(solver.a3 + solver.a2 * solver.omega) / solver.a2
+        assert solution['density'][0] == (0.0 if slope > 0 else np.inf)
+        assert solution['pressure'][0] == \
+            pytest.approx(solution['pressure'][1], rel=1.0e-6)
+
+
+class TestSedovEnergyTable():
+    """Tests the persistent table of the Sedov energy integrals."""
+
+    @staticmethod
+    def smooth(geometry, gamma, omega):
+        return np.exp(gamma + omega), geometry / (gamma - 1.0)
+
+    def test_accuracy(self, tmp_path):
+        table = EnergyIntegralTable(_quadrature_integrals,
+                                    path=str(tmp_path / 'table.npz'))
+        solver = Sedov(gamma=1.37, geometry=2, omega=0.3, alpha_table=False)
+        integrals = table.lookup(2, 1.37, 0.3)
+        np.testing.assert_allclose(integrals, [solver.eval1, solver.eval2],
+                                   rtol=1.0e-8)
+
+    def test_persistent(self, tmp_path):
+        path = str(tmp_path / 'table.npz')
+        calls = []
+
+        def compute(*args):
+            calls.append(args)
+            return self.smooth(*args)
+
+        integrals = EnergyIntegralTable(compute, path=path).lookup(3, 1.4, 0.)
+        np.testing.assert_allclose(integrals, self.smooth(3, 1.4, 0.),
+                                   rtol=1.0e-8)
+        ncalls = len(calls)
+        assert ncalls == 36
+        table = EnergyIntegralTable(compute, path=path)
+        assert table.lookup(3, 1.4, 0.) == integrals
+        assert len(calls) == ncalls
+
+    def test_outside(self, tmp_path):
+        table = EnergyIntegralTable(self.smooth,
+                                    path=str(tmp_path / 'table.npz'))
+        assert table.lookup(3, 7.0, 0.) is None
+        assert table.lookup(3, 1.01, 0.) is None
+        assert table.lookup(2, 1.4, 2.0) is None
+
+    def test_fallback(self, tmp_path):
+        """Nodes that cannot be computed are not interpolated."""
+
+        def compute(geometry, gamma, omega):
+            if gamma > 1.4:
+                raise ValueError
+            return self.smooth(geometry, gamma, omega)
+
+        table = EnergyIntegralTable(compute, path=str(tmp_path / 'table.npz'))
+        assert table.lookup(3, 1.4, 0.) is None
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Keep the table out of the user cache directory."""
+        monkeypatch.setenv('EXACTPACK_CACHE_DIR', str(tmp_path))
+
+    def test_nodes(self):
+        """The nodes are computed with all the parameters given."""
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', UsingDefaultWarning)
+            _quadrature_integrals(3, 1.4, 0.)
+
+    def test_solver(self, tmp_path):
+        tabulated = Sedov(gamma=1.4, geometry=3, omega=0., alpha_table=True)
+        assert [path.name for path in tmp_path.iterdir()] == ['sedov_energy_v1.npz']
+        quadrature = Sedov(gamma=1.4, geometry=3, omega=0., alpha_table=False)
+        assert tabulated.alpha == pytest.approx(quadrature.alpha, rel=1.0e-8)
+
+
+class TestSedovProfile():
+    """Tests the dimensionless Sedov profile, which is shared by solvers with
+    the same geometry, gamma and omega.
+    """
+
+    r = np.linspace(0.0, 1.2, 241)
+
+    def test_shared(self):
+        solver = Sedov(gamma=1.4, geometry=3, omega=0.)
+        clone = Sedov(gamma=1.4, geometry=3, omega=0., eblast=2.0, rho0=3.0)
+        assert clone._profile is solver._profile
+
+    def test_rescaling(self):
+        r"""The solution at another time is the same profile in
+        :math:`\lambda = r / r_2`.
+        """
+        solver = Sedov(gamma=1.4, geometry=2, omega=0.)
+        solution = solver(self.r, 1.0)
+        r2 = solver.r2
+        later = solver(self.r * 2.0**0.5, 2.0)
+        assert solver.r2 == pytest.approx(r2 * 2.0**0.5, rel=1.0e-14)
+        np.testing.assert_allclose(later['density'], solution['density'],
+                                   rtol=1.0e-12)
+        np.testing.assert_allclose(later['pressure'],
+                                   solution['pressure'] / 2.0, rtol=1.0e-12)
+
+    def test_tolerance(self):
+        """The profile is only refined as far as the tolerance requires."""
+        Sedov.clear_profile_cache()
+        coarse = Sedov(gamma=1.4, geometry=3, omega=0., rtol=1.0e-6)
+        solution = coarse(self.r, 1.0)
+        nodes = len(coarse._profile.table[1])
+        fine = Sedov(gamma=1.4, geometry=3, omega=0.)
+        exact = fine(self.r, 1.0)
+        assert fine._profile is coarse._profile
+        assert nodes < len(fine._profile.table[1])
+        inside = self.r < fine.r2
+        for ikey in ['density', 'pressure', 'velocity']:
+            np.testing.assert_allclose(solution[ikey][inside],
+                                       exact[ikey][inside], rtol=1.0e-6)
+
+    def test_bad_tolerance(self):
+        with pytest.raises(ValueError):
+            Sedov(rtol=0.0)
+
+    def test_deprecated_arguments(self):
+        """The npts and vtol arguments of _run are ignored, with a warning."""
+        solver = Sedov(gamma=1.4, geometry=3, omega=0.)
+        solution = solver._run(self.r, 1.0)
+        with pytest.warns(DeprecationWarning):
+            deprecated = solver._run(self.r, 1.0, npts=101, vtol=1.e-14)
+        for ikey in ['density', 'pressure', 'velocity']:
+            np.testing.assert_array_equal(deprecated[ikey], solution[ikey])
+
+    @pytest.mark.parametrize('kwargs', [dict(gamma=1.4, geometry=1),
+                                        dict(gamma=1.2, geometry=3,
+                                             omega=2.4)])
+    def test_interpolation(self, kwargs):
+        """The interpolated profile inverts :math:`\\lambda(v)`."""
+        solver = Sedov(**kwargs)
+        solver(self.r, 1.0)
+        lam = np.sort(np.random.RandomState(0).uniform(size=1000))
+        lam = lam[lam > solver.rvv / solver.r2]
+        profile = solver._profile
+        l_fun = profile.funcs(profile.interpolate(lam))[0]
+        np.testing.assert_allclose(l_fun, lam, rtol=1.0e-12)
@@ -1,11 +1,20 @@
 """Unit tests for the Su-Olson solver.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 import numpy as np
 
 from exactpack.solvers.suolson.suolson import SuOlson
-from exactpack.solvers.suolson.timmes import usolution, vsolution
+from exactpack.solvers.suolson import batch, table
+from exactpack.solvers.suolson.timmes import so_wave, usolution, vsolution
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the persistent tables out of the user cache directory."""
+    monkeypatch.setenv('EXACTPACK_CACHE_DIR', str(tmp_path))
 
 
 class TestSuOlsonTimmes():
@@ -144,4 +153,115 @@ class TestSuOlsonDimensionlessVEps1():
         result = np.array([vsolution(pos, tau, 1.0, u) \
                           for pos, u in zip(self.xpos, usolutions)])
         np.testing.assert_allclose(result, expected, atol=1.0e-4)
-            
\ No newline at end of file
+
+
+class TestSuOlsonBatch():
+    """Compare the batched quadrature of :mod:`exactpack.solvers.suolson.batch`
+    with the quadrature at single positions.
+
+    The roots of the phase that split the integrals are exact in the batched
+    quadrature, and only accurate to 1e-6 in the single position quadrature,
+    so the results differ by up to about 5e-8.
+    """
+    xpos = np.array([0.0, 1.0e-4, 0.01, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                     20.0, 40.0])
+
+    @pytest.mark.parametrize("tau", [0.001, 0.1, 1.0, 10.0, 100.0])
+    @pytest.mark.parametrize("epsilon", [0.0, 0.1, 1.0])
+    def test_dimensionless(self, tau, epsilon):
+        u = [usolution(pos, tau, epsilon) for pos in self.xpos]
+        v = [vsolution(pos, tau, epsilon, ui) for pos, ui in zip(self.xpos, u)]
+        ubatch = batch.usolution(self.xpos, tau, epsilon)
+        vbatch = batch.vsolution(self.xpos, tau, epsilon, ubatch)
+        np.testing.assert_allclose(ubatch, u, rtol=0.0, atol=1.0e-7)
+        np.testing.assert_allclose(vbatch, v, rtol=0.0, atol=1.0e-7)
+
+    def test_physical(self):
+        """SuOlson problem: batched and single position evaluation"""
+        x = np.linspace(0.0, 20.0, 9)
+        soln = SuOlson(trad_bc_ev=1.0e3, opac=1.0, table=False)(x, 1.e-9)
+        for i, zpos in enumerate(x):
+            _, _, trad_ev, _, tmat_ev = so_wave(1.e-9, zpos, 1.0e3, 1.0,
+                                                SuOlson.alpha)
+            assert soln.temperature_rad[i] == pytest.approx(
+                trad_ev, rel=1.0e-6, abs=1.0e-4)
+            assert soln.temperature_mat[i] == pytest.approx(
+                tmat_ev, rel=1.0e-6, abs=1.0e-4)
+
+
+class TestSuOlsonTable():
+    """Tests of the persistent table of the dimensionless solutions in
+    :mod:`exactpack.solvers.suolson.table`.
+    """
+
+    @pytest.mark.parametrize("tau", [0.001, 0.037, 1.0, 30.0])
+    def test_accuracy(self, tau, tmp_path):
+        """The interpolated solutions agree with quadrature"""
+        soltable = table.SolutionTable(1.0, path=str(tmp_path / 't.npz'))
+        posx = np.linspace(0.0, 15.0 * np.sqrt(tau), 25)
+        u, v = soltable.lookup(posx, tau)
+        found = ~np.isnan(u)
+        assert found[0] and np.array_equal(found, ~np.isnan(v))
+        ubatch = batch.usolution(posx, tau, 1.0)
+        vbatch = batch.vsolution(posx, tau, 1.0, ubatch)
+        # to the absolute accuracy of the quadrature
+        np.testing.assert_allclose(u[found], ubatch[found], rtol=1.0e-5, atol=batch.EPS2)
+        np.testing.assert_allclose(v[found], vbatch[found], rtol=1.0e-5, atol=batch.EPS2)
+
+    def test_persistent(self, tmp_path, monkeypatch):
+        """A new table answers from the file without quadrature"""
+        path = str(tmp_path / 't.npz')
+        posx = np.array([0.0, 0.3, 1.1])
+        expected = table.SolutionTable(0.1, path=path).lookup(posx, 2.0)
+
+        def fail(*args):
+            raise AssertionError('quadrature')
+
+        monkeypatch.setattr(batch, 'usolution', fail)
+        result = table.SolutionTable(0.1, path=path).lookup(posx, 2.0)
+        np.testing.assert_array_equal(result, expected)
+
+    def test_outside(self, tmp_path):
+        """Outside of the table, NaN is returned"""
+        soltable = table.SolutionTable(1.0, path=str(tmp_path / 't.npz'))
+        u, v = soltable.lookup(np.array([1.0, 100.0]), 1.0)
+        assert not np.isnan(u[0]) and np.isnan(u[1]) and np.isnan(v[1])
+        u, v = soltable.lookup(np.array([1.0]), 1.0e4)
+        assert np.isnan(u[0]) and np.isnan(v[0])
+
+    def test_solver(self):
+        """SuOlson problem: table and quadrature"""
+        x = np.linspace(0.0, 20.0, 101)
+        soln = SuOlson(trad_bc_ev=1.0e3, opac=1.0, table=True)(x, 1.e-9)
+        expected = SuOlson(trad_bc_ev=1.0e3, opac=1.0)(x, 1.e-9)
+        for quant in ['temperature_mat', 'temperature_rad']:
+            np.testing.assert_allclose(soln[quant], expected[quant], rtol=1.0e-6)
+
+
+class TestSuOlsonThreads():
+    """Tests that evaluations with different parameters can run concurrently
+    in one process, and give bit for bit the results of serial evaluation.
+    """
+    xpos = np.array([0.0, 0.5, 2.5, 10.0])
+    cases = [(0.1, 0.1), (1.0, 0.1), (10.0, 1.0), (0.03, 1.0)]
+
+    def evaluate(self, case):
+        tau, epsilon = case
+        u = [usolution(pos, tau, epsilon) for pos in self.xpos]
+        v = [vsolution(pos, tau, epsilon, ui) for pos, ui in zip(self.xpos, u)]
+        return u, v
+
+    def test_concurrent(self):
+        serial = [self.evaluate(case) for case in self.cases]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent = list(executor.map(self.evaluate, 4 * self.cases))
+        for i, result in enumerate(concurrent):
+            assert result == serial[i % len(self.cases)]
+
+    def test_workers(self):
+        """The threaded evaluation mode of the solver"""
+        x = np.linspace(0, 20.0, 9)
+        serial = SuOlson(opac=1.0)(x, 1.e-9)
+        threaded = SuOlson(opac=1.0, workers=4)(x, 1.e-9)
+        for quant in ['temperature_mat', 'temperature_rad']:
+            np.testing.assert_array_equal(threaded[quant], serial[quant])